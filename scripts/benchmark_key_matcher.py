@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+캐시 키 매칭 벤치마크 (키 전체 순회 vs Aho-Corasick KeyMatcher)
+
+합성 Gemini 캐시(기본 10,000개 키)와 제품명 목록을 만들어,
+기존 enrich_editorial_data 방식(모든 키에 대해 `key in name`, 첫 매칭 사용)과
+KeyMatcher.longest_match()를 비교합니다. 두 방식의 매칭 결과 차이(첫 매칭 ≠ 최장 매칭)도 집계합니다.
+
+실행: python scripts/benchmark_key_matcher.py [--keys 10000] [--products 300] [--repeat 3]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(script_dir)
+from key_matcher import KeyMatcher
+
+SYLLABLES = "가나다라마바사아자차카타파하수분크림세럼토너앰플마스크선쿨젤폼"
+
+
+def random_word(rng: random.Random, length: int) -> str:
+    return ''.join(rng.choice(SYLLABLES) for _ in range(length))
+
+
+def build_dataset(num_keys: int, num_products: int, seed: int = 42):
+    """합성 캐시 키와 (원문, 한글명) 제품 목록 생성 - 제품의 절반은 키(및 그 접두 키)를 포함"""
+    rng = random.Random(seed)
+    keys = list(dict.fromkeys(random_word(rng, rng.randint(3, 8)) for _ in range(num_keys)))
+    # 짧은 키가 긴 키의 일부인 경우(예: '수분크림' ⊂ '수분크림세럼')를 섞어 최장 매칭 차이를 재현
+    keys += [key[:3] for key in keys[: num_keys // 20]]
+    products = []
+    for _ in range(num_products):
+        name = random_word(rng, 12)
+        if rng.random() < 0.5:
+            key = rng.choice(keys)
+            pos = rng.randint(0, len(name))
+            name = name[:pos] + key + name[pos:]
+        raw = f"브랜드 {name} (50ml)"
+        products.append((raw, name))
+    return keys, products
+
+
+def scan_match(keys, raw_name: str, name_ko: str):
+    """기존 방식: 키를 순서대로 순회하며 첫 번째로 포함된 키 반환"""
+    for key in keys:
+        if key in raw_name or key in name_ko:
+            return key
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--keys', type=int, default=10000)
+    parser.add_argument('--products', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    keys, products = build_dataset(args.keys, args.products)
+    print(f"🔬 합성 캐시 {len(keys)}개 키, 제품 {len(products)}개, 반복 {args.repeat}회\n")
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        scan_results = [scan_match(keys, raw, name) for raw, name in products]
+    scan_elapsed = (time.perf_counter() - started) / args.repeat
+
+    started = time.perf_counter()
+    matcher = KeyMatcher(keys)
+    build_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        ac_results = [matcher.longest_match(raw, name) for raw, name in products]
+    match_elapsed = (time.perf_counter() - started) / args.repeat
+
+    matched = sum(1 for r in ac_results if r)
+    differs = sum(1 for a, b in zip(scan_results, ac_results) if a != b)
+    # 최장 매칭이 첫 매칭보다 짧으면 안 됨
+    assert all(len(b or '') >= len(a or '') for a, b in zip(scan_results, ac_results))
+
+    print(f"  키 전체 순회      : {scan_elapsed * 1000:8.1f} ms / 실행")
+    print(f"  KeyMatcher 구축   : {build_elapsed * 1000:8.1f} ms (실행당 1회)")
+    print(f"  KeyMatcher 조회   : {match_elapsed * 1000:8.1f} ms / 실행")
+    print(f"  속도 향상 (조회)  : {scan_elapsed / max(match_elapsed, 1e-9):8.1f}x")
+    print(f"\n  매칭된 제품 {matched}/{len(products)}개, 첫 매칭과 최장 매칭이 다른 제품 {differs}개")
+
+
+if __name__ == "__main__":
+    main()
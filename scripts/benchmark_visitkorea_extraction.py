@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+대한민국 구석구석 목록 추출 벤치마크 (필드별 await vs 단일 page.evaluate)
+
+로컬 fixture(fixtures/visitkorea_list.html)를 page.set_content로 띄운 뒤,
+기존 방식(항목/필드마다 query_selector, inner_text, get_attribute를 await)과
+extract_places()의 단일 evaluate 방식을 비교합니다.
+
+Playwright 객체를 감싸 브라우저로 나가는 await 호출(CDP 왕복) 수를 세고,
+--latency-ms 옵션으로 원격 브라우저처럼 왕복마다 지연을 주어 체감 차이를 확인할 수 있습니다.
+
+실행: python scripts/benchmark_visitkorea_extraction.py [--repeat 5] [--latency-ms 5] [--cdp-url http://127.0.0.1:9222]
+"""
+import argparse
+import asyncio
+import inspect
+import os
+import re
+import sys
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(script_dir)
+from scrape_visitkorea import extract_places, BASE_URL
+
+FIXTURE_FILE = os.path.join(script_dir, 'fixtures', 'visitkorea_list.html')
+
+
+class RoundTripCounter:
+    def __init__(self, latency_ms: float = 0.0):
+        self.count = 0
+        self.latency = latency_ms / 1000.0
+
+
+class Counted:
+    """Playwright 객체 프록시 - await 되는 메서드 호출마다 왕복 1회로 집계"""
+
+    def __init__(self, obj, counter: RoundTripCounter):
+        self._obj = obj
+        self._counter = counter
+
+    def _wrap(self, value):
+        if isinstance(value, list):
+            return [self._wrap(v) for v in value]
+        if hasattr(value, '_impl_obj'):
+            return Counted(value, self._counter)
+        return value
+
+    async def _await(self, awaitable):
+        self._counter.count += 1
+        if self._counter.latency:
+            await asyncio.sleep(self._counter.latency)
+        return self._wrap(await awaitable)
+
+    def __getattr__(self, name):
+        attr = getattr(self._obj, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if inspect.isawaitable(result):
+                return self._await(result)
+            return self._wrap(result)
+        return call
+
+
+async def extract_places_per_field(page) -> list:
+    """
+    기존 scrape_popular_places의 항목/필드별 추출 로직 (비교 기준)
+
+    기존 코드는 locator().all()로 받은 Locator에 query_selector를 호출해 실행되지 않았으므로,
+    의도대로 ElementHandle(page.query_selector_all)을 받아 필드마다 await 하는 형태로 재현합니다.
+    """
+    items = await page.query_selector_all('ul.list_thumType li')
+    if not items:
+        items = await page.query_selector_all('li')
+        filtered_items = []
+        for item in items:
+            strong = await item.query_selector('strong')
+            if strong:
+                filtered_items.append(item)
+        items = filtered_items
+
+    places = []
+    for item in items:
+        title_elem = await item.query_selector('strong.tit, strong')
+        name = await title_elem.inner_text() if title_elem else ""
+        name = name.strip()
+        if not name:
+            continue
+
+        p_elems = await item.query_selector_all('p')
+        location = ""
+        if len(p_elems) > 0:
+            location = (await p_elems[0].inner_text()).strip()
+
+        desc_elem = await item.query_selector('p.phrase')
+        description = ""
+        if desc_elem:
+            description = (await desc_elem.inner_text()).strip()
+        elif len(p_elems) > 1:
+            description = (await p_elems[1].inner_text()).strip()
+
+        tags = []
+        tag_container = await item.query_selector('p.tag')
+        if tag_container:
+            tag_elems = await tag_container.query_selector_all('span')
+            for tag_elem in tag_elems:
+                tag_text = await tag_elem.inner_text()
+                if tag_text:
+                    tags.append(tag_text.strip())
+
+        img_elem = await item.query_selector('img')
+        image_url = ""
+        if img_elem:
+            image_url = await img_elem.get_attribute('src')
+            if image_url and not image_url.startswith('http'):
+                image_url = f"{BASE_URL}{image_url}"
+
+        content_id = ""
+        link_elem = await item.query_selector('a[onclick]')
+        if link_elem:
+            onclick = await link_elem.get_attribute('onclick')
+            match = re.search(r"goDetail\('([^']+)'", onclick)
+            if match:
+                content_id = match.group(1)
+
+        if name and location:
+            places.append({
+                'name': name,
+                'location': location,
+                'description': description,
+                'tags': tags,
+                'image_url': image_url,
+                'content_id': content_id
+            })
+    return places
+
+
+async def measure(page, extractor, repeat: int, latency_ms: float):
+    counter = RoundTripCounter(latency_ms)
+    counted_page = Counted(page, counter)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        places = await extractor(counted_page)
+    elapsed = (time.perf_counter() - started) / repeat
+    return places, counter.count // repeat, elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='visitkorea 목록 추출 벤치마크')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='왕복당 추가 지연 (원격 브라우저 시뮬레이션)')
+    parser.add_argument('--cdp-url', default=None, help='이미 실행 중인 Chromium 계열 브라우저에 CDP로 연결 (없으면 chromium 실행)')
+    args = parser.parse_args()
+
+    from playwright.async_api import async_playwright
+
+    with open(FIXTURE_FILE, 'r', encoding='utf-8') as f:
+        html = f.read()
+
+    async with async_playwright() as p:
+        if args.cdp_url:
+            browser = await p.chromium.connect_over_cdp(args.cdp_url)
+            context = browser.contexts[0] if browser.contexts else await browser.new_context()
+            page = context.pages[0] if context.pages else await context.new_page()
+        else:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+        print(f"🌐 브라우저: {browser.version or args.cdp_url}")
+        await page.set_content(html)
+
+        before, before_trips, before_time = await measure(page, extract_places_per_field, args.repeat, args.latency_ms)
+        after, after_trips, after_time = await measure(page, extract_places, args.repeat, args.latency_ms)
+
+        await browser.close()
+
+    print("=" * 60)
+    print(f"📊 추출 벤치마크 ({len(before)}개 항목, 반복 {args.repeat}회, 왕복 지연 {args.latency_ms}ms)")
+    print("=" * 60)
+    print(f"  필드별 await     : 왕복 {before_trips:>4}회, {before_time * 1000:8.1f}ms/페이지")
+    print(f"  단일 evaluate    : 왕복 {after_trips:>4}회, {after_time * 1000:8.1f}ms/페이지")
+    if after_time > 0:
+        print(f"  ⚡ 속도 향상      : {before_time / after_time:.1f}x")
+    print(f"  결과 동일 여부    : {'✅' if before == after else '❌'}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
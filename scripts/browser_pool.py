@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+K-Rank Browser Pool
+프로세스 전체에서 하나의 Chromium 인스턴스를 공유하기 위한 Playwright 브라우저 풀입니다.
+브라우저 기동 비용은 실행당 한 번만 지불하고, 각 스크래퍼는 컨텍스트/페이지만 빌려 씁니다.
+"""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+# 동시에 열 수 있는 최대 페이지 수 (환경변수로 조정 가능)
+DEFAULT_MAX_PAGES = int(os.getenv('BROWSER_POOL_MAX_PAGES', '4'))
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
+
+
+def _options_key(options: Dict[str, Any]) -> Tuple:
+    """컨텍스트 옵션을 재사용 가능한 해시 키로 변환"""
+    return tuple(sorted((k, repr(v)) for k, v in options.items()))
+
+
+class BrowserPool:
+    """
+    하나의 장기 실행 브라우저와 재사용 가능한 컨텍스트 풀
+
+    - 브라우저는 처음 빌릴 때 한 번만 실행됩니다 (lazy launch).
+    - 동일한 옵션의 컨텍스트는 반환 후 재사용됩니다.
+    - 동시에 열린 페이지 수는 max_pages로 제한됩니다.
+    """
+
+    def __init__(self, max_pages: int = DEFAULT_MAX_PAGES, headless: bool = True):
+        self.max_pages = max(1, max_pages)
+        self.headless = headless
+        self._playwright = None
+        self._browser = None
+        self._launch_lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(self.max_pages)
+        self._idle_contexts: Dict[Tuple, List[Any]] = {}
+        self.launch_count = 0
+
+    async def _ensure_browser(self):
+        """브라우저가 없거나 연결이 끊어졌으면 (재)실행"""
+        async with self._launch_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+
+            from playwright.async_api import async_playwright
+
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+
+            # 끊어진 브라우저의 컨텍스트는 더 이상 사용할 수 없음
+            self._idle_contexts.clear()
+            print(f"🚀 공유 브라우저 실행 중... (최대 동시 페이지: {self.max_pages})")
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            self.launch_count += 1
+            return self._browser
+
+    async def _acquire_context(self, options: Dict[str, Any]):
+        key = _options_key(options)
+        idle = self._idle_contexts.get(key)
+        if idle:
+            return key, idle.pop()
+        browser = await self._ensure_browser()
+        return key, await browser.new_context(**options)
+
+    async def _release_context(self, key: Tuple, context, reusable: bool):
+        if reusable and self._browser is not None and self._browser.is_connected():
+            self._idle_contexts.setdefault(key, []).append(context)
+            return
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    @asynccontextmanager
+    async def context(self, **options):
+        """
+        브라우저 컨텍스트를 빌려옵니다. 블록이 끝나면 열린 페이지를 닫고 풀에 반환합니다.
+
+        한 컨텍스트 안에서 여러 페이지를 열 수 있지만, 동시성 제한은 컨텍스트 단위로 적용됩니다.
+        """
+        async with self._semaphore:
+            key, ctx = await self._acquire_context(options)
+            reusable = True
+            try:
+                yield ctx
+            except Exception:
+                # 오류가 난 컨텍스트는 상태를 신뢰할 수 없으므로 폐기
+                reusable = False
+                raise
+            finally:
+                for page in list(ctx.pages):
+                    try:
+                        await page.close()
+                    except Exception:
+                        pass
+                await self._release_context(key, ctx, reusable)
+
+    @asynccontextmanager
+    async def page(self, **options):
+        """풀에서 컨텍스트를 빌려 새 페이지 하나를 엽니다."""
+        async with self.context(**options) as ctx:
+            page = await ctx.new_page()
+            yield page
+
+    async def close(self):
+        """모든 컨텍스트와 브라우저를 종료"""
+        for contexts in self._idle_contexts.values():
+            for ctx in contexts:
+                try:
+                    await ctx.close()
+                except Exception:
+                    pass
+        self._idle_contexts.clear()
+
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+
+_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool(max_pages: Optional[int] = None) -> BrowserPool:
+    """프로세스 전역 브라우저 풀 반환 (없으면 생성)"""
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool(max_pages=max_pages or DEFAULT_MAX_PAGES)
+    return _pool
+
+
+async def close_browser_pool():
+    """전역 브라우저 풀 종료 - 각 스크립트의 main() 마지막에 호출"""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        if _pool.launch_count:
+            print(f"🧹 공유 브라우저 종료 (실행 횟수: {_pool.launch_count})")
+        _pool = None
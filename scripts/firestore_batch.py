@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+K-Rank Firestore Batch Writer
+한 번의 임포트에서 만든 문서들을 Firestore WriteBatch로 묶어 커밋합니다.
+
+- 500개 이하: WriteBatch 하나로 한 번에 커밋 (전부 반영되거나 전부 실패)
+- 500개 초과: Firestore 배치 한도(500 ops)에 맞춰 청크로 나누어 커밋
+  (청크 단위로만 원자적 - 청크를 순서대로 커밋하고 첫 실패에서 중단)
+- FIRESTORE_CONCURRENT_COMMIT=true: 대용량 임포트에서 청크들을 동시에 커밋 (순서/중단 보장 없음)
+- manifest 지정 시 내용 해시가 같은 문서는 배치에서 제외, 일부 필드만 바뀐 문서는 update()로 기록
+  (update 대상 문서가 Firestore에 없어 배치가 NotFound로 실패하면 해당 청크를 전체 set()으로 다시 커밋)
+"""
+
+import asyncio
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from google.api_core.exceptions import NotFound
+
+from write_manifest import WriteManifest
+
+FIRESTORE_BATCH_LIMIT = 500
+FIRESTORE_CONCURRENT_COMMIT = os.getenv('FIRESTORE_CONCURRENT_COMMIT', 'false').lower() == 'true'
+
+# (DocumentReference, 문서 데이터)
+DocumentWrite = Tuple[Any, Dict[str, Any]]
+
+
+def chunk_writes(writes: Sequence[DocumentWrite], size: int = FIRESTORE_BATCH_LIMIT) -> List[Sequence[DocumentWrite]]:
+    return [writes[i:i + size] for i in range(0, len(writes), size)]
+
+
+def _commit_chunk(db, chunk: Sequence[DocumentWrite], manifest: Optional[WriteManifest] = None):
+    batch = db.batch()
+    planned = []
+    for ref, data in chunk:
+        action, payload = manifest.plan(ref.path, data) if manifest else ('set', data)
+        if action == 'set':
+            batch.set(ref, payload)
+        elif action == 'update':
+            batch.update(ref, payload)
+        planned.append((ref, data, action))
+    if any(action != 'skip' for _, _, action in planned):
+        try:
+            batch.commit()
+        except NotFound:
+            if not any(action == 'update' for _, _, action in planned):
+                raise
+            # 매니페스트에는 있지만 삭제된 문서가 있음 - update 대상을 전체 set()으로 바꿔 다시 커밋
+            batch = db.batch()
+            planned = [(ref, data, 'set' if action == 'update' else action) for ref, data, action in planned]
+            for ref, data, action in planned:
+                if action == 'set':
+                    batch.set(ref, data)
+            batch.commit()
+    # 커밋이 성공한 뒤에만 해시 기록
+    if manifest:
+        for ref, data, action in planned:
+            manifest.record(ref.path, data, action)
+
+
+async def commit_documents(db, writes: Sequence[DocumentWrite], concurrent: bool = FIRESTORE_CONCURRENT_COMMIT,
+                           batch_limit: int = FIRESTORE_BATCH_LIMIT, manifest: Optional[WriteManifest] = None) -> int:
+    """
+    문서들을 WriteBatch 청크로 커밋 (동기 Firestore 호출은 스레드에서 실행)
+
+    Args:
+        db: Firestore 클라이언트
+        writes: (문서 참조, 데이터) 리스트
+        concurrent: 청크들을 동시에 커밋할지 여부
+        batch_limit: 배치당 최대 쓰기 수
+        manifest: 쓰기 매니페스트 (지정 시 변경 없는 문서는 생략)
+
+    Returns:
+        커밋 대상 문서 수
+    """
+    chunks = chunk_writes(list(writes), batch_limit)
+    if not chunks:
+        return 0
+    if concurrent and len(chunks) > 1:
+        await asyncio.gather(*[asyncio.to_thread(_commit_chunk, db, chunk, manifest) for chunk in chunks])
+    else:
+        for chunk in chunks:
+            await asyncio.to_thread(_commit_chunk, db, chunk, manifest)
+    mode = '동시' if concurrent and len(chunks) > 1 else '순차'
+    print(f"📦 Firestore 배치 커밋: 문서 {len(writes)}개 / 배치 {len(chunks)}개 ({mode})")
+    return len(writes)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+K-Rank Gemini Cache Store
+제품 번역/태그 캐시(gemini_cache.json)를 SQLite(WAL 모드)로 저장합니다.
+
+- 키 단위 조회(PRIMARY KEY 인덱스)와 항목 단위 upsert: 변경된 항목만 기록
+- WAL + busy_timeout으로 여러 프로세스(미디어/뷰티 작업)가 동시에 읽고 써도 서로의 기록을 덮어쓰지 않음
+- 최초 실행 시 기존 gemini_cache.json을 한 번만 가져옴
+"""
+
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+GEMINI_CACHE_DB = os.getenv('GEMINI_CACHE_DB', os.path.join(script_dir, 'gemini_cache.sqlite3'))
+LEGACY_CACHE_FILE = os.path.join(script_dir, 'gemini_cache.json')
+
+# 캐시 항목 필드 ↔ 컬럼 (tags는 JSON 문자열로 저장)
+FIELD_COLUMNS = {
+    'translatedName': 'translated_name',
+    'nikIndex': 'nik_index',
+    'culturalContext': 'cultural_context',
+    'buyUrl': 'buy_url',
+    'tags': 'tags',
+    'updatedAt': 'updated_at',
+}
+# 위 필드 외의 값(productName, imageQuery 등)은 extra 컬럼에 JSON으로 보관
+EXTRA_COLUMN = 'extra'
+
+# SQLite 바인딩 변수 제한을 넘지 않도록 IN 조회를 나누는 크기
+LOOKUP_BATCH = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    translated_name TEXT,
+    nik_index REAL,
+    cultural_context TEXT,
+    buy_url TEXT,
+    tags TEXT,
+    updated_at TEXT,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _encode(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """캐시 항목 dict → 컬럼 값 dict (전달된 필드만 포함)"""
+    row: Dict[str, Any] = {}
+    extra: Dict[str, Any] = {}
+    for name, value in fields.items():
+        column = FIELD_COLUMNS.get(name)
+        if column is None:
+            extra[name] = value
+        elif name == 'tags':
+            row[column] = json.dumps(value, ensure_ascii=False)
+        else:
+            row[column] = value
+    if extra:
+        row[EXTRA_COLUMN] = json.dumps(extra, ensure_ascii=False)
+    return row
+
+
+def _decode(row: sqlite3.Row) -> Dict[str, Any]:
+    """DB 행 → 캐시 항목 dict (값이 있는 필드만 포함)"""
+    entry: Dict[str, Any] = {}
+    if row[EXTRA_COLUMN]:
+        entry.update(json.loads(row[EXTRA_COLUMN]))
+    for name, column in FIELD_COLUMNS.items():
+        value = row[column]
+        if value is None:
+            continue
+        entry[name] = json.loads(value) if name == 'tags' else value
+    return entry
+
+
+class GeminiCacheStore:
+    """
+    SQLite 기반 Gemini 제품 캐시
+
+    Args:
+        db_path: SQLite 파일 경로
+        legacy_file: 최초 1회 가져올 gemini_cache.json 경로
+    """
+
+    def __init__(self, db_path: str = GEMINI_CACHE_DB, legacy_file: str = LEGACY_CACHE_FILE):
+        self.db_path = db_path
+        # isolation_level=None: 트랜잭션을 직접 BEGIN/COMMIT으로 관리
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA busy_timeout=30000')
+        self.conn.executescript(SCHEMA)
+        self.migrate_from_json(legacy_file)
+
+    def close(self):
+        self.conn.close()
+
+    def migrate_from_json(self, legacy_file: str) -> int:
+        """gemini_cache.json을 한 번만 가져오기 (다른 프로세스가 이미 가져왔으면 건너뜀)"""
+        if not os.path.exists(legacy_file):
+            return 0
+        # 쓰기 잠금을 먼저 잡아 두 프로세스가 동시에 가져오지 않도록 함
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            done = self.conn.execute("SELECT 1 FROM meta WHERE name = 'migrated_json'").fetchone()
+            if done:
+                self.conn.execute('COMMIT')
+                return 0
+            with open(legacy_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for key, fields in data.items():
+                if isinstance(fields, dict):
+                    self._upsert(key, fields)
+            self.conn.execute(
+                "INSERT INTO meta (name, value) VALUES ('migrated_json', ?)",
+                (os.path.basename(legacy_file),)
+            )
+            self.conn.execute('COMMIT')
+        except Exception as e:
+            self.conn.execute('ROLLBACK')
+            print(f"⚠️ gemini_cache.json 가져오기 오류: {e}")
+            return 0
+        print(f"🗄️ gemini_cache.json → SQLite 가져오기 완료 ({len(data)}개)")
+        return len(data)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute('SELECT * FROM entries WHERE key = ?', (key,)).fetchone()
+        return _decode(row) if row else None
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """여러 키를 인덱스로 조회 (없는 키는 결과에서 제외)"""
+        unique = list(dict.fromkeys(keys))
+        found: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(unique), LOOKUP_BATCH):
+            batch = unique[start:start + LOOKUP_BATCH]
+            placeholders = ','.join('?' * len(batch))
+            for row in self.conn.execute(f'SELECT * FROM entries WHERE key IN ({placeholders})', batch):
+                found[row['key']] = _decode(row)
+        return found
+
+    def _upsert(self, key: str, fields: Dict[str, Any]):
+        row = _encode(fields)
+        if not row:
+            return
+        columns = list(row)
+        # 전달된 컬럼만 갱신하고 나머지 필드는 유지 (예: tags만 갱신해도 번역 결과는 보존)
+        updates = ', '.join(f'{column} = excluded.{column}' for column in columns)
+        if EXTRA_COLUMN in row:
+            # extra는 기존 JSON과 병합
+            updates = updates.replace(
+                f'{EXTRA_COLUMN} = excluded.{EXTRA_COLUMN}',
+                f"{EXTRA_COLUMN} = json_patch(COALESCE(entries.{EXTRA_COLUMN}, '{{}}'), excluded.{EXTRA_COLUMN})"
+            )
+        self.conn.execute(
+            f"INSERT INTO entries (key, {', '.join(columns)}) VALUES (?, {', '.join('?' * len(columns))}) "
+            f"ON CONFLICT(key) DO UPDATE SET {updates}",
+            [key, *row.values()]
+        )
+
+    def upsert(self, key: str, fields: Dict[str, Any]):
+        """한 항목의 전달된 필드만 기록"""
+        self.upsert_many({key: fields})
+
+    def upsert_many(self, entries: Dict[str, Dict[str, Any]]):
+        """여러 항목을 한 트랜잭션으로 기록"""
+        if not entries:
+            return
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            for key, fields in entries.items():
+                self._upsert(key, fields)
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+
+    def keys(self) -> List[str]:
+        return [row['key'] for row in self.conn.execute('SELECT key FROM entries')]
+
+    def all(self) -> Dict[str, Dict[str, Any]]:
+        """전체 항목 (기존 load_cache()와 같은 dict 형태)"""
+        return {row['key']: _decode(row) for row in self.conn.execute('SELECT * FROM entries')}
+
+    def __len__(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+
+_store: Optional[GeminiCacheStore] = None
+
+
+def get_gemini_cache() -> GeminiCacheStore:
+    """프로세스 전역 Gemini 캐시 스토어"""
+    global _store
+    if _store is None:
+        _store = GeminiCacheStore()
+    return _store
+
+
+def close_gemini_cache():
+    """전역 캐시 스토어 연결 종료 - 각 스크립트의 main() 마지막에 호출"""
+    global _store
+    if _store is not None:
+        _store.close()
+    _store = None
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+K-Rank HTTP Client
+프로세스 전체에서 하나의 aiohttp ClientSession(keep-alive 커넥션 풀)을 공유합니다.
+요청마다 세션을 새로 만들지 않고, 호스트별 동시 연결 수를 제한합니다.
+"""
+
+import os
+from typing import Optional
+
+import aiohttp
+
+# 전체/호스트별 최대 동시 연결 수 (환경변수로 조정 가능)
+HTTP_MAX_CONNECTIONS = int(os.getenv('HTTP_MAX_CONNECTIONS', '32'))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv('HTTP_MAX_CONNECTIONS_PER_HOST', '8'))
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+}
+
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """프로세스 전역 HTTP 세션 반환 (없거나 닫혔으면 생성) - 이벤트 루프 안에서 호출"""
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_MAX_CONNECTIONS,
+            limit_per_host=HTTP_MAX_CONNECTIONS_PER_HOST,
+            ttl_dns_cache=300
+        )
+        _session = aiohttp.ClientSession(connector=connector, headers=DEFAULT_HEADERS)
+    return _session
+
+
+async def close_http_session():
+    """전역 HTTP 세션 종료 - 각 스크립트의 main() 마지막에 호출"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+K-Rank Image Resolver
+(브랜드, 제품명) 목록의 Amazon 이미지를 일괄 조회하고 결과를 디스크에 캐시합니다.
+
+- 정규화된 검색어 기준 중복 제거 (카테고리 간 동일 제품은 한 번만 조회)
+- 성공 결과는 IMAGE_CACHE_TTL_DAYS, 실패 결과(negative cache)는 IMAGE_NEGATIVE_TTL_DAYS 동안 재조회하지 않음
+  (주간 임포트 재실행에서 다시 조회하지 않도록 실패 TTL도 주기보다 길게)
+- 조회 함수가 예외를 던지면(네트워크 오류/타임아웃) 일시적 실패로 보고 캐시하지 않음
+- 캐시 미스만 제한된 동시성으로 조회
+- 수동 수집 결과(amazon_image_results.json)는 한글 제품명 기준이므로, 호출자가 넘긴 한글명으로 찾아
+  조회 키(브랜드 + 영문 제품명)에 기록
+"""
+
+import asyncio
+import json
+import os
+import re
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+
+IMAGE_CACHE_FILE = os.path.join(script_dir, 'image_cache.json')
+# 수동으로 수집한 한글 제품명 → 이미지 URL 매핑 (캐시 미스 시 조회 전에 사용)
+SEED_RESULTS_FILE = os.path.join(project_root, 'amazon_image_results.json')
+
+IMAGE_CACHE_TTL_DAYS = float(os.getenv('IMAGE_CACHE_TTL_DAYS', '30'))
+IMAGE_NEGATIVE_TTL_DAYS = float(os.getenv('IMAGE_NEGATIVE_TTL_DAYS', '14'))
+IMAGE_LOOKUP_CONCURRENCY = int(os.getenv('IMAGE_LOOKUP_CONCURRENCY', '4'))
+
+DAY_SECONDS = 24 * 60 * 60
+
+Lookup = Callable[[str, str], Awaitable[str]]
+
+
+def normalize_image_query(brand: str, product_name: str) -> str:
+    """캐시 키용 검색어 정규화: 소문자화, 괄호 부가정보 제거, 공백 정리"""
+    query = f"{brand or ''} {product_name or ''}"
+    query = re.sub(r'\(.*?\)', ' ', query)
+    query = re.sub(r'\s+', ' ', query)
+    return query.strip().lower()
+
+
+class ImageResolver:
+    """
+    디스크 캐시를 가진 배치 이미지 조회 서비스
+
+    Args:
+        lookup: (product_name, brand) -> 이미지 URL ('' 이면 검색 결과 없음, 일시적 오류는 예외) 비동기 함수
+        cache_file: 캐시 JSON 경로
+        ttl_days: 성공 결과 유효 기간
+        negative_ttl_days: 실패 결과 유효 기간
+        concurrency: 캐시 미스 동시 조회 수
+    """
+
+    def __init__(self, lookup: Lookup, cache_file: str = IMAGE_CACHE_FILE,
+                 ttl_days: float = IMAGE_CACHE_TTL_DAYS,
+                 negative_ttl_days: float = IMAGE_NEGATIVE_TTL_DAYS,
+                 concurrency: int = IMAGE_LOOKUP_CONCURRENCY):
+        self.lookup = lookup
+        self.cache_file = cache_file
+        self.ttl = ttl_days * DAY_SECONDS
+        self.negative_ttl = negative_ttl_days * DAY_SECONDS
+        self.concurrency = max(1, concurrency)
+        self.entries: Dict[str, Dict] = {}
+        # normalize_image_query('', 한글 제품명) → URL
+        self.seed: Dict[str, str] = {}
+        self.stats = {'hits': 0, 'negative_hits': 0, 'seeded': 0, 'fetched': 0, 'failed': 0, 'errors': 0}
+        self._dirty = False
+        self.load()
+        self._load_seed()
+
+    def load(self):
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+                return
+            except Exception as e:
+                print(f"⚠️ 이미지 캐시 로드 오류: {e}")
+        self.entries = {}
+
+    def _load_seed(self):
+        """amazon_image_results.json의 수동 수집 결과 로드 (한글 제품명 기준)"""
+        if not os.path.exists(SEED_RESULTS_FILE):
+            return
+        try:
+            with open(SEED_RESULTS_FILE, 'r', encoding='utf-8') as f:
+                seed = json.load(f)
+        except Exception as e:
+            print(f"⚠️ 이미지 시드 로드 오류: {e}")
+            return
+        self.seed = {normalize_image_query('', name): url for name, url in seed.items() if url}
+
+    def save(self):
+        if not self._dirty:
+            return
+        try:
+            tmp_file = f"{self.cache_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.cache_file)
+            self._dirty = False
+        except Exception as e:
+            print(f"⚠️ 이미지 캐시 저장 오류: {e}")
+
+    def get_cached(self, key: str) -> Optional[str]:
+        """유효한 캐시 항목이 있으면 URL('' = 최근 실패)을, 없거나 만료되었으면 None 반환"""
+        entry = self.entries.get(key)
+        if not entry:
+            return None
+        ttl = self.ttl if entry.get('ok') else self.negative_ttl
+        if time.time() - entry.get('checkedAt', 0) > ttl:
+            return None
+        return entry.get('url', '') if entry.get('ok') else ''
+
+    def _store(self, key: str, url: str):
+        self.entries[key] = {'url': url, 'ok': bool(url), 'checkedAt': time.time()}
+        self._dirty = True
+
+    async def resolve_many(self, pairs: Iterable[Tuple[str, str]],
+                           seed_names: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        (brand, product_name) 목록의 이미지를 일괄 조회
+
+        Args:
+            pairs: (brand, product_name) 목록
+            seed_names: {normalize_image_query(brand, product_name): 한글 제품명} - 캐시 미스 중
+                수동 수집 결과에 있는 제품은 Amazon 조회 없이 그 URL을 같은 키로 기록
+
+        Returns:
+            {normalize_image_query(brand, product_name): url} ('' 이면 이미지 없음)
+        """
+        queries: Dict[str, Tuple[str, str]] = {}
+        for brand, product_name in pairs:
+            queries.setdefault(normalize_image_query(brand, product_name), (brand, product_name))
+
+        results: Dict[str, str] = {}
+        misses: List[str] = []
+        seed_names = seed_names or {}
+        for key in queries:
+            cached = self.get_cached(key)
+            if cached is None:
+                seeded = self.seed.get(normalize_image_query('', seed_names.get(key, '')))
+                if seeded:
+                    self._store(key, seeded)
+                    results[key] = seeded
+                    self.stats['seeded'] += 1
+                else:
+                    misses.append(key)
+            else:
+                results[key] = cached
+                self.stats['hits' if cached else 'negative_hits'] += 1
+
+        if misses:
+            print(f"📸 이미지 조회: 캐시 {len(results)}개, 신규 조회 {len(misses)}개 (동시 {self.concurrency})")
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def fetch(key: str):
+                brand, product_name = queries[key]
+                async with semaphore:
+                    try:
+                        url = await self.lookup(product_name, brand)
+                    except Exception as e:
+                        # 일시적 오류는 실패 캐시에 남기지 않음 (다음 실행에서 재조회)
+                        print(f"⚠️ 이미지 조회 오류 ({brand} {product_name}): {e}")
+                        results[key] = ''
+                        self.stats['errors'] += 1
+                        return
+                self._store(key, url or '')
+                results[key] = url or ''
+                self.stats['fetched' if url else 'failed'] += 1
+
+            await asyncio.gather(*[fetch(key) for key in misses])
+        else:
+            print(f"📸 이미지 조회: 모든 {len(results)}개 캐시 적중 (Amazon 요청 없음)")
+
+        return results
+
+    async def resolve(self, brand: str, product_name: str) -> str:
+        results = await self.resolve_many([(brand, product_name)])
+        return results[normalize_image_query(brand, product_name)]
+
+    def summary(self) -> str:
+        s = self.stats
+        return f"캐시 적중 {s['hits']}, 실패 캐시 적중 {s['negative_hits']}, 수동 수집 결과 {s['seeded']}, 신규 조회 {s['fetched']}, 조회 실패 {s['failed']}, 조회 오류 {s['errors']}"
@@ -11,9 +11,8 @@ import json
 import random
 import time
 import re
-import aiohttp
 from datetime import datetime, timezone
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
 import requests
 import firebase_admin
@@ -34,11 +33,27 @@ from scraper_legacy import (
     calculate_nik_index, BRAND_NAME_MAPPING, auto_romanize_korean,
     normalize_product_name, CATEGORY_MAPPING, save_cache, load_cache
 )
+from browser_pool import get_browser_pool, close_browser_pool
+from image_resolver import ImageResolver, normalize_image_query
+from http_client import close_http_session
+from url_validator import UrlValidator
+from gemini_cache_store import get_gemini_cache, close_gemini_cache
+from key_matcher import KeyMatcher
+from product_registry import ProductRegistry, get_product_registry, save_product_registry
+from rank_history import apply_rank_history
+from firestore_batch import commit_documents
+from write_manifest import get_write_manifest, save_write_manifest
+from nik_index import EDITORIAL_SOURCE_WEIGHTS, nik_index_from_sources
+
+AMAZON_USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36"
 
 DATA_FILE = os.path.join(project_root, 'docs', 'Beauty Rankings DB Import.json')
 DEV_MODE = os.getenv('DEV_MODE', 'false').lower() == 'true'
 WRITE_TO_FIRESTORE = os.getenv('WRITE_TO_FIRESTORE', 'true').lower() == 'true'
 PREVIOUS_DATA_FILE = os.path.join(script_dir, 'editorial_ranking_v2_4.json')
+# 한글 제품명 → 현재 리포트 영문명(name_en) 수동 매핑
+# (이전 리포트와 수동 수집 이미지 결과는 한글명 기준, 현재 리포트는 name_en만 있음)
+PRODUCT_ALIASES_FILE = os.path.join(script_dir, 'product_aliases.json')
 
 def fix_image_url(url: str) -> str:
     """이미지 URL의 잘못된 문자(* 등)를 수정하여 정상 출력되도록 함"""
@@ -51,44 +66,53 @@ def fix_image_url(url: str) -> str:
 async def get_amazon_image_v2(product_name: str, brand: str) -> str:
     """
     Playwright를 사용하여 아마존에서 제품 이미지를 직접 검색합니다 (API 키 불필요).
+    
+    검색 결과에 이미지가 없으면 ''를 반환하고, 네트워크 오류/타임아웃은 예외를 그대로 던집니다
+    (ImageResolver가 일시적 오류를 실패 캐시에 남기지 않도록).
     """
     query = f"{brand} {product_name}".replace(" ", "+")
     search_url = f"https://www.amazon.com/s?k={query}"
     
-    try:
-        from playwright.async_api import async_playwright
-        async with async_playwright() as p:
-            print(f"🕵️ Amazon 직접 검색 시도: {brand} {product_name}")
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            # User-Agent 설정
-            await page.set_extra_http_headers({
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36"
-            })
-            
-            await page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
-            await asyncio.sleep(2) # 검색 결과 로딩 대기
-            
-            # 첫 번째 제품 이미지 찾기
-            img_selector = 'div[data-component-type="s-search-result"] img.s-image'
-            img_elem = await page.query_selector(img_selector)
-            
-            if img_elem:
-                src = await img_elem.get_attribute("src")
-                if src:
-                    # 고해상도 이미지로 변환
-                    import re
-                    high_res_src = re.sub(r'\._AC_.*?_\.', '.', src)
-                    print(f"✅ Amazon 이미지 발견: {high_res_src}")
-                    await browser.close()
-                    return high_res_src
-            
-            await browser.close()
-    except Exception as e:
-        print(f"⚠️ Amazon 직접 검색 오류: {e}")
+    # 제품마다 브라우저를 새로 띄우지 않고 공유 풀에서 페이지만 빌림
+    async with get_browser_pool().page(user_agent=AMAZON_USER_AGENT) as page:
+        print(f"🕵️ Amazon 직접 검색 시도: {brand} {product_name}")
+        
+        await page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
+        await asyncio.sleep(2) # 검색 결과 로딩 대기
+        
+        # 첫 번째 제품 이미지 찾기
+        img_selector = 'div[data-component-type="s-search-result"] img.s-image'
+        img_elem = await page.query_selector(img_selector)
+        
+        if img_elem:
+            src = await img_elem.get_attribute("src")
+            if src:
+                # 고해상도 이미지로 변환
+                high_res_src = re.sub(r'\._AC_.*?_\.', '.', src)
+                print(f"✅ Amazon 이미지 발견: {high_res_src}")
+                return high_res_src
     
     return ""
 
+_image_resolver = None
+
+def get_image_resolver() -> ImageResolver:
+    """Amazon 직접 검색(get_amazon_image_v2)을 조회 함수로 쓰는 실행 단위 이미지 리졸버"""
+    global _image_resolver
+    if _image_resolver is None:
+        _image_resolver = ImageResolver(get_amazon_image_v2)
+    return _image_resolver
+
+_cache_matcher = None
+
+def get_cache_matcher() -> Tuple[Dict[str, Dict[str, Any]], KeyMatcher]:
+    """Gemini 캐시 전체와 그 키로 만든 매칭 오토마톤 (실행당 1회 구축, 카테고리 간 공유)"""
+    global _cache_matcher
+    if _cache_matcher is None:
+        entries = get_gemini_cache().all()
+        _cache_matcher = (entries, KeyMatcher(entries.keys()))
+    return _cache_matcher
+
 def parse_brand_and_product(raw_name: str):
     """'브랜드명 제품명 (부가정보)' 형식에서 브랜드와 제품명 분리"""
     # 괄호 안의 내용 제거
@@ -105,27 +129,29 @@ def parse_brand_and_product(raw_name: str):
         
     return brand, product
 
-async def check_url_valid(url: str) -> bool:
-    """URL이 유효한지(404가 아닌지) 확인"""
-    if not url: return False
-    # Unsplash 및 Amazon 미디어 URL은 유효한 것으로 간주 (직접 넣은 고품질 이미지)
-    from urllib.parse import urlparse
-    try:
-        parsed_url = urlparse(url)
-        if parsed_url.netloc in ["images.unsplash.com", "m.media-amazon.com", "www.amazon.com"]:
-            return True
-    except:
-        pass
-    
+def load_korean_aliases(path: str = PRODUCT_ALIASES_FILE) -> Dict[str, str]:
+    """한글 제품명 → 영문명(name_en) 매핑 로드 (파일이 없거나 읽을 수 없으면 빈 매핑)"""
+    if not os.path.exists(path):
+        return {}
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url, timeout=5) as response:
-                return response.status == 200
-    except:
-        return False
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"⚠️ 제품 별칭 로드 오류: {e}")
+        return {}
+
+_url_validator = None
+
+def get_url_validator() -> UrlValidator:
+    """실행 단위 URL 검증기 (공유 세션 + 디스크 캐시)"""
+    global _url_validator
+    if _url_validator is None:
+        _url_validator = UrlValidator()
+    return _url_validator
+
+async def check_url_valid(url: str) -> bool:
+    """URL이 유효한지(404가 아닌지) 확인 - 여러 URL은 get_url_validator().validate_many 사용"""
+    return await get_url_validator().validate(url)
 
 def generate_default_tags(category_key: str, product_name: str) -> List[str]:
     """Gemini 실패 시 사용할 구체적인 제품별 태그 생성"""
@@ -198,8 +224,130 @@ def generate_default_tags(category_key: str, product_name: str) -> List[str]:
     tags.append("Trending")
     return list(set(tags))
 
-async def enrich_editorial_data(model, category_key: str, products_raw: List[Dict[str, Any]], previous_rank_map: Dict[str, int] = None) -> List[Dict[str, Any]]:
+def build_buy_url(image_query: str) -> str:
+    return f"https://www.amazon.com/s?k={image_query.replace(' ', '+')}&tag={os.getenv('NEXT_PUBLIC_AMAZON_AFFILIATE_ID', 'nextidealab-20')}"
+
+class EnrichmentContext:
+    """
+    실행 단위 강화 컨텍스트
+    
+    Gemini 캐시 매칭, 이미지 조회, 폴백 URL 검증, 태그를 고유 제품당 한 번만 계산하고
+    제품이 등장하는 모든 카테고리에서 재사용합니다 ('all'과 세부 카테고리에 중복된 제품 등).
+    """
+    
+    def __init__(self, image_resolver: ImageResolver = None, url_validator: UrlValidator = None,
+                 registry: ProductRegistry = None, korean_aliases: Dict[str, str] = None):
+        self.gemini_cache, self.key_matcher = get_cache_matcher()
+        self.registry = registry or get_product_registry()
+        self.image_resolver = image_resolver or get_image_resolver()
+        self.url_validator = url_validator or get_url_validator()
+        # 영문명(name_en) → 한글 제품명, 한글명은 같은 제품 ID의 별칭으로 등록
+        self.korean_names: Dict[str, str] = {}
+        aliases = load_korean_aliases() if korean_aliases is None else korean_aliases
+        for name_ko, name_en in aliases.items():
+            self.korean_names.setdefault(name_en, name_ko)
+            self.registry.add_alias(self.product_id(name_en), *parse_brand_and_product(name_ko), replace=True)
+        # 제품 ID → 카테고리와 무관한 강화 결과
+        self.products: Dict[str, Dict[str, Any]] = {}
+        # normalize_image_query → Amazon 이미지 URL ('' 이면 없음)
+        self.images: Dict[str, str] = {}
+        self.valid_urls: Dict[str, bool] = {}
+        # (카테고리, 제품 ID) → 기본 태그
+        self.tags: Dict[Tuple[str, str], List[str]] = {}
+        self.stats = {'products': 0, 'occurrences': 0}
+    
+    def _match_cache(self, name_en: str, name_ko: str = "") -> Dict[str, Any]:
+        """원문/한글명에 포함된 캐시 키 중 가장 긴 키로 번역·인덱스·인사이트 적용"""
+        brand, _ = parse_brand_and_product(name_en)
+        # nikIndex: 캐시에 AI 점수가 없으면 None → 카테고리 순위로 산출 (enrich_editorial_data)
+        record = {'brand': brand, 'productName': name_en, 'nikIndex': None, 'culturalContext': ""}
+        try:
+            matched_key = self.key_matcher.longest_match(name_en, name_ko)
+            if matched_key:
+                entry = self.gemini_cache[matched_key]
+                record['productName'] = entry.get('productName', name_en)
+                record['nikIndex'] = entry.get('nikIndex')
+                record['culturalContext'] = entry.get('culturalContext', "")
+                record['imageQuery'] = entry.get('imageQuery', f"{brand} {record['productName']}")
+        except Exception as e:
+            print(f"⚠️ 오프라인 캐시 적용 오류 ({name_en}): {e}")
+        record.setdefault('imageQuery', f"{brand} {record['productName']}")
+        record['buyUrl'] = build_buy_url(record['imageQuery'])
+        record['imageKey'] = normalize_image_query(brand, record['productName'])
+        return record
+    
+    def product_id(self, name_en: str) -> str:
+        """원문 영문명 → 레지스트리 제품 ID"""
+        return self.registry.resolve(*parse_brand_and_product(name_en))
+    
+    async def prepare(self, items: List[Dict[str, Any]]):
+        """
+        아직 강화하지 않은 고유 제품만 캐시 매칭 → 이미지 일괄 조회 → 폴백 URL 일괄 검증
+        (이미 준비된 제품만 있으면 요청 없이 반환)
+        """
+        items = list(items)
+        new_records = {}
+        # 이미지 캐시 키 → 한글 제품명 (수동 수집 이미지 결과가 한글명 기준)
+        seed_names = {}
+        for item in items:
+            name_en = item.get('name_en', '')
+            product_id = self.product_id(name_en)
+            if product_id not in self.products and product_id not in new_records:
+                new_records[product_id] = self._match_cache(name_en)
+                name_ko = item.get('name') or self.korean_names.get(name_en)
+                if name_ko:
+                    seed_names[new_records[product_id]['imageKey']] = name_ko
+        self.stats['occurrences'] += len(items)
+        if not new_records:
+            return
+        self.products.update(new_records)
+        self.stats['products'] += len(new_records)
+        
+        # Amazon 이미지 - 캐시 미스만 일괄 조회
+        self.images.update(await self.image_resolver.resolve_many(
+            ((record['brand'], record['productName']) for record in new_records.values()), seed_names
+        ))
+        
+        # Amazon 검색에 실패한 제품의 JSON 이미지 URL만 일괄 검증 (404 등 오류 응답 이미지만 폴백으로 대체,
+        # 네트워크 오류로 확인하지 못한 URL은 기존처럼 그대로 사용)
+        fallback_urls = {
+            fix_image_url(item.get('image_url', item.get('url', ''))) for item in items
+            if not self.amazon_image(self.product_id(item.get('name_en', '')))
+        }
+        fallback_urls = [url for url in fallback_urls if url and url not in self.valid_urls]
+        self.valid_urls.update(await self.url_validator.validate_many(fallback_urls, network_error_valid=True))
+    
+    def amazon_image(self, product_id: str) -> str:
+        record = self.products.get(product_id)
+        return self.images.get(record['imageKey'], '') if record else ''
+    
+    def tags_for(self, category_key: str, product_id: str, name_en: str) -> List[str]:
+        key = (category_key, product_id)
+        if key not in self.tags:
+            self.tags[key] = generate_default_tags(category_key, name_en)
+        return list(self.tags[key])
+    
+    def summary(self) -> str:
+        return f"고유 제품 {self.stats['products']}개 / 카테고리 등장 {self.stats['occurrences']}회"
+
+_enrichment_context = None
+
+def get_enrichment_context() -> EnrichmentContext:
+    """실행 단위 강화 컨텍스트 (카테고리 간 공유)"""
+    global _enrichment_context
+    if _enrichment_context is None:
+        _enrichment_context = EnrichmentContext()
+    return _enrichment_context
+
+async def enrich_editorial_data(model, category_key: str, products_raw: List[Dict[str, Any]], previous_rank_map: Dict[str, int] = None, context: EnrichmentContext = None) -> List[Dict[str, Any]]:
     """제품 리스트를 가공하고 Gemini로 강화 (트렌드 계산 및 기본 태그 포함)"""
+    if context is None:
+        context = get_enrichment_context()
+    # 컨텍스트에 없는 제품만 준비 (main()에서 전체를 미리 준비했으면 요청 없음)
+    missing = [item for item in products_raw if context.product_id(item.get('name_en', '')) not in context.products]
+    if missing:
+        await context.prepare(missing)
+    
     processed_products = []
     
     # 1. 기본 구조 생성
@@ -215,9 +363,9 @@ async def enrich_editorial_data(model, category_key: str, products_raw: List[Dic
         # 브랜드명 변환 (이미 영어인 경우가 많으므로 보수적으로 처리)
         brand_en = brand_ko # 이미 영어일 가능성 높음
         
-        # 트렌드 계산 (v2.3 대비 - 이름 정규화 후 매칭)
+        # 트렌드 계산 (이전 버전 대비 - 레지스트리 제품 ID로 매칭)
         trend = 0
-        product_key = f"{brand_ko}_{name_ko}".replace(" ", "")
+        product_key = context.registry.resolve(brand_ko, name_ko)
         if previous_rank_map and product_key in previous_rank_map:
             prev_rank = previous_rank_map[product_key]
             trend = prev_rank - item.get('rank', idx)
@@ -229,7 +377,8 @@ async def enrich_editorial_data(model, category_key: str, products_raw: List[Dic
             'productName': name_en, # 전체 영문명을 productName으로 사용
             'productNameKo': "", # 필요시 추출 가능
             'original_raw': name_en,
-            'tags': generate_default_tags(category_key, name_en),
+            'productId': product_key,
+            'tags': context.tags_for(category_key, product_key, name_en),
             'subcategory': category_key,
             'trend': trend,
             'price': price_val,
@@ -279,48 +428,24 @@ Response format (JSON only):
 }}
 """
     
-    try:
-        # Load local translation cache to bypass API 403 error
-        import os
-        import json
-        
-        cache_file = os.path.join(os.path.dirname(__file__), 'gemini_cache.json')
-        if os.path.exists(cache_file):
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                gemini_cache = json.load(f)
-        else:
-            gemini_cache = {}
-            
-        for p in processed_products:
-            raw_name = p['original_raw']
-            
-            # Match directly or by checking if the cache key is in the name
-            matched_key = None
-            for key in gemini_cache.keys():
-                if key in raw_name or key in p['productNameKo']:
-                    matched_key = key
-                    break
-            
-            if matched_key:
-                entry = gemini_cache[matched_key]
-                p['productName'] = entry.get('productName', p['productName'])
-                p['nikIndex'] = entry.get('nikIndex', 95.0)
-                p['culturalContext'] = entry.get('culturalContext', "")
-                p['imageQuery'] = entry.get('imageQuery', f"{p['brand']} {p['productName']}")
-            else:
-                p['nikIndex'] = 95.0
-                p['culturalContext'] = ""
-                p['imageQuery'] = f"{p['brand']} {p['productName']}"
-            
-            # Amazon URL
-            image_query = p['imageQuery']
-            p['buyUrl'] = f"https://www.amazon.com/s?k={image_query.replace(' ', '+')}&tag={os.getenv('NEXT_PUBLIC_AMAZON_AFFILIATE_ID', 'nextidealab-20')}"
-            
-    except Exception as e:
-        print(f"⚠️ 오프라인 캐시 적용 오류 ({category_key}): {e}")
+    # 캐시에 AI 점수가 없는 제품용 NIK 지수 - 이번 리포트 순위와 이전 리포트 순위를 가중 Borda로 통합
+    rank_sources = {'editorial': {p['productId']: p['rank'] for p in processed_products}}
+    if previous_rank_map:
+        rank_sources['previous'] = {pid: previous_rank_map[pid] for pid in rank_sources['editorial'] if pid in previous_rank_map}
+    rank_nik = nik_index_from_sources(rank_sources, EDITORIAL_SOURCE_WEIGHTS)
+    
+    # Gemini 캐시 적용 (고유 제품당 한 번 계산된 결과 재사용)
+    for p in processed_products:
+        record = context.products[p['productId']]
+        p['productName'] = record['productName']
+        p['nikIndex'] = record['nikIndex'] if record['nikIndex'] is not None else rank_nik[p['productId']]
+        p['culturalContext'] = record['culturalContext']
+        p['imageQuery'] = record['imageQuery']
+        p['buyUrl'] = record['buyUrl']
 
-    # 3. 이미지 연동 확인 (Amazon)
+    # 3. 이미지 연동 확인 (Amazon) - 컨텍스트에서 일괄 조회/검증된 결과 사용
     print(f"📸 '{category_key}' 이미지 및 링크 최종 확인 중...")
+    
     for p in processed_products:
         # 이미지 로직 개선: 
         # 1. JSON의 이미지 URL이 존재하더라도 404일 확률이 높으므로, Amazon 검색 로직을 적극 활용하거나
@@ -329,12 +454,12 @@ Response format (JSON only):
         target_img = None
         
         # Amazon 검색 우선 (Working Image 확보를 위해)
-        amazon_img = await get_amazon_image_v2(p['productName'], p['brand'])
+        amazon_img = context.amazon_image(p['productId'])
         if amazon_img:
             target_img = amazon_img
         
-        # Amazon 검색 결과가 없으면 JSON 이미지 사용 (차선책)
-        if not target_img:
+        # Amazon 검색 결과가 없으면 JSON 이미지 사용 (차선책, 오류 응답이 확인된 URL 제외)
+        if not target_img and context.valid_urls.get(p.get('fixedImageUrl')):
             target_img = p.get('fixedImageUrl')
         
         # 여전히 없으면 Unsplash 고유 이미지 (검색어 기반)
@@ -349,6 +474,27 @@ Response format (JSON only):
 
     return processed_products
 
+def load_previous_rank_map(path: str, registry: ProductRegistry) -> Dict[str, Dict[str, int]]:
+    """
+    이전 버전 리포트의 카테고리별 {제품 ID: 순위} (트렌드용)
+    
+    이전 리포트는 한글명(name)만 있으므로, 현재 리포트(name_en)와 같은 ID가 나오려면
+    EnrichmentContext가 product_aliases.json의 한글명 별칭을 먼저 등록해야 합니다.
+    """
+    prev_master_rank_map = {}
+    if not os.path.exists(path):
+        return prev_master_rank_map
+    print(f"📈 트렌드 분석을 위해 이전 버전 로드: {path}")
+    with open(path, 'r', encoding='utf-8') as f:
+        prev_data = json.load(f)
+    for p_cat, p_items in prev_data.get('categories', {}).items():
+        cat_map = {}
+        for p_item in p_items:
+            p_brand, p_product = parse_brand_and_product(p_item.get('name_en') or p_item['name'])
+            cat_map[registry.resolve(p_brand, p_product)] = p_item['rank']
+        prev_master_rank_map[p_cat] = cat_map
+    return prev_master_rank_map
+
 async def main():
     print("🚀 에디토리얼 랭킹 임포트 시작")
     
@@ -364,29 +510,20 @@ async def main():
     db = initialize_firebase()
     model = initialize_gemini()
     
-    today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
-    total_count = 0
     
-    # 2.5 이전 버전 데이터 로드 (트렌드용)
-    prev_master_rank_map = {}
-    if os.path.exists(PREVIOUS_DATA_FILE):
-        print(f"📈 트렌드 분석을 위해 이전 버전 로드: {PREVIOUS_DATA_FILE}")
-        with open(PREVIOUS_DATA_FILE, 'r', encoding='utf-8') as f:
-            prev_data = json.load(f)
-            for p_cat, p_items in prev_data.get('categories', {}).items():
-                cat_map = {}
-                for p_item in p_items:
-                    p_brand_ko, p_name_ko = parse_brand_and_product(p_item['name'])
-                    p_key = f"{p_brand_ko}_{p_name_ko}".replace(" ", "")
-                    cat_map[p_key] = p_item['rank']
-                prev_master_rank_map[p_cat] = cat_map
+    # 2.5 이전 버전 데이터 로드 (트렌드용) - 컨텍스트가 한글명 별칭을 등록한 뒤에 해석
+    context = get_enrichment_context()
+    prev_master_rank_map = load_previous_rank_map(PREVIOUS_DATA_FILE, context.registry)
+    
+    # 3. 고유 제품 단위 강화 (캐시 매칭/이미지 조회/URL 검증을 전체 카테고리에 대해 한 번에)
+    await context.prepare(item for entry in master_data for item in entry.get('items', []))
+    print(f"🧩 강화 컨텍스트: {context.summary()}")
     
-    # 3. 데이터 처리 및 저장
+    # 4. 카테고리별 가공 및 저장 (동시 실행)
     # 신규 JSON 구조는 카테고리별 객체의 리스트임
-    for entry in master_data:
+    async def process_category(entry: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
         cat_key = entry.get('category', 'all')
         products_raw = entry.get('items', [])
-        report_date = entry.get('date', today)
         
         print(f"\n📂 카테고리 처리 중: {cat_key.upper()} ({len(products_raw)} items)")
         
@@ -394,15 +531,19 @@ async def main():
         prev_rank_map = prev_master_rank_map.get(cat_key)
         
         # 데이터 강화
-        enriched_products = await enrich_editorial_data(model, cat_key, products_raw, prev_rank_map)
+        enriched_products = await enrich_editorial_data(model, cat_key, products_raw, prev_rank_map, context)
         
         if cat_key == 'all':
             firestore_category = 'beauty'
         else:
             firestore_category = f"beauty-{cat_key}"
-            
+        
         # 날짜 동기화: JSON의 과거 날짜 대신 실제 오늘 날짜(2026-03-06)를 사용하여 최신성 확보
-        report_date = datetime.now().strftime("%Y-%m-%d")
+        # (순위 이력 스냅샷과 같은 UTC 기준)
+        report_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        
+        # 순위 이력 기반 모멘텀 지표 (trend 옆 필드)
+        enriched_products = apply_rank_history(firestore_category, enriched_products, report_date)
             
         doc_id = f"{report_date}_{firestore_category}"
         
@@ -415,17 +556,41 @@ async def main():
             'reportTitle': f"NIK Beauty Index: Weekly Editorial Report ({report_date})"
         }
         
-        if WRITE_TO_FIRESTORE:
-            db.collection('daily_rankings').document(doc_id).set(data)
-            print(f"✅ Firestore 저장 완료: {doc_id}")
-        else:
+        if not WRITE_TO_FIRESTORE:
             print(f"🧪 [DEV_MODE] Firestore 저장 스킵: {doc_id}")
             if enriched_products:
                 print(f"🔎 DEBUG [Item 0]: {json.dumps(enriched_products[0], indent=2, ensure_ascii=False)}")
             
-        total_count += len(enriched_products)
+        return doc_id, data
+    
+    documents = await asyncio.gather(*[process_category(entry) for entry in master_data])
+    total_count = sum(len(data['items']) for _, data in documents)
+    
+    # 5. 모든 카테고리 문서를 WriteBatch로 한 번에 커밋 (중간 실패 시 일부 카테고리만 갱신되는 것 방지)
+    if WRITE_TO_FIRESTORE:
+        collection = db.collection('daily_rankings')
+        await commit_documents(db, [(collection.document(doc_id), data) for doc_id, data in documents],
+                               manifest=get_write_manifest())
+        print(f"✅ Firestore 저장 완료: {', '.join(doc_id for doc_id, _ in documents)}")
         
+    print(f"📸 이미지 캐시: {get_image_resolver().summary()}")
+    
     print(f"\n✨ 완료! 총 {total_count}개 제품이 처리되었습니다.")
 
+async def run():
+    try:
+        await main()
+    finally:
+        # 중간에 실패해도 이미 조회한 이미지 결과는 보존
+        if _image_resolver is not None:
+            _image_resolver.save()
+        if _url_validator is not None:
+            _url_validator.save()
+        save_product_registry()
+        save_write_manifest()
+        close_gemini_cache()
+        await close_browser_pool()
+        await close_http_session()
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(run())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+K-Rank Key Matcher
+캐시 키 목록으로 Aho-Corasick 오토마톤을 한 번 만들고, 제품명에 포함된 가장 긴 키를 찾습니다.
+
+- 구축: 키 길이 합에 비례 (실행당 1회)
+- 조회: 텍스트 길이에 비례 (키 개수와 무관)
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+
+class KeyMatcher:
+    """
+    부분 문자열 다중 패턴 매칭기 (Aho-Corasick)
+
+    Args:
+        keys: 찾을 패턴(캐시 키) 목록
+    """
+
+    def __init__(self, keys: Iterable[str]):
+        # 상태별 전이 / 실패 링크 / 해당 상태에서 끝나는 가장 긴 키
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.best: List[Optional[str]] = [None]
+        self.size = 0
+        for key in keys:
+            self._add(key)
+        self._build()
+
+    def _add(self, key: str):
+        if not key:
+            return
+        state = 0
+        for ch in key:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.best.append(None)
+            state = nxt
+        if self.best[state] is None:
+            self.size += 1
+        self.best[state] = key
+
+    def _build(self):
+        """BFS로 실패 링크를 만들고, 각 상태의 best를 접미사 상태의 best로 보강"""
+        # 루트의 자식은 실패 링크가 루트(0)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                # 자기 자신에서 끝나는 키가 접미사 키보다 항상 길다
+                if self.best[nxt] is None:
+                    self.best[nxt] = self.best[self.fail[nxt]]
+
+    def longest_match(self, *texts: str) -> Optional[str]:
+        """
+        texts 중 어디에든 포함된 키 중 가장 긴 키 반환 (길이가 같으면 먼저 나타난 키)
+
+        Returns:
+            매칭된 키 (없으면 None)
+        """
+        found: Optional[str] = None
+        goto, fail, best = self.goto, self.fail, self.best
+        for text in texts:
+            if not text:
+                continue
+            state = 0
+            for ch in text:
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+                candidate = best[state]
+                if candidate is not None and (found is None or len(candidate) > len(found)):
+                    found = candidate
+        return found
+
+    def __len__(self) -> int:
+        return self.size
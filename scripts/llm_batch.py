@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+K-Rank LLM Batch Engine
+제품 리스트를 예상 토큰 예산 단위 청크로 나누어 Gemini에 동시에 요청하고, 결과를 rank 기준으로 병합합니다.
+
+- 청크 크기: 항목별 예상 토큰 합이 GEMINI_CHUNK_TOKENS 이하가 되도록 분할
+- 동시 요청: generate_content_async + 세마포어 (GEMINI_CONCURRENCY)
+- 속도 제한: 분당 요청 수(GEMINI_RPM)와 분당 토큰 수(GEMINI_TPM)를 논블로킹 토큰 버킷으로 제어
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from response_cache import Validator, lookup_cached, store_cached
+
+GEMINI_RPM = float(os.getenv('GEMINI_RPM', '15'))
+GEMINI_TPM = float(os.getenv('GEMINI_TPM', '1000000'))
+GEMINI_CHUNK_TOKENS = int(os.getenv('GEMINI_CHUNK_TOKENS', '1500'))
+GEMINI_CONCURRENCY = int(os.getenv('GEMINI_CONCURRENCY', '4'))
+# 응답 토큰은 미리 알 수 없으므로 항목당 예상치로 TPM 예산에 포함
+OUTPUT_TOKENS_PER_ITEM = 120
+
+
+def estimate_tokens(text: str) -> int:
+    """대략적인 토큰 수 추정 (영문 ~4자/토큰, 한글 등 비 ASCII ~1.5자/토큰)"""
+    ascii_chars = sum(1 for c in text if ord(c) < 128)
+    other_chars = len(text) - ascii_chars
+    return int(ascii_chars / 4 + other_chars / 1.5) + 1
+
+
+def parse_json_response(text: str) -> Dict[str, Any]:
+    """Gemini 응답 텍스트에서 JSON 파싱 (마크다운 코드 블록 제거)"""
+    result_text = text.strip()
+    if result_text.startswith('```'):
+        result_text = result_text.split('```')[1]
+        if result_text.startswith('json'):
+            result_text = result_text[4:]
+    return json.loads(result_text)
+
+
+def chunk_by_token_budget(items: Sequence[Any], render_item: Callable[[Any], str], budget: int) -> List[List[Any]]:
+    """
+    항목을 순서대로 묶되, 각 청크의 예상 토큰 합이 budget을 넘지 않도록 분할
+    (단일 항목이 budget보다 크면 그 항목만으로 청크 구성)
+    """
+    chunks: List[List[Any]] = []
+    current: List[Any] = []
+    current_tokens = 0
+    for item in items:
+        tokens = estimate_tokens(render_item(item))
+        if current and current_tokens + tokens > budget:
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append(item)
+        current_tokens += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class AsyncTokenBucket:
+    """분당 rate 만큼 채워지는 토큰 버킷 - 부족하면 asyncio.sleep으로 대기 (이벤트 루프를 막지 않음)"""
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = max(1.0, rate_per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """amount 만큼 토큰을 확보할 때까지 대기하고, 대기한 시간(초)을 반환"""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        # 락으로 요청 순서(FIFO)를 보장
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+
+class RateLimiter:
+    """요청 수(RPM)와 토큰 수(TPM)를 함께 제한"""
+
+    def __init__(self, rpm: float = GEMINI_RPM, tpm: float = GEMINI_TPM):
+        self.requests = AsyncTokenBucket(rpm)
+        self.tokens = AsyncTokenBucket(tpm)
+
+    async def acquire(self, tokens: int) -> float:
+        waited = await self.requests.acquire(1)
+        waited += await self.tokens.acquire(tokens)
+        return waited
+
+
+class LLMBatchEngine:
+    """
+    토큰 예산 기반 청크 분할 + 동시 요청 + RPM/TPM 제한을 갖춘 Gemini 배치 실행기
+
+    Args:
+        model: generate_content_async를 지원하는 Gemini 모델
+        chunk_tokens: 청크당 항목 입력 토큰 예산
+        concurrency: 동시에 진행할 최대 요청 수
+        limiter: 공유 RateLimiter (여러 엔진이 같은 할당량을 쓰면 공유)
+    """
+
+    def __init__(self, model, chunk_tokens: int = GEMINI_CHUNK_TOKENS,
+                 concurrency: int = GEMINI_CONCURRENCY, limiter: Optional[RateLimiter] = None):
+        self.model = model
+        self.chunk_tokens = chunk_tokens
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.limiter = limiter or RateLimiter()
+
+    async def generate(self, prompt: str, expected_output_tokens: int = 0,
+                       validate: Optional[Validator] = None) -> str:
+        """
+        속도 제한을 지키며 단일 프롬프트 실행 후 응답 텍스트 반환 (응답 캐시 적중 시 API 호출 없음)
+
+        validate가 주어지면 통과한 응답만 캐시하고, 실패하면 예외를 그대로 전달합니다.
+        """
+        cached = lookup_cached(self.model, prompt, validate)
+        if cached is not None:
+            return cached
+        waited = await self.limiter.acquire(estimate_tokens(prompt) + expected_output_tokens)
+        if waited > 0.5:
+            print(f"  ⏳ Gemini 속도 제한 대기: {waited:.1f}초")
+        async with self.semaphore:
+            response = await self.model.generate_content_async(prompt)
+        text = response.text
+        if validate is not None:
+            validate(text)
+        store_cached(self.model, prompt, text)
+        return text
+
+    async def run(self, items: Sequence[Any], render_item: Callable[[Any], str],
+                  build_prompt: Callable[[List[Any]], str], result_key: str,
+                  label: str = 'Gemini') -> List[Dict[str, Any]]:
+        """
+        항목을 청크로 나누어 동시에 요청하고 응답의 result_key 리스트를 rank 기준으로 병합
+
+        Args:
+            items: 처리할 항목 리스트
+            render_item: 프롬프트에 들어갈 항목 한 줄 (토큰 추정용)
+            build_prompt: 청크 → 프롬프트
+            result_key: 응답 JSON에서 결과 리스트의 키 (예: 'translations', 'tags')
+            label: 로그용 작업 이름
+
+        Returns:
+            rank 순으로 정렬된 결과 엔트리 리스트
+
+        Raises:
+            모든 청크가 실패하면 첫 번째 오류를 다시 발생 (호출자의 폴백 처리용)
+        """
+        chunks = chunk_by_token_budget(items, render_item, self.chunk_tokens)
+        if not chunks:
+            return []
+        print(f"  🧩 {label}: {len(items)}개 항목 → {len(chunks)}개 청크 (청크당 ~{self.chunk_tokens} 토큰)")
+
+        def validate(text: str) -> List[Dict[str, Any]]:
+            entries = parse_json_response(text).get(result_key)
+            if not isinstance(entries, list):
+                raise ValueError(f"응답에 '{result_key}' 리스트가 없습니다")
+            return entries
+
+        async def run_chunk(chunk: List[Any]) -> List[Dict[str, Any]]:
+            text = await self.generate(build_prompt(chunk), OUTPUT_TOKENS_PER_ITEM * len(chunk), validate)
+            return validate(text)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*[run_chunk(chunk) for chunk in chunks], return_exceptions=True)
+
+        merged: Dict[Any, Dict[str, Any]] = {}
+        errors = []
+        for index, result in enumerate(results):
+            if isinstance(result, Exception):
+                print(f"  ⚠️ {label} 청크 {index + 1}/{len(chunks)} 실패: {result}")
+                errors.append(result)
+                continue
+            for entry in result:
+                if isinstance(entry, dict) and entry.get('rank') is not None:
+                    merged[entry['rank']] = entry
+
+        if errors and len(errors) == len(chunks):
+            raise errors[0]
+
+        print(f"  ✅ {label}: {len(chunks) - len(errors)}/{len(chunks)}개 청크 완료 ({time.perf_counter() - started:.1f}초)")
+        return [merged[rank] for rank in sorted(merged, key=lambda r: (str(type(r)), r))]
+
+
+_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """프로세스 전역 Gemini RateLimiter (모든 엔진이 같은 API 할당량을 공유)"""
+    global _limiter
+    if _limiter is None:
+        _limiter = RateLimiter()
+    return _limiter
+
+
+def get_llm_engine(model) -> LLMBatchEngine:
+    """전역 RateLimiter를 공유하는 배치 엔진 생성"""
+    return LLMBatchEngine(model, limiter=get_rate_limiter())
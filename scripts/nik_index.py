@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+K-Rank NIK Beauty Index
+카테고리 전체 제품의 NIK 지수를 NumPy로 한 번에 계산합니다.
+
+Final Score = (Hwahae_Pts * 0.4) + (Glowpick_Pts * 0.4) + (Viral_Pts * 0.2)
+역순 점수제: 1위 = 100점, 2위 = 99점...
+
+글로우픽 순위나 SNS 점수가 없으면 화해 순위 기반으로 추정하되, 변동폭(noise)은 제품 식별자 해시에서 만들어
+같은 제품이면 실행마다 같은 점수가 나옵니다 (캐시 가능).
+가중 합산은 rank_aggregation의 가중 Borda(1위 = 100점)로 처리하며, 소스별 실제 순위가 있으면
+nik_index_from_sources로 추정 없이 부분 커버리지 그대로 통합할 수 있습니다
+(에디토리얼 임포트는 이번/이전 리포트 순위를 EDITORIAL_SOURCE_WEIGHTS로 통합).
+"""
+
+import hashlib
+from typing import Dict, Hashable, Mapping, Optional, Sequence
+
+import numpy as np
+
+from rank_aggregation import BORDA_DEPTH, SourceRankings, aggregate_rankings, weighted_borda
+
+HWAHAE_WEIGHT = 0.4
+GLOWPICK_WEIGHT = 0.4
+VIRAL_WEIGHT = 0.2
+NIK_SOURCE_WEIGHTS = {'hwahae': HWAHAE_WEIGHT, 'glowpick': GLOWPICK_WEIGHT, 'sns': VIRAL_WEIGHT}
+# 에디토리얼 임포트: 이번 리포트 순위 + 이전 리포트 순위 (이전 리포트에 없으면 이번 순위만으로 재정규화)
+EDITORIAL_SOURCE_WEIGHTS = {'editorial': 0.8, 'previous': 0.2}
+
+# 추정값 변동폭: 글로우픽 순위 ±2, SNS 점수 ±5
+GLOWPICK_NOISE = 2
+SNS_NOISE = 5
+SNS_MIN, SNS_MAX = 70, 100
+
+
+def _to_array(values: Optional[Sequence], size: int) -> np.ndarray:
+    """None/누락값을 NaN으로 바꾼 float 배열 (values가 None이면 전부 NaN)"""
+    if values is None:
+        return np.full(size, np.nan)
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def identity_seeds(identities: Sequence[str]) -> np.ndarray:
+    """제품 식별자 → 64비트 시드 (SHA-256 앞 8바이트)"""
+    digest = b''.join(hashlib.sha256(str(identity).encode('utf-8')).digest()[:8] for identity in identities)
+    return np.frombuffer(digest, dtype='>u8').astype(np.uint64)
+
+
+def seeded_noise(seeds: np.ndarray, amplitude: int, salt: int) -> np.ndarray:
+    """시드별 [-amplitude, amplitude] 정수 노이즈 (salt로 용도별 독립 스트림 구분)"""
+    with np.errstate(over='ignore'):
+        # splitmix64 한 단계로 시드와 salt를 섞음
+        z = seeds + np.uint64(0x9E3779B97F4A7C15) * np.uint64(salt + 1)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+    return (z % np.uint64(2 * amplitude + 1)).astype(np.int64) - amplitude
+
+
+def calculate_nik_indices(hwahae_ranks: Sequence[int],
+                          glowpick_ranks: Optional[Sequence[Optional[int]]] = None,
+                          sns_hype_scores: Optional[Sequence[Optional[float]]] = None,
+                          identities: Optional[Sequence[str]] = None) -> np.ndarray:
+    """
+    NIK 지수 일괄 계산
+
+    Args:
+        hwahae_ranks: 화해 순위 배열
+        glowpick_ranks: 글로우픽 순위 배열 (None 또는 항목별 None이면 추정)
+        sns_hype_scores: SNS 화제성 점수 배열 (None 또는 항목별 None이면 추정)
+        identities: 제품 식별자 배열 (productId 등) - 추정값 노이즈의 시드, 없으면 화해 순위 사용
+
+    Returns:
+        입력 순서와 같은 NIK 지수 배열 (소수점 1자리, 화해 순위가 없으면 NaN)
+    """
+    hwahae = _to_array(hwahae_ranks, 0)
+    size = len(hwahae)
+    glowpick = _to_array(glowpick_ranks, size)
+    sns = _to_array(sns_hype_scores, size)
+    if identities is None:
+        identities = [str(r) for r in hwahae_ranks]
+    seeds = identity_seeds(identities)
+
+    # 1. 역순 점수 변환 (최대 100점 기준)
+    hwahae_pts = np.maximum(0, 101 - hwahae)
+
+    # 글로우픽 및 SNS 데이터가 없을 경우 화해 점수를 기반으로 상관관계 예측 (폴백)
+    estimated_glowpick = np.maximum(1, hwahae + seeded_noise(seeds, GLOWPICK_NOISE, salt=0))
+    glowpick = np.where(np.isnan(glowpick), estimated_glowpick, glowpick)
+
+    estimated_sns = np.clip(hwahae_pts + seeded_noise(seeds, SNS_NOISE, salt=1), SNS_MIN, SNS_MAX)
+    sns = np.where(np.isnan(sns), estimated_sns, sns)
+
+    # 2. 가중치 적용 - SNS 점수는 같은 Borda 점수가 나오는 순위(101 - 점수)로 바꿔 한 행렬로 합산
+    ranks = np.column_stack([hwahae, glowpick, BORDA_DEPTH + 1 - sns])
+    weights = np.array([HWAHAE_WEIGHT, GLOWPICK_WEIGHT, VIRAL_WEIGHT])
+    final_score = weighted_borda(ranks, weights, depth=BORDA_DEPTH, coverage='zero')
+    return np.round(final_score, 1)
+
+
+def nik_index_from_sources(sources: SourceRankings, weights: Mapping[str, float] = NIK_SOURCE_WEIGHTS,
+                           method: str = 'borda', ids: Optional[Sequence[Hashable]] = None) -> Dict[Hashable, float]:
+    """
+    소스별 실제 순위로 NIK 지수 계산 (추정값 없이 아이템이 등장한 소스 가중치로 재정규화)
+
+    Args:
+        sources: {'hwahae': {제품 ID: 순위}, 'glowpick': {...}, 'editorial': {...}, ...}
+        weights: 소스별 가중치 (기본 화해 0.4 / 글로우픽 0.4 / SNS 0.2)
+        method: 'borda' (기존 역순 점수제와 같은 척도) 또는 'rrf'
+        ids: 결과에 포함할 제품 ID (없으면 모든 소스의 합집합)
+
+    Returns:
+        {제품 ID: NIK 지수}
+    """
+    return aggregate_rankings(sources, weights, method=method, ids=ids, coverage='renormalize')
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+K-Rank Product Matcher
+오늘/이전 랭킹의 제품을 퍼지 매칭하여 같은 제품을 찾습니다 (트렌드 계산용).
+
+- 블로킹: 정규화된 브랜드가 같은 제품끼리만 비교
+- 후보 생성: (브랜드, 토큰) 역색인으로 토큰을 하나 이상 공유하는 이전 제품만 후보로 사용
+- 유사도: 단어 토큰 Jaccard + 문자 3-gram Jaccard를 블록 단위 행렬 연산(NumPy)으로 일괄 계산
+- 할당: 임계값(PRODUCT_MATCH_THRESHOLD) 이상 쌍에 대해 헝가리안 알고리즘으로 점수 합이 최대인 1:1 매칭
+"""
+
+import os
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Sequence, Set, Tuple
+
+import numpy as np
+
+PRODUCT_MATCH_THRESHOLD = float(os.getenv('PRODUCT_MATCH_THRESHOLD', '0.5'))
+# 최종 점수 = TOKEN_WEIGHT * 토큰 Jaccard + (1 - TOKEN_WEIGHT) * 3-gram Jaccard
+TOKEN_WEIGHT = 0.5
+NGRAM_SIZE = 3
+
+# 용량/수량 표기 (50ml, 1.7 fl oz, 10매, 2ea 등) - 용량만 다른 제품을 같은 제품으로 보기 위해 제거
+SIZE_PATTERN = re.compile(
+    r'\d+(?:\.\d+)?\s*(?:ml|l|g|kg|mg|oz|fl\s*oz|ea|pcs|sheets?|매|개|입|p)\b',
+    re.IGNORECASE
+)
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+Match = Tuple[int, float]
+
+
+def normalize_brand(brand: str) -> str:
+    """블로킹 키용 브랜드 정규화 (소문자, 영숫자/한글만)"""
+    return re.sub(r'[\W_]+', '', (brand or '').lower())
+
+
+def product_tokens(name: str) -> List[str]:
+    """괄호 부가정보와 용량 표기를 제거한 소문자 단어 토큰"""
+    text = re.sub(r'\(.*?\)|\[.*?\]', ' ', (name or '').lower())
+    text = SIZE_PATTERN.sub(' ', text)
+    return TOKEN_PATTERN.findall(text)
+
+
+def char_ngrams(tokens: Sequence[str], n: int = NGRAM_SIZE) -> Set[str]:
+    text = ' '.join(tokens)
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def _jaccard_matrix(left: List[Set[str]], right: List[Set[str]]) -> np.ndarray:
+    """집합 리스트 두 개의 Jaccard 유사도 행렬 (이진 특징 행렬 곱으로 교집합을 일괄 계산)"""
+    vocab: Dict[str, int] = {}
+    for features in left + right:
+        for feature in features:
+            vocab.setdefault(feature, len(vocab))
+    a = np.zeros((len(left), len(vocab)), dtype=np.float32)
+    b = np.zeros((len(right), len(vocab)), dtype=np.float32)
+    for i, features in enumerate(left):
+        a[i, [vocab[f] for f in features]] = 1.0
+    for j, features in enumerate(right):
+        b[j, [vocab[f] for f in features]] = 1.0
+    intersection = a @ b.T
+    union = a.sum(axis=1)[:, None] + b.sum(axis=1)[None, :] - intersection
+    return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+
+def similarity_matrix(current_tokens: List[List[str]], previous_tokens: List[List[str]]) -> np.ndarray:
+    """토큰 Jaccard와 문자 3-gram Jaccard의 가중 평균 행렬 (current × previous)"""
+    token_sim = _jaccard_matrix([set(t) for t in current_tokens], [set(t) for t in previous_tokens])
+    ngram_sim = _jaccard_matrix([char_ngrams(t) for t in current_tokens], [char_ngrams(t) for t in previous_tokens])
+    return TOKEN_WEIGHT * token_sim + (1 - TOKEN_WEIGHT) * ngram_sim
+
+
+def optimal_assignment(scores: np.ndarray) -> List[Tuple[int, int]]:
+    """
+    점수 합이 최대인 1:1 할당 (헝가리안 알고리즘, 직사각 행렬 지원)
+
+    Returns:
+        (행, 열) 쌍 리스트 - 행/열 중 작은 쪽 개수만큼
+    """
+    if scores.size == 0:
+        return []
+    transposed = scores.shape[0] > scores.shape[1]
+    # 행 ≤ 열이 되도록 맞추고, 최대화를 최소 비용 문제로 변환
+    cost = -(scores.T if transposed else scores).astype(np.float64)
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=int)      # p[j]: 열 j에 할당된 행 (1-based, 0 = 없음)
+    way = np.zeros(m + 1, dtype=int)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            improve = free & (reduced < minv[1:])
+            minv[1:][improve] = reduced[improve]
+            way[1:][improve] = j0
+            candidates = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[1:][free] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    pairs = [(int(p[j]) - 1, j - 1) for j in range(1, m + 1) if p[j]]
+    return [(c, r) for r, c in pairs] if transposed else pairs
+
+
+def connected_components(scores: np.ndarray) -> List[Tuple[List[int], List[int]]]:
+    """0이 아닌 점수로 연결된 (행, 열) 묶음 - 할당 문제를 서로 독립인 작은 문제로 분할"""
+    n_rows, n_cols = scores.shape
+    parent = list(range(n_rows + n_cols))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for r, c in zip(*np.nonzero(scores)):
+        a, b = find(int(r)), find(n_rows + int(c))
+        if a != b:
+            parent[a] = b
+
+    groups: Dict[int, Tuple[List[int], List[int]]] = {}
+    for r in range(n_rows):
+        groups.setdefault(find(r), ([], []))[0].append(r)
+    for c in range(n_cols):
+        groups.setdefault(find(n_rows + c), ([], []))[1].append(c)
+    return [(rows, cols) for rows, cols in groups.values() if rows and cols]
+
+
+def match_products(current: Sequence[Dict[str, Any]], previous: Sequence[Dict[str, Any]],
+                   threshold: float = PRODUCT_MATCH_THRESHOLD) -> Dict[int, Match]:
+    """
+    오늘 제품과 이전 제품을 1:1 매칭
+
+    Args:
+        current: 오늘 제품 리스트 ('brand', 'productName')
+        previous: 이전 스냅샷 제품 리스트
+        threshold: 매칭으로 인정할 최소 유사도 (0~1)
+
+    Returns:
+        {current 인덱스: (previous 인덱스, 유사도)} - 매칭되지 않은 제품은 포함하지 않음
+    """
+    matches: Dict[int, Match] = {}
+    current_tokens = [product_tokens(item.get('productName', '')) for item in current]
+    previous_tokens = [product_tokens(item.get('productName', '')) for item in previous]
+
+    # 1차: 같은 제품 ID(productId) 또는 정규화된 브랜드 + 제품명이 정확히 같은 쌍은 바로 매칭
+    id_index: Dict[str, int] = {}
+    exact_index: Dict[Tuple[str, str], int] = {}
+    for j, item in enumerate(previous):
+        if item.get('productId'):
+            id_index.setdefault(item['productId'], j)
+        exact_index.setdefault((normalize_brand(item.get('brand', '')), ' '.join(previous_tokens[j])), j)
+    used_previous: Set[int] = set()
+    for i, item in enumerate(current):
+        j = id_index.get(item.get('productId'))
+        if j is None and current_tokens[i]:
+            j = exact_index.get((normalize_brand(item.get('brand', '')), ' '.join(current_tokens[i])))
+        if j is not None and j not in used_previous:
+            matches[i] = (j, 1.0)
+            used_previous.add(j)
+
+    # 2차: 브랜드 블록 안에서 (브랜드, 토큰) 역색인으로 후보 생성
+    inverted: Dict[Tuple[str, str], Set[int]] = defaultdict(set)
+    for j, item in enumerate(previous):
+        if j in used_previous:
+            continue
+        brand = normalize_brand(item.get('brand', ''))
+        for token in previous_tokens[j]:
+            inverted[(brand, token)].add(j)
+
+    blocks: Dict[str, Tuple[List[int], Set[int]]] = {}
+    for i, item in enumerate(current):
+        if i in matches:
+            continue
+        brand = normalize_brand(item.get('brand', ''))
+        candidates: Set[int] = set()
+        for token in current_tokens[i]:
+            candidates |= inverted.get((brand, token), set())
+        if candidates:
+            rows, cols = blocks.setdefault(brand, ([], set()))
+            rows.append(i)
+            cols |= candidates
+
+    # 블록별 유사도 행렬 일괄 계산 → 임계값 적용 → 최적 1:1 할당
+    for rows, col_set in blocks.values():
+        cols = sorted(col_set)
+        scores = similarity_matrix([current_tokens[i] for i in rows], [previous_tokens[j] for j in cols])
+        scores[scores < threshold] = 0.0
+        if not scores.any():
+            continue
+        for comp_rows, comp_cols in connected_components(scores):
+            sub = scores[np.ix_(comp_rows, comp_cols)]
+            for r, c in optimal_assignment(sub):
+                if sub[r, c] >= threshold and sub[r, c] > 0:
+                    matches[rows[comp_rows[r]]] = (cols[comp_cols[c]], float(sub[r, c]))
+
+    return matches
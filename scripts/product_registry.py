@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+K-Rank Product Identity Registry
+제품마다 정규 지문(canonical fingerprint)에서 만든 고정 ID를 부여하고 디스크에 보관합니다.
+
+- 지문: 정규화된 브랜드 + 정규화된 제품명 (normalize_product_name 후 괄호/용량/프로모션 토큰 제거)
+- 별칭: 같은 제품의 다른 표기(번역된 영문명, 기존 캐시 키 등)를 같은 ID로 연결
+- 조회: 지문/별칭 → ID 해시 조회 (O(1))
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Any, Dict, Optional
+
+from product_matcher import normalize_brand, product_tokens
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+PRODUCT_REGISTRY_FILE = os.path.join(script_dir, 'product_registry.json')
+
+# 같은 제품의 기획/증정/용량 변형을 하나로 보기 위해 지문에서 제외하는 토큰
+PROMO_TOKENS = {'기획', '증정', '단독', '한정', '대용량', '리필', 'jumbo', 'limited', 'edition', 'refill'}
+
+
+def normalize_product_name(name: str) -> str:
+    """
+    제품명에서 불필요한 키워드 제거
+
+    Args:
+        name: 원본 제품명
+
+    Returns:
+        정규화된 제품명
+    """
+    # [기획], [단품], (증정) 등 제거
+    name = re.sub(r'\[.*?\]', '', name)
+    # 괄호 안 내용 제거 (일부만)
+    name = re.sub(r'\([^)]*기획[^)]*\)', '', name)
+    name = re.sub(r'\([^)]*증정[^)]*\)', '', name)
+    # +로 시작하는 부분 제거
+    name = re.sub(r'\+.*$', '', name)
+    # 여러 공백을 하나로
+    name = re.sub(r'\s+', ' ', name)
+
+    return name.strip()
+
+
+def canonical_fingerprint(brand: str, product_name: str) -> str:
+    """'브랜드|토큰 토큰 ...' 형태의 정규 지문 (제품명 앞의 브랜드 중복 표기도 제거)"""
+    brand_key = normalize_brand(brand)
+    tokens = [t for t in product_tokens(normalize_product_name(product_name or '')) if t not in PROMO_TOKENS]
+    # 'Anua Anua Heartleaf ...'처럼 제품명이 브랜드로 시작하면 브랜드 토큰 제거
+    brand_tokens = product_tokens(brand or '')
+    if brand_tokens and tokens[:len(brand_tokens)] == brand_tokens:
+        tokens = tokens[len(brand_tokens):]
+    return f"{brand_key}|{' '.join(tokens)}"
+
+
+def product_id_for(fingerprint: str) -> str:
+    """지문에서 만든 고정 ID (같은 지문이면 어느 실행/머신에서도 같은 ID)"""
+    return 'p_' + hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()[:12]
+
+
+class ProductRegistry:
+    """
+    지문/별칭 → 제품 ID 레지스트리
+
+    Args:
+        cache_file: 레지스트리 JSON 경로
+            {'products': {id: {'brand', 'name', 'fingerprint', 'createdAt'}}, 'aliases': {fingerprint: id}}
+    """
+
+    def __init__(self, cache_file: str = PRODUCT_REGISTRY_FILE):
+        self.cache_file = cache_file
+        self.products: Dict[str, Dict[str, Any]] = {}
+        self.aliases: Dict[str, str] = {}
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.products = data.get('products', {})
+                self.aliases = data.get('aliases', {})
+                return
+            except Exception as e:
+                print(f"⚠️ 제품 레지스트리 로드 오류: {e}")
+        self.products, self.aliases = {}, {}
+
+    def save(self):
+        if not self._dirty:
+            return
+        try:
+            tmp_file = f"{self.cache_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'products': self.products, 'aliases': self.aliases}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.cache_file)
+            self._dirty = False
+        except Exception as e:
+            print(f"⚠️ 제품 레지스트리 저장 오류: {e}")
+
+    def lookup(self, brand: str, product_name: str) -> Optional[str]:
+        """등록된 제품 ID 조회 (없으면 None)"""
+        return self.aliases.get(canonical_fingerprint(brand, product_name))
+
+    def resolve(self, brand: str, product_name: str) -> str:
+        """제품 ID 조회, 처음 보는 제품이면 지문으로 ID를 만들어 등록"""
+        fingerprint = canonical_fingerprint(brand, product_name)
+        product_id = self.aliases.get(fingerprint)
+        if product_id is None:
+            product_id = product_id_for(fingerprint)
+            self.products.setdefault(product_id, {
+                'brand': brand, 'name': product_name, 'fingerprint': fingerprint, 'createdAt': time.time()
+            })
+            self.aliases[fingerprint] = product_id
+            self._dirty = True
+        return product_id
+
+    def add_alias(self, product_id: str, brand: str, product_name: str, replace: bool = False) -> bool:
+        """
+        다른 표기(예: 번역된 영문명)를 기존 ID에 연결
+
+        Args:
+            replace: True면 이미 다른 ID에 연결된 표기도 이 ID로 옮김 (수동 별칭 표 등), False면 기존 연결 유지
+        """
+        fingerprint = canonical_fingerprint(brand, product_name)
+        if fingerprint in self.aliases and (not replace or self.aliases[fingerprint] == product_id):
+            return self.aliases[fingerprint] == product_id
+        self.aliases[fingerprint] = product_id
+        self._dirty = True
+        return True
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+
+_registry: Optional[ProductRegistry] = None
+
+
+def get_product_registry() -> ProductRegistry:
+    """프로세스 전역 제품 레지스트리"""
+    global _registry
+    if _registry is None:
+        _registry = ProductRegistry()
+    return _registry
+
+
+def save_product_registry():
+    """전역 제품 레지스트리 저장 - 각 스크립트의 main() 마지막에 호출"""
+    if _registry is not None:
+        _registry.save()
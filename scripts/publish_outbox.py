@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+K-Rank Publish Outbox
+완성된 Firestore 문서를 먼저 로컬 SQLite 아웃박스에 기록(write-ahead)한 뒤 백그라운드에서 발행합니다.
+
+- 기록: 문서가 완성되는 즉시 아웃박스에 저장 (WAL + synchronous=FULL로 커밋 시 디스크에 반영)
+- 발행: 백그라운드 작업이 아웃박스를 순서대로 비우며 Firestore에 쓰기 (지수 백오프 재시도)
+- 재개: 발행에 실패한 문서는 pending으로 남고, 다음 실행 시작 시 또는 `scraper.py --publish-only`로
+  스크래핑/Gemini 작업 없이 다시 발행
+- 같은 문서 경로의 이전 pending 항목은 새 항목이 기록되면 superseded로 표시 (오래된 내용 덮어쓰기 방지)
+- firestore.SERVER_TIMESTAMP 값은 JSON으로 저장할 수 없으므로 필드명만 기록하고 발행 시 복원
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+from firebase_admin import firestore
+
+from write_manifest import describe_write, write_document
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+PUBLISH_OUTBOX_DB = os.getenv('PUBLISH_OUTBOX_DB', os.path.join(script_dir, 'publish_outbox.sqlite3'))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', '5'))
+OUTBOX_BACKOFF_SECONDS = float(os.getenv('OUTBOX_BACKOFF_SECONDS', '1.0'))
+OUTBOX_RETENTION_SECONDS = 7 * 24 * 60 * 60  # 발행 완료 항목 보관 기간
+# 스크래핑은 끝났고 발행만 실패한 경우의 종료 코드 (EX_TEMPFAIL) - CI가 --publish-only 재시도 여부 판단에 사용
+EXIT_UNPUBLISHED = 75
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    doc_path TEXT NOT NULL,
+    data TEXT NOT NULL,
+    server_timestamps TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    published_at REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_status ON outbox (status, id);
+"""
+
+
+class PublishOutbox:
+    """
+    SQLite 기반 발행 아웃박스
+
+    Args:
+        db_path: SQLite 파일 경로
+    """
+
+    def __init__(self, db_path: str = PUBLISH_OUTBOX_DB):
+        self.db_path = db_path
+        # isolation_level=None: 트랜잭션을 직접 BEGIN/COMMIT으로 관리
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        # 기록이 끝나면 프로세스가 죽어도 남아 있어야 하므로 FULL
+        self.conn.execute('PRAGMA synchronous=FULL')
+        self.conn.execute('PRAGMA busy_timeout=30000')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def enqueue(self, doc_path: str, data: Dict[str, Any]) -> int:
+        """문서를 pending으로 기록하고 같은 경로의 이전 pending 항목은 superseded 처리"""
+        server_timestamps = [key for key, value in data.items() if value is firestore.SERVER_TIMESTAMP]
+        payload = {key: value for key, value in data.items() if key not in server_timestamps}
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            self.conn.execute(
+                "UPDATE outbox SET status = 'superseded' WHERE doc_path = ? AND status = 'pending'", (doc_path,)
+            )
+            cursor = self.conn.execute(
+                "INSERT INTO outbox (doc_path, data, server_timestamps, created_at) VALUES (?, ?, ?, ?)",
+                (doc_path, json.dumps(payload, ensure_ascii=False, default=str), json.dumps(server_timestamps), time.time())
+            )
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+        return cursor.lastrowid
+
+    def pending(self) -> List[int]:
+        return [row['id'] for row in self.conn.execute("SELECT id FROM outbox WHERE status = 'pending' ORDER BY id")]
+
+    def load(self, entry_id: int) -> Optional[Dict[str, Any]]:
+        """발행할 항목 (doc_path, data) - pending이 아니면 None"""
+        row = self.conn.execute("SELECT * FROM outbox WHERE id = ? AND status = 'pending'", (entry_id,)).fetchone()
+        if row is None:
+            return None
+        data = json.loads(row['data'])
+        for key in json.loads(row['server_timestamps'] or '[]'):
+            data[key] = firestore.SERVER_TIMESTAMP
+        return {'id': row['id'], 'doc_path': row['doc_path'], 'data': data, 'attempts': row['attempts']}
+
+    def mark_published(self, entry_id: int):
+        self.conn.execute(
+            "UPDATE outbox SET status = 'published', published_at = ?, last_error = NULL WHERE id = ?",
+            (time.time(), entry_id)
+        )
+
+    def mark_failed(self, entry_id: int, error: str):
+        self.conn.execute(
+            "UPDATE outbox SET attempts = attempts + 1, last_error = ? WHERE id = ?", (error[:500], entry_id)
+        )
+
+    def prune(self):
+        """보관 기간이 지난 발행 완료/대체 항목 삭제"""
+        self.conn.execute(
+            "DELETE FROM outbox WHERE status != 'pending' AND created_at < ?",
+            (time.time() - OUTBOX_RETENTION_SECONDS,)
+        )
+
+
+class OutboxPublisher:
+    """
+    아웃박스를 비우는 백그라운드 발행기
+
+    submit()은 문서를 아웃박스에 기록한 뒤 바로 반환하고, 실제 Firestore 쓰기는 백그라운드 작업이
+    재시도/백오프와 함께 처리합니다. 시작 시 이전 실행에서 남은 pending 항목도 먼저 발행합니다.
+
+    Args:
+        db: Firestore 클라이언트
+        outbox: 발행 아웃박스
+        max_attempts: 항목당 최대 시도 횟수 (이번 실행 기준)
+        backoff: 첫 재시도 대기 시간 (초, 이후 2배씩 증가)
+    """
+
+    def __init__(self, db, outbox: PublishOutbox, max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+                 backoff: float = OUTBOX_BACKOFF_SECONDS):
+        self.db = db
+        self.outbox = outbox
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.stats = {'published': 0, 'failed': 0}
+        self._worker: Optional[asyncio.Task] = None
+
+    def start(self, resume: bool = True) -> 'OutboxPublisher':
+        if resume:
+            leftovers = self.outbox.pending()
+            if leftovers:
+                print(f"📮 이전 실행의 미발행 문서 {len(leftovers)}개 재발행 예약")
+            for entry_id in leftovers:
+                self.queue.put_nowait(entry_id)
+        self._worker = asyncio.create_task(self._run())
+        return self
+
+    def submit(self, doc_path: str, data: Dict[str, Any]) -> int:
+        """문서를 아웃박스에 기록하고 발행 대기열에 추가"""
+        entry_id = self.outbox.enqueue(doc_path, data)
+        self.queue.put_nowait(entry_id)
+        return entry_id
+
+    async def _publish(self, entry: Dict[str, Any]) -> str:
+        doc_ref = self.db.document(entry['doc_path'])
+        return await asyncio.to_thread(write_document, doc_ref, entry['data'])
+
+    async def _run(self):
+        while True:
+            entry_id = await self.queue.get()
+            try:
+                entry = self.outbox.load(entry_id)
+                if entry is not None:
+                    await self._publish_with_retry(entry)
+            except Exception as e:
+                # 아웃박스 I/O 오류(SQLite busy 등)로 작업이 죽지 않도록 항목 단위로 처리 - 항목은 pending으로 남음
+                self.stats['failed'] += 1
+                print(f"❌ 아웃박스 항목 {entry_id} 처리 오류, pending으로 보관: {e}")
+            finally:
+                self.queue.task_done()
+
+    async def _publish_with_retry(self, entry: Dict[str, Any]):
+        for attempt in range(self.max_attempts):
+            try:
+                action = await self._publish(entry)
+                self.outbox.mark_published(entry['id'])
+                self.stats['published'] += 1
+                print(describe_write(action, entry['doc_path']))
+                return
+            except Exception as e:
+                try:
+                    self.outbox.mark_failed(entry['id'], str(e))
+                except Exception as record_error:
+                    print(f"⚠️ 아웃박스 실패 기록 오류 ({entry['doc_path']}): {record_error}")
+                if attempt + 1 < self.max_attempts:
+                    delay = self.backoff * (2 ** attempt)
+                    print(f"⚠️ 발행 실패 ({entry['doc_path']}), {delay:.1f}초 후 재시도: {e}")
+                    await asyncio.sleep(delay)
+                else:
+                    print(f"❌ 발행 실패 ({entry['doc_path']}), 아웃박스에 보관: {e}")
+        self.stats['failed'] += 1
+
+    async def close(self) -> int:
+        """대기열이 빌 때까지 발행 후 종료 - 남은 pending 문서 수 반환"""
+        if self._worker is not None:
+            # 작업이 예기치 않게 종료되었으면 join()이 끝나지 않으므로 작업 종료도 함께 감시
+            joined = asyncio.ensure_future(self.queue.join())
+            await asyncio.wait({joined, self._worker}, return_when=asyncio.FIRST_COMPLETED)
+            joined.cancel()
+            if self._worker.done() and not self._worker.cancelled() and self._worker.exception():
+                print(f"❌ 아웃박스 발행 작업 중단: {self._worker.exception()}")
+            self._worker.cancel()
+            try:
+                await self._worker
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._worker = None
+        try:
+            self.outbox.prune()
+            remaining = len(self.outbox.pending())
+        except Exception as e:
+            # 남은 문서 수를 확인할 수 없으면 실패로 간주 (호출자가 exit 1)
+            print(f"❌ 아웃박스 상태 확인 오류: {e}")
+            return 1
+        if self.stats['published'] or self.stats['failed'] or remaining:
+            print(f"📮 아웃박스 발행: 성공 {self.stats['published']}개, 실패 {self.stats['failed']}개, 남은 문서 {remaining}개")
+        if remaining:
+            print("💡 `python scripts/scraper.py --publish-only`로 다시 스크래핑하지 않고 재발행할 수 있습니다.")
+        return remaining
+
+
+async def publish_only(db, outbox: Optional[PublishOutbox] = None) -> int:
+    """이전 실행의 아웃박스만 발행 (스크래핑 없음) - 남은 pending 문서 수 반환"""
+    owned = outbox is None
+    outbox = outbox or PublishOutbox()
+    try:
+        publisher = OutboxPublisher(db, outbox).start(resume=True)
+        return await publisher.close()
+    finally:
+        if owned:
+            outbox.close()
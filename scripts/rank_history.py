@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+K-Rank Rank History Store
+카테고리별 순위 이력을 (아이템 ID × 날짜) NumPy 행렬로 저장하고(메모리 맵 .npy), 모멘텀 지표를 일괄 계산합니다.
+
+- 저장: scripts/rank_history/{category}.npy (순위, 미등장은 NaN) + {category}.json (행 ID / 열 날짜 인덱스)
+- 매 실행마다 오늘 스냅샷을 열로 추가 (같은 날짜는 덮어씀), RANK_HISTORY_DAYS 이전 열은 제거
+- 지표 (행렬 연산 한 번으로 전체 아이템 계산):
+  momentum7d / momentum30d  : 최근 7/30일 평균 순위 - 오늘 순위 (양수면 상승세)
+  volatility30d             : 최근 30일 순위 표준편차
+  weeksOnChart              : 차트에 등장한 서로 다른 주(週) 수
+  bestRank                  : 기록된 최고 순위
+"""
+
+import json
+import os
+import re
+import warnings
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+RANK_HISTORY_DIR = os.path.join(script_dir, 'rank_history')
+RANK_HISTORY_DAYS = int(os.getenv('RANK_HISTORY_DAYS', '120'))
+
+
+def history_item_id(item: Dict[str, Any]) -> str:
+    """이력 행 ID - 제품은 productId, 미디어는 type + 정규화된 영어 제목"""
+    if item.get('productId'):
+        return item['productId']
+    title = re.sub(r'\s+', ' ', item.get('titleEn') or item.get('productName') or '').strip().casefold()
+    return f"{item.get('type', '')}|{title}"
+
+
+def _day(value: str) -> int:
+    return date.fromisoformat(value).toordinal()
+
+
+class RankHistory:
+    """
+    한 카테고리의 순위 이력 행렬
+
+    Args:
+        category: daily_rankings 카테고리 (예: 'beauty', 'media', 'media-japan')
+        directory: 저장 디렉터리
+        max_days: 보관 기간 (일)
+    """
+
+    def __init__(self, category: str, directory: str = RANK_HISTORY_DIR, max_days: int = RANK_HISTORY_DAYS):
+        safe_name = re.sub(r'[^\w\-]+', '_', category)
+        self.category = category
+        self.path = os.path.join(directory, f"{safe_name}.npy")
+        self.index_path = os.path.join(directory, f"{safe_name}.json")
+        self.max_days = max_days
+        self.ids: List[str] = []
+        self.dates: List[str] = []
+        self.ranks = np.empty((0, 0), dtype=np.float32)
+        self.load()
+
+    @property
+    def row_of(self) -> Dict[str, int]:
+        return {item_id: row for row, item_id in enumerate(self.ids)}
+
+    def load(self):
+        if not (os.path.exists(self.path) and os.path.exists(self.index_path)):
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            ranks = np.load(self.path, mmap_mode='r')
+            if ranks.shape != (len(index['ids']), len(index['dates'])):
+                raise ValueError(f"인덱스와 행렬 크기 불일치 {ranks.shape}")
+            self.ids, self.dates, self.ranks = index['ids'], index['dates'], ranks
+        except Exception as e:
+            print(f"⚠️ 순위 이력 로드 오류 ({self.category}): {e}")
+
+    def save(self):
+        """행렬은 메모리 맵 .npy로, 인덱스는 JSON으로 원자적 저장"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp.npy"
+        out = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=self.ranks.shape)
+        out[...] = self.ranks
+        out.flush()
+        del out
+        tmp_index = f"{self.index_path}.tmp"
+        with open(tmp_index, 'w', encoding='utf-8') as f:
+            json.dump({'ids': self.ids, 'dates': self.dates}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        os.replace(tmp_index, self.index_path)
+        self.ranks = np.load(self.path, mmap_mode='r')
+
+    def append_snapshot(self, snapshot_date: str, ranks: Dict[str, float]):
+        """날짜 열 추가(또는 덮어쓰기) 후 보관 기간을 넘긴 열 제거"""
+        row_of = self.row_of
+        new_ids = [item_id for item_id in ranks if item_id not in row_of]
+        ids = self.ids + new_ids
+        dates = sorted(set(self.dates) | {snapshot_date})
+        cutoff = _day(dates[-1]) - self.max_days
+        dates = [d for d in dates if _day(d) > cutoff]
+
+        matrix = np.full((len(ids), len(dates)), np.nan, dtype=np.float32)
+        col_of = {d: col for col, d in enumerate(dates)}
+        kept = [(col_of[d], old_col) for old_col, d in enumerate(self.dates) if d in col_of]
+        if kept and self.ids:
+            new_cols, old_cols = zip(*kept)
+            matrix[:len(self.ids), list(new_cols)] = self.ranks[:, list(old_cols)]
+
+        # 보관 기간 안에 한 번도 등장하지 않았고 오늘도 없는 행 제거
+        keep = ~np.isnan(matrix).all(axis=1) | np.fromiter((item_id in ranks for item_id in ids), dtype=bool, count=len(ids))
+        if not keep.all():
+            matrix = matrix[keep]
+            ids = [item_id for item_id, k in zip(ids, keep) if k]
+
+        col = col_of[snapshot_date]
+        matrix[:, col] = np.nan
+        row_of = {item_id: row for row, item_id in enumerate(ids)}
+        rows = np.fromiter((row_of[item_id] for item_id in ranks), dtype=np.int64, count=len(ranks))
+        matrix[rows, col] = np.fromiter(ranks.values(), dtype=np.float32, count=len(ranks))
+
+        self.ids, self.dates, self.ranks = ids, dates, matrix
+
+    def compute_metrics(self, as_of: str) -> Dict[str, np.ndarray]:
+        """모든 행의 지표를 한 번에 계산 (as_of 날짜 기준, 값이 없으면 NaN)"""
+        n_rows = len(self.ids)
+        if n_rows == 0 or not self.dates:
+            return {}
+        ranks = np.asarray(self.ranks, dtype=np.float32)
+        days = np.array([_day(d) for d in self.dates])
+        today = _day(as_of)
+        present = ~np.isnan(ranks)
+
+        current = ranks[:, days == today]
+        current = current[:, 0] if current.shape[1] else np.full(n_rows, np.nan, dtype=np.float32)
+
+        def window(start: int, end: int) -> np.ndarray:
+            return ranks[:, (days >= start) & (days <= end)]
+
+        with warnings.catch_warnings():
+            # 창 안에 기록이 없는 아이템은 NaN (All-NaN 경고 무시)
+            warnings.simplefilter('ignore', RuntimeWarning)
+            momentum7 = np.nanmean(window(today - 7, today - 1), axis=1) - current
+            momentum30 = np.nanmean(window(today - 30, today - 1), axis=1) - current
+            volatility30 = np.nanstd(window(today - 29, today), axis=1)
+            best = np.nanmin(window(days.min(), today), axis=1)
+
+        # 날짜 열은 정렬되어 있으므로 주 번호가 바뀌는 열에서 구간을 나누어 주별 등장 여부 집계
+        weeks = days // 7
+        past = days <= today
+        if past.any():
+            week_starts = np.flatnonzero(np.r_[True, np.diff(weeks[past]) != 0])
+            weeks_on_chart = np.logical_or.reduceat(present[:, past], week_starts, axis=1).sum(axis=1)
+        else:
+            weeks_on_chart = np.zeros(n_rows, dtype=np.int64)
+
+        return {
+            'momentum7d': momentum7,
+            'momentum30d': momentum30,
+            'volatility30d': volatility30,
+            'weeksOnChart': weeks_on_chart,
+            'bestRank': best,
+        }
+
+    def apply(self, items: List[Dict[str, Any]], snapshot_date: Optional[str] = None) -> List[Dict[str, Any]]:
+        """오늘 스냅샷을 추가하고 지표를 아이템에 기록 (trend 옆 필드), 이후 저장"""
+        snapshot_date = snapshot_date or datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        ranks = {}
+        for item in items:
+            if item.get('rank') is not None:
+                ranks.setdefault(history_item_id(item), float(item['rank']))
+        self.append_snapshot(snapshot_date, ranks)
+        metrics = self.compute_metrics(snapshot_date)
+        row_of = self.row_of
+
+        for item in items:
+            row = row_of.get(history_item_id(item))
+            for name, values in metrics.items():
+                value = values[row] if row is not None else np.nan
+                if name == 'weeksOnChart':
+                    item[name] = int(value) if row is not None else 0
+                else:
+                    item[name] = None if np.isnan(value) else round(float(value), 2)
+
+        self.save()
+        return items
+
+
+def apply_rank_history(category: str, items: List[Dict[str, Any]], snapshot_date: Optional[str] = None) -> List[Dict[str, Any]]:
+    """카테고리 이력에 스냅샷을 추가하고 모멘텀 지표 기록 (실패해도 아이템은 그대로 반환)"""
+    try:
+        history = RankHistory(category)
+        history.apply(items, snapshot_date)
+        print(f"📚 순위 이력 갱신 ({category}): 아이템 {len(history.ids)}개 × {len(history.dates)}일")
+    except Exception as e:
+        print(f"⚠️ 순위 이력 처리 오류 ({category}): {e}")
+    return items
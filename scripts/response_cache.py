@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+K-Rank Gemini Response Cache
+(모델명, 프롬프트, generation config)의 해시를 키로 Gemini 응답 텍스트를 디스크에 캐시합니다.
+동일한 재실행은 API 호출 없이 완료됩니다.
+
+- TTL: GEMINI_RESPONSE_CACHE_TTL_DAYS 이후 만료
+- 크기 제한: GEMINI_RESPONSE_CACHE_MAX 개를 넘으면 가장 오래 사용하지 않은 항목부터 제거 (LRU)
+- 검증: validate 콜백(예: JSON 파싱)을 통과한 응답만 저장 - 잘리거나 깨진 응답은 캐시하지 않고,
+  이전에 저장된 항목이 검증에 실패하면 버리고 다시 호출
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+RESPONSE_CACHE_FILE = os.path.join(script_dir, 'gemini_response_cache.json')
+RESPONSE_CACHE_TTL_DAYS = float(os.getenv('GEMINI_RESPONSE_CACHE_TTL_DAYS', '14'))
+RESPONSE_CACHE_MAX = int(os.getenv('GEMINI_RESPONSE_CACHE_MAX', '2000'))
+# 'false'로 설정하면 캐시를 건너뛰고 항상 API 호출
+RESPONSE_CACHE_ENABLED = os.getenv('GEMINI_RESPONSE_CACHE', 'true').lower() == 'true'
+
+# 응답 텍스트 검증 콜백 - 유효하지 않으면 예외 발생
+Validator = Callable[[str], Any]
+
+
+def model_identity(model) -> Dict[str, Any]:
+    """캐시 키에 포함할 모델 식별 정보 (모델명 + generation config)"""
+    return {
+        'model': getattr(model, 'model_name', type(model).__name__),
+        'generation_config': getattr(model, '_generation_config', None),
+    }
+
+
+def make_cache_key(model_name: str, prompt: str, generation_config: Any = None) -> str:
+    """(모델명, 프롬프트, generation config)의 SHA-256 해시"""
+    payload = json.dumps(
+        {'model': model_name, 'prompt': prompt, 'generation_config': generation_config},
+        sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _is_valid(text: str, validate: Validator) -> bool:
+    try:
+        validate(text)
+        return True
+    except Exception:
+        return False
+
+
+class ResponseCache:
+    """TTL + LRU 크기 제한을 가진 프롬프트 단위 응답 캐시"""
+
+    def __init__(self, cache_file: str = RESPONSE_CACHE_FILE,
+                 ttl_days: float = RESPONSE_CACHE_TTL_DAYS,
+                 max_entries: int = RESPONSE_CACHE_MAX):
+        self.cache_file = cache_file
+        self.ttl = ttl_days * 24 * 60 * 60
+        self.max_entries = max(1, max_entries)
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # 최근 사용 순으로 복원 (오래된 것이 앞)
+            for key, entry in sorted(data.items(), key=lambda kv: kv[1].get('lastUsed', 0)):
+                self.entries[key] = entry
+        except Exception as e:
+            print(f"⚠️ Gemini 응답 캐시 로드 오류: {e}")
+
+    def save(self):
+        if not self._dirty:
+            return
+        try:
+            tmp_file = f"{self.cache_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+            os.replace(tmp_file, self.cache_file)
+            self._dirty = False
+        except Exception as e:
+            print(f"⚠️ Gemini 응답 캐시 저장 오류: {e}")
+
+    def get(self, key: str, validate: Optional[Validator] = None) -> Optional[str]:
+        """캐시된 텍스트 (만료되었거나 validate를 통과하지 못한 항목은 제거 후 None)"""
+        entry = self.entries.get(key)
+        now = time.time()
+        if entry is not None and validate is not None and not _is_valid(entry['text'], validate):
+            # 검증 도입 전에 저장된 깨진 응답은 버리고 다시 호출
+            entry['createdAt'] = 0
+        if entry is None or now - entry.get('createdAt', 0) > self.ttl:
+            if entry is not None:
+                del self.entries[key]
+                self._dirty = True
+            self.misses += 1
+            return None
+        entry['lastUsed'] = now
+        self.entries.move_to_end(key)
+        self._dirty = True
+        self.hits += 1
+        return entry['text']
+
+    def put(self, key: str, text: str):
+        now = time.time()
+        self.entries[key] = {'text': text, 'createdAt': now, 'lastUsed': now}
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        self._dirty = True
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0.0
+        return f"적중 {self.hits}, 미스 {self.misses} (적중률 {rate:.0f}%, 저장 {len(self.entries)}개)"
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """프로세스 전역 응답 캐시"""
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache()
+    return _cache
+
+
+def save_response_cache():
+    """전역 응답 캐시 저장 - 각 스크립트의 main() 마지막에 호출"""
+    if _cache is not None:
+        _cache.save()
+
+
+def _key_for(model, prompt: str) -> str:
+    identity = model_identity(model)
+    return make_cache_key(identity['model'], prompt, identity['generation_config'])
+
+
+def lookup_cached(model, prompt: str, validate: Optional[Validator] = None) -> Optional[str]:
+    """캐시된 응답 텍스트 반환 (없거나 만료/비활성화, 또는 검증 실패 시 None)"""
+    if not RESPONSE_CACHE_ENABLED:
+        return None
+    return get_response_cache().get(_key_for(model, prompt), validate)
+
+
+def store_cached(model, prompt: str, text: str):
+    """검증을 통과한 응답만 저장할 것 - 호출자가 파싱/검증 후 호출"""
+    if RESPONSE_CACHE_ENABLED:
+        get_response_cache().put(_key_for(model, prompt), text)
+
+
+async def cached_generate(model, prompt: str, validate: Optional[Validator] = None) -> str:
+    """
+    응답 캐시를 거쳐 Gemini 호출 (generate_content_async) 후 응답 텍스트 반환
+
+    캐시 적중 시 API를 호출하지 않습니다. validate가 주어지면 통과한 응답만 캐시하고,
+    실패하면 예외를 그대로 전달합니다 (다음 실행에서 다시 호출).
+    """
+    text = lookup_cached(model, prompt, validate)
+    if text is not None:
+        return text
+
+    response = await model.generate_content_async(prompt)
+    text = response.text
+    if validate is not None:
+        validate(text)
+    store_cached(model, prompt, text)
+    return text
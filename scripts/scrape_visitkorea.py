@@ -1,243 +1,180 @@
 """
 대한민국 구석구석 사이트에서 인기순 여행지 리스트를 스크래핑하는 스크립트  
-Playwright를 사용하여 JavaScript 렌더링 완전 대기
+Playwright를 사용하여 cPage=1..N을 병렬로 로드하고, 목표 개수에 도달하면 조기 종료
 """
 import asyncio
-from playwright.async_api import async_playwright
 import json
-import re
+import os
+import sys
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from browser_pool import get_browser_pool, close_browser_pool
 
-async def scrape_popular_places(limit=30):
+
+BASE_URL = 'https://korean.visitkorea.or.kr'
+# 인기순(srchType=3) 여행지 목록
+LIST_URL = f"{BASE_URL}/list/travelinfo.do?service=ms&srchType=3"
+
+# 페이지네이션 설정
+MAX_PAGES = int(os.getenv('VISITKOREA_MAX_PAGES', '50'))
+PAGE_CONCURRENCY = int(os.getenv('VISITKOREA_PAGE_CONCURRENCY', '4'))
+LIST_WAIT_TIMEOUT_MS = 15000
+
+# 목록 페이지의 모든 항목 필드를 브라우저 안에서 한 번에 추출하는 스크립트
+# - 기본 셀렉터: ul.list_thumType li
+# - 대안: strong 태그가 있는 모든 li
+# 이름과 지역이 있는 항목만 반환하며, 결과는 하나의 JSON 배열로 직렬화됩니다.
+EXTRACT_PLACES_JS = """
+(baseUrl) => {
+    let items = Array.from(document.querySelectorAll('ul.list_thumType li'));
+    let usedFallback = false;
+    if (items.length === 0) {
+        items = Array.from(document.querySelectorAll('li')).filter(li => li.querySelector('strong'));
+        usedFallback = true;
+    }
+    const text = el => (el ? (el.innerText || '').trim() : '');
+    const places = [];
+    for (const item of items) {
+        const name = text(item.querySelector('strong.tit, strong'));
+        if (!name) continue;
+        const pElems = item.querySelectorAll('p');
+        const location = pElems.length > 0 ? text(pElems[0]) : '';
+        const descElem = item.querySelector('p.phrase');
+        const description = descElem ? text(descElem) : (pElems.length > 1 ? text(pElems[1]) : '');
+        const tagContainer = item.querySelector('p.tag');
+        const tags = tagContainer
+            ? Array.from(tagContainer.querySelectorAll('span')).map(text).filter(Boolean)
+            : [];
+        const img = item.querySelector('img');
+        let imageUrl = img ? (img.getAttribute('src') || '') : '';
+        if (imageUrl && !imageUrl.startsWith('http')) imageUrl = baseUrl + imageUrl;
+        const link = item.querySelector('a[onclick]');
+        const onclick = link ? (link.getAttribute('onclick') || '') : '';
+        const match = onclick.match(/goDetail\\('([^']+)'/);
+        if (name && location) {
+            places.push({
+                name: name,
+                location: location,
+                description: description,
+                tags: tags,
+                image_url: imageUrl,
+                content_id: match ? match[1] : ''
+            });
+        }
+    }
+    return {places: places, usedFallback: usedFallback, scanned: items.length};
+}
+"""
+
+
+async def extract_places(page) -> list:
+    """
+    현재 페이지의 여행지 항목을 단일 page.evaluate 호출(CDP 왕복 1회)로 추출
+    
+    Returns:
+        list: {'name', 'location', 'description', 'tags', 'image_url', 'content_id'} 딕셔너리 리스트
+    """
+    result = await page.evaluate(EXTRACT_PLACES_JS, BASE_URL)
+    if result.get('usedFallback'):
+        print(f"  ⚠️  'ul.list_thumType li' 셀렉터로 항목을 찾지 못해 strong 태그가 있는 li {result.get('scanned', 0)}개를 사용합니다.")
+    return result.get('places', [])
+
+
+async def fetch_place_page(cpage: int) -> list:
+    """
+    인기순 목록의 cPage 한 페이지를 공유 브라우저에서 로드하여 항목을 추출
+    
+    networkidle + 고정 대기 대신 목록 셀렉터가 나타날 때까지만 기다립니다.
+    """
+    url = f"{LIST_URL}&cPage={cpage}"
+    async with get_browser_pool().page() as page:
+        await page.goto(url, wait_until='domcontentloaded', timeout=60000)
+        try:
+            await page.wait_for_selector('ul.list_thumType li', timeout=LIST_WAIT_TIMEOUT_MS)
+        except Exception:
+            # 셀렉터가 바뀌었을 수 있으므로 extract_places의 대안 셀렉터로 계속 진행
+            print(f"  ⚠️  페이지 {cpage}: 목록 셀렉터 대기 타임아웃")
+        items = await extract_places(page)
+    print(f"  📄 페이지 {cpage}: {len(items)}개 항목")
+    return items
+
+
+async def iter_popular_places(max_pages: int = MAX_PAGES, concurrency: int = PAGE_CONCURRENCY):
+    """
+    인기순 목록 cPage=1..max_pages를 제한된 동시성으로 가져와 항목을 순서대로 스트리밍하는 async generator
+    
+    최대 concurrency개 페이지를 미리 가져오되(prefetch), 항목은 페이지 순서대로 yield 합니다.
+    소비자가 중단하면(aclose/break) 아직 진행 중인 페이지 요청은 취소됩니다.
+    빈 페이지를 만나면 마지막 페이지로 간주하고 종료합니다.
+    """
+    concurrency = max(1, concurrency)
+    tasks = {}
+    next_page = 1
+    
+    def schedule_ahead(current: int):
+        nonlocal next_page
+        while next_page <= max_pages and next_page < current + concurrency:
+            tasks[next_page] = asyncio.create_task(fetch_place_page(next_page))
+            next_page += 1
+    
+    try:
+        for cpage in range(1, max_pages + 1):
+            schedule_ahead(cpage)
+            try:
+                items = await tasks.pop(cpage)
+            except Exception as e:
+                print(f"⚠️  페이지 {cpage} 로드 실패: {e}")
+                continue
+            if not items:
+                break
+            for item in items:
+                yield item
+    finally:
+        for task in tasks.values():
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+
+async def scrape_popular_places(limit=30, concurrency=PAGE_CONCURRENCY):
     """
     대한민국 구석구석 사이트에서 인기순 여행지 리스트 스크래핑
     
     Args:
-        limit (int): 수집할 장소 개수
+        limit (int): 수집할 장소 개수 (content_id 기준 고유 개수)
+        concurrency (int): 동시에 로드할 최대 페이지 수
     
     Returns:
         list: 인기 여행지 정보 리스트
     """
     print(f"🌐 대한민국 구석구석 사이트에서 상위 {limit}개 인기 여행지를 스크래핑합니다...")
     
-    async with async_playwright() as p:
-        # Chromium 브라우저 실행
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        
-        places = []
-        
-        try:
-            # 페이지 접속 - networkidle 대기
-            print("📍 페이지 로딩 중...")
-            await page.goto('https://korean.visitkorea.or.kr/list/travelinfo.do?service=ms', 
-                          wait_until='networkidle',
-                          timeout=60000)
-            
-            # 추가 대기
-            await asyncio.sleep(3)
-            
-            # 인기순 정렬 설정 - URL에 srchType=3 파라미터 추가하여 재로드
-            print("🔥 인기순으로 페이지 재로드...")
-            await page.goto('https://korean.visitkorea.or.kr/list/travelinfo.do?service=ms&srchType=3',
-                          wait_until='networkidle',
-                          timeout=60000)
+    places = []
+    seen_ids = set()
+    # 중복 제거 후 개수가 모자랄 수 있으므로 페이지 수를 미리 정하지 않고
+    # limit개를 모으거나 빈 페이지가 나올 때까지 (최대 MAX_PAGES) 계속 가져옴
+    stream = iter_popular_places(max_pages=MAX_PAGES, concurrency=concurrency)
+    try:
+        async for place_data in stream:
+            # content_id가 없으면 이름으로 중복 판단
+            key = place_data.get('content_id') or place_data['name']
+            if key in seen_ids:
+                continue
+            seen_ids.add(key)
+            places.append(place_data)
+            print(f"  ✅ {len(places)}. {place_data['name']} ({place_data['location']})")
             
-            await asyncio.sleep(3)
-            
-            # 페이지 HTML 저장 for debugging
-            html_content = await page.content()
-            print(f"  ℹ️  페이지 HTML 길이: {len(html_content)} 문자")
-            
-            # 리스트 항목 찾기 시도
-            items = await page.locator('ul.list_thumType li').all()
-            
-            if not items:
-                print("  ⚠️  'ul.list_thumType li' 셀렉터로 항목을 찾지 못했습니다.")
-                # 대안 셀렉터 시도
-                items = await page.locator('li').all()
-                print(f"  ℹ️  전체 li 태그: {len(items)}개")
-                # strong 태그가 있는 li만 필터링
-                filtered_items = []
-                for item in items:
-                    strong = await item.query_selector('strong')
-                    if strong:
-                        filtered_items.append(item)
-                items = filtered_items
-                print(f"  ℹ️  strong 태그가 있는 li: {len(items)}개")
-            
-            print(f"📄 총 {len(items)}개 항목 발견")
-            
-            for item in items:
-                if len(places) >= limit:
-                    break
-                
-                try:
-                    # 제목
-                    title_elem = await item.query_selector('strong.tit, strong')
-                    name = await title_elem.inner_text() if title_elem else ""
-                    name = name.strip()
-                    
-                    if not name:
-                        continue
-                    
-                    # 지역
-                    p_elems = await item.query_selector_all('p')
-                    location = ""
-                    if len(p_elems) > 0:
-                        location_text = await p_elems[0].inner_text()
-                        location = location_text.strip()
-                    
-                    # 설명
-                    desc_elem = await item.query_selector('p.phrase')
-                    description = ""
-                    if desc_elem:
-                        desc_text = await desc_elem.inner_text()
-                        description = desc_text.strip()
-                    elif len(p_elems) > 1:
-                        desc_text = await p_elems[1].inner_text()
-                        description = desc_text.strip()
-                    
-                    # 태그
-                    tags = []
-                    tag_container = await item.query_selector('p.tag')
-                    if tag_container:
-                        tag_elems = await tag_container.query_selector_all('span')
-                        for tag_elem in tag_elems:
-                            tag_text = await tag_elem.inner_text()
-                            if tag_text:
-                                tags.append(tag_text.strip())
-                    
-                    # 이미지
-                    img_elem = await item.query_selector('img')
-                    image_url = ""
-                    if img_elem:
-                        image_url = await img_elem.get_attribute('src')
-                        if image_url and not image_url.startswith('http'):
-                            image_url = f"https://korean.visitkorea.or.kr{image_url}"
-                    
-                    # Content ID
-                    content_id = ""
-                    link_elem = await item.query_selector('a[onclick]')
-                    if link_elem:
-                        onclick = await link_elem.get_attribute('onclick')
-                        match = re.search(r"goDetail\('([^']+)'", onclick)
-                        if match:
-                            content_id = match.group(1)
-                    
-                    # 유효한 데이터만 추가
-                    if name and location:
-                        place_data = {
-                            'name': name,
-                            'location': location,
-                            'description': description,
-                            'tags': tags,
-                            'image_url': image_url,
-                            'content_id': content_id
-                        }
-                        places.append(place_data)
-                        print(f"  ✅ {len(places)}. {name} ({location})")
-                
-                except Exception as e:
-                    print(f"  ⚠️  항목 파싱 오류: {e}")
-                    continue
-            
-            # 더 많은 항목이 필요하면 페이지 2로 이동
-            if len(places) < limit:
-                print(f"\n📄 추가 데이터 필요 - 페이지 2로 이동...")
-                try:
-                    # 페이지 2 URL로 직접 이동
-                    await page.goto('https://korean.visitkorea.or.kr/list/travelinfo.do?service=ms&srchType=3&cPage=2',
-                                  wait_until='networkidle',
-                                  timeout=60000)
-                    await asyncio.sleep(3)
-                    
-                    second_page_items = await page.locator('ul.list_thumType li').all()
-                    if not second_page_items:
-                        # 대안 셀렉터
-                        all_lis = await page.locator('li').all()
-                        second_page_items = []
-                        for item in all_lis:
-                            strong = await item.query_selector('strong')
-                            if strong:
-                                second_page_items.append(item)
-                    
-                    print(f"  ℹ️  페이지 2에서 {len(second_page_items)}개 항목 발견")
-                    
-                    for item in second_page_items:
-                        if len(places) >= limit:
-                            break
-                        
-                        try:
-                            title_elem = await item.query_selector('strong.tit, strong')
-                            name = await title_elem.inner_text() if title_elem else ""
-                            name = name.strip()
-                            
-                            if not name:
-                                continue
-                            
-                            p_elems = await item.query_selector_all('p')
-                            location = ""
-                            if len(p_elems) > 0:
-                                location = (await p_elems[0].inner_text()).strip()
-                            
-                            desc_elem = await item.query_selector('p.phrase')
-                            description = ""
-                            if desc_elem:
-                                description = (await desc_elem.inner_text()).strip()
-                            elif len(p_elems) > 1:
-                                description = (await p_elems[1].inner_text()).strip()
-                            
-                            tags = []
-                            tag_container = await item.query_selector('p.tag')
-                            if tag_container:
-                                tag_elems = await tag_container.query_selector_all('span')
-                                for tag_elem in tag_elems:
-                                    tag_text = await tag_elem.inner_text()
-                                    if tag_text:
-                                        tags.append(tag_text.strip())
-                            
-                            img_elem = await item.query_selector('img')
-                            image_url = ""
-                            if img_elem:
-                                image_url = await img_elem.get_attribute('src')
-                                if image_url and not image_url.startswith('http'):
-                                    image_url = f"https://korean.visitkorea.or.kr{image_url}"
-                            
-                            content_id = ""
-                            link_elem = await item.query_selector('a[onclick]')
-                            if link_elem:
-                                onclick = await link_elem.get_attribute('onclick')
-                                match = re.search(r"goDetail\('([^']+)'", onclick)
-                                if match:
-                                    content_id = match.group(1)
-                            
-                            if name and location:
-                                place_data = {
-                                    'name': name,
-                                    'location': location,
-                                    'description': description,
-                                    'tags': tags,
-                                    'image_url': image_url,
-                                    'content_id': content_id
-                                }
-                                places.append(place_data)
-                                print(f"  ✅ {len(places)}. {name} ({location})")
-                        
-                        except Exception as e:
-                            print(f"  ⚠️  항목 파싱 오류: {e}")
-                            continue
-                
-                except Exception as e:
-                    print(f"⚠️  페이지 2 로드 실패: {e}")
-        
-        except Exception as e:
-            print(f"❌ 스크래핑 오류: {e}")
-            import traceback
-            traceback.print_exc()
-        
-        finally:
-            await browser.close()
+            # 목표 개수 도달 시 조기 종료 (남은 페이지 요청 취소)
+            if len(places) >= limit:
+                break
+    
+    except Exception as e:
+        print(f"❌ 스크래핑 오류: {e}")
+        import traceback
+        traceback.print_exc()
+    
+    finally:
+        await stream.aclose()
     
     print(f"\n✅ 총 {len(places)}개 장소 스크래핑 완료!")
     return places
@@ -245,7 +182,10 @@ async def scrape_popular_places(limit=30):
 
 async def main():
     """테스트 실행"""
-    places = await scrape_popular_places(limit=30)
+    try:
+        places = await scrape_popular_places(limit=30)
+    finally:
+        await close_browser_pool()
     
     # 결과 출력
     print("\n" + "="*80)
@@ -11,11 +11,10 @@ import random
 import time
 import re
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 import json
 import math
 
-from playwright.async_api import async_playwright
 from bs4 import BeautifulSoup
 import requests
 import firebase_admin
@@ -29,10 +28,50 @@ project_root = os.path.dirname(script_dir)
 env_path = os.path.join(project_root, '.env')
 load_dotenv(env_path)
 
+sys.path.append(script_dir)
+from browser_pool import get_browser_pool, close_browser_pool, DEFAULT_USER_AGENT
+from response_cache import cached_generate, get_response_cache, save_response_cache
+from llm_batch import parse_json_response
+from title_memory import get_title_memory, save_title_memory, normalize_title
+from rank_history import apply_rank_history
+from write_manifest import save_write_manifest
+from publish_outbox import OutboxPublisher, PublishOutbox, publish_only, EXIT_UNPUBLISHED
+
 # 개발 모드 및 제한 설정
 DEV_MODE = os.getenv('DEV_MODE', 'false').lower() == 'true'
 DEV_LIMIT = 5  # 개발 모드일 때 처리할 아이템 수
 WRITE_TO_FIRESTORE = os.getenv('WRITE_TO_FIRESTORE', 'true').lower() == 'true'
+
+# Netflix 페이지용 브라우저 컨텍스트 옵션
+NETFLIX_CONTEXT_OPTIONS = {
+    'user_agent': DEFAULT_USER_AGENT,
+    'viewport': {'width': 1920, 'height': 1080},
+    'locale': 'ko-KR',
+    'timezone_id': 'Asia/Seoul'
+}
+
+# Netflix 미디어 타입 (결과 병합 순서)
+NETFLIX_MEDIA_TYPES = ('tv', 'films')
+NETFLIX_MEDIA_LABELS = {'tv': 'TV Shows', 'films': 'Films'}
+
+# 멀티 국가 스윕 설정 (top10.netflix.com 국가 슬러그)
+DEFAULT_NETFLIX_COUNTRY = 'south-korea'
+NETFLIX_COUNTRIES = [
+    c.strip() for c in os.getenv(
+        'NETFLIX_COUNTRIES',
+        'south-korea,japan,united-states,taiwan,hong-kong,thailand,philippines,indonesia,'
+        'vietnam,malaysia,singapore,india,brazil,mexico,france,germany,united-kingdom,spain'
+    ).split(',') if c.strip()
+]
+NETFLIX_SWEEP_CONCURRENCY = int(os.getenv('NETFLIX_SWEEP_CONCURRENCY', '6'))
+
+# Netflix HTTP 빠른 경로 (브라우저 없이 서버 렌더링 HTML 파싱, 실패 시 Playwright 폴백)
+NETFLIX_HTTP_FAST_PATH = os.getenv('NETFLIX_HTTP_FAST_PATH', 'true').lower() == 'true'
+NETFLIX_HTTP_HEADERS = {
+    'User-Agent': DEFAULT_USER_AGENT,
+    'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7'
+}
+
 # Firebase 초기화
 def initialize_firebase():
     """Firebase Admin SDK 초기화"""
@@ -58,14 +97,184 @@ def initialize_gemini():
     return genai.GenerativeModel('models/gemini-2.0-flash')
 
 
-async def scrape_netflix(media_type: str = 'tv', max_items: int = 10, max_retries: int = 3) -> List[Dict[str, Any]]:
+NETFLIX_FALLBACK_IMAGE = 'https://assets.nflxext.com/us/ffe/siteui/common/icons/nficon2016.png'
+
+
+def build_netflix_item(rank: int, title: str, weeks: str, image_url: str, media_type: str) -> Dict[str, Any]:
+    """Netflix Top 10 한 행을 daily_rankings 아이템 구조로 변환 (HTTP/브라우저 경로 공용)"""
+    # YouTube 트레일러 링크 생성
+    trailer_query = f"{title} trailer"
+    trailer_link = f"https://www.youtube.com/results?search_query={trailer_query.replace(' ', '+')}"
+    
+    # media_type에 따라 type 설정
+    item_type = 'TV Show' if media_type == 'tv' else 'Film'
+    default_tag = 'K-Drama' if media_type == 'tv' else 'Korean Film'
+    
+    return {
+        'rank': rank,
+        'titleEn': title,
+        'titleKo': title,  # 이후 번역 단계에서 업데이트
+        'imageUrl': image_url,
+        'weeksInTop10': weeks,
+        'type': item_type,
+        'trailerLink': trailer_link,
+        'vpnLink': 'https://nordvpn.com/ko/',
+        'tags': [f"{weeks} Weeks in Top 10", default_tag],
+        'trend': 0
+    }
+
+
+def parse_netflix_table(html: str, media_type: str, max_items: int = 10) -> List[Dict[str, Any]]:
+    """
+    서버 렌더링된 Top 10 테이블(table tbody tr)을 파싱
+    
+    Returns:
+        아이템 리스트 (테이블이 없으면 빈 리스트)
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    rows = soup.select("table tbody tr")[:max_items]
+    
+    products = []
+    for i, row in enumerate(rows, 1):
+        try:
+            # 브라우저 분석 기반 셀렉터
+            rank_el = row.select_one("span.rank")
+            title_el = row.select_one("td.title button")
+            weeks_el = row.select_one("td[data-uia='top10-table-row-weeks']")
+            img_el = row.select_one("td.title img.desktop-only")
+            
+            rank_text = rank_el.get_text(strip=True) if rank_el else str(i)
+            title = title_el.get_text(strip=True) if title_el else f"Unknown Title {i}"
+            weeks = weeks_el.get_text(strip=True) if weeks_el else "1"
+            
+            # 이미지 URL 추출
+            image_url = img_el.get('src', '') if img_el else NETFLIX_FALLBACK_IMAGE
+            
+            rank = int(rank_text) if rank_text.isdigit() else i
+            products.append(build_netflix_item(rank, title, weeks, image_url, media_type))
+            print(f"  {rank_text}위. {title} ({weeks}주 연속 Top 10)")
+            
+        except Exception as e:
+            print(f"⚠️ {i}위 파싱 오류: {e}")
+            continue
+    
+    return products
+
+
+NETFLIX_JSON_TITLE_KEYS = ('showName', 'show_title', 'name', 'title')
+NETFLIX_JSON_WEEKS_KEYS = ('cumulativeWeeksInTop10', 'cumulative_weeks_in_top_10', 'weeksInTop10')
+NETFLIX_JSON_IMAGE_KEYS = ('image', 'imageUrl', 'boxart', 'artwork')
+
+
+def _find_top10_entries(node: Any) -> List[Dict[str, Any]]:
+    """임베디드 JSON에서 rank + 제목 키를 가진 가장 먼저 발견되는 객체 리스트를 탐색"""
+    if isinstance(node, list):
+        if node and all(isinstance(x, dict) and 'rank' in x for x in node):
+            if any(key in node[0] for key in NETFLIX_JSON_TITLE_KEYS):
+                return node
+        for child in node:
+            found = _find_top10_entries(child)
+            if found:
+                return found
+    elif isinstance(node, dict):
+        for child in node.values():
+            found = _find_top10_entries(child)
+            if found:
+                return found
+    return []
+
+
+def _entry_rank(value: Any, default: int) -> int:
+    """임베디드 JSON의 rank 값 → 정수 ('#1', '1st' 같은 표기 허용, 숫자가 없으면 default)"""
+    match = re.search(r'\d+', str(value if value is not None else ''))
+    return int(match.group()) if match else default
+
+
+def parse_netflix_embedded_json(html: str, media_type: str, max_items: int = 10) -> List[Dict[str, Any]]:
     """
-    Netflix Top 10 South Korea TV Shows/Films 크롤링
+    페이지에 임베디드된 JSON 페이로드(__NEXT_DATA__ 등)에서 Top 10 목록을 파싱
+    
+    Returns:
+        아이템 리스트 (페이로드가 없거나 구조를 모르면 빈 리스트)
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    scripts = soup.select('script#__NEXT_DATA__') or soup.select('script[type="application/json"]')
+    
+    for script in scripts:
+        try:
+            payload = json.loads(script.string or '')
+        except (TypeError, ValueError):
+            continue
+        
+        entries = _find_top10_entries(payload)
+        if not entries:
+            continue
+        
+        products = []
+        # rank를 읽을 수 없는 항목은 페이로드 순서를 순위로 사용
+        ranked = sorted(
+            ((_entry_rank(entry.get('rank'), pos), pos, entry) for pos, entry in enumerate(entries, 1)),
+            key=lambda t: (t[0], t[1])
+        )
+        for i, (rank, _, entry) in enumerate(ranked[:max_items], 1):
+            title = next((str(entry[k]) for k in NETFLIX_JSON_TITLE_KEYS if entry.get(k)), f"Unknown Title {i}")
+            weeks = next((str(entry[k]) for k in NETFLIX_JSON_WEEKS_KEYS if entry.get(k) is not None), "1")
+            image_url = next((entry[k] for k in NETFLIX_JSON_IMAGE_KEYS if isinstance(entry.get(k), str) and entry.get(k)), NETFLIX_FALLBACK_IMAGE)
+            products.append(build_netflix_item(rank, title, weeks, image_url, media_type))
+            print(f"  {rank}위. {title} ({weeks}주 연속 Top 10)")
+        return products
+    
+    return []
+
+
+def parse_netflix_html(html: str, media_type: str, max_items: int = 10) -> List[Dict[str, Any]]:
+    """테이블 우선, 없으면 임베디드 JSON 페이로드로 Top 10 파싱"""
+    products = parse_netflix_table(html, media_type, max_items)
+    if products:
+        return products
+    return parse_netflix_embedded_json(html, media_type, max_items)
+
+
+def _fetch_netflix_html(url: str) -> Optional[str]:
+    """브라우저 없이 일반 HTTP로 페이지 HTML을 가져옴 (블로킹, 스레드에서 실행)"""
+    response = requests.get(url, headers=NETFLIX_HTTP_HEADERS, timeout=20)
+    if response.status_code != 200:
+        print(f"⚠️ HTTP 응답 코드 {response.status_code}: {url}")
+        return None
+    return response.text
+
+
+async def scrape_netflix_http(media_type: str = 'tv', max_items: int = 10, country: str = DEFAULT_NETFLIX_COUNTRY) -> List[Dict[str, Any]]:
+    """
+    Netflix Top 10 HTTP 빠른 경로 (브라우저 불필요)
+    
+    서버 렌더링된 테이블 또는 임베디드 JSON을 파싱합니다. 둘 다 없으면 빈 리스트를 반환하며,
+    이 경우 호출자는 Playwright 경로로 폴백합니다.
+    """
+    url = f"https://top10.netflix.com/{country}/{media_type}"
+    try:
+        print(f"⚡ HTTP 빠른 경로로 로딩 중: {url}")
+        html = await asyncio.to_thread(_fetch_netflix_html, url)
+        if not html:
+            return []
+        products = parse_netflix_html(html, media_type, max_items)
+        if products:
+            print(f"✅ HTTP 빠른 경로로 {len(products)}개 타이틀 발견!")
+        return products
+    except Exception as e:
+        print(f"⚠️ HTTP 빠른 경로 오류: {e}")
+        return []
+
+
+async def scrape_netflix_browser(media_type: str = 'tv', max_items: int = 10, max_retries: int = 3, country: str = DEFAULT_NETFLIX_COUNTRY) -> List[Dict[str, Any]]:
+    """
+    Netflix Top 10 Playwright 경로 (클라이언트 렌더링이 필요한 경우의 폴백)
     
     Args:
         media_type: 'tv' 또는 'film'
         max_items: 크롤링할 최대 아이템 수 (기본 10개)
         max_retries: 최대 재시도 횟수
+        country: top10.netflix.com 국가 슬러그 (예: 'south-korea', 'japan')
         
     Returns:
         제품 데이터 리스트
@@ -74,21 +283,12 @@ async def scrape_netflix(media_type: str = 'tv', max_items: int = 10, max_retrie
     
     for attempt in range(max_retries):
         try:
-            async with async_playwright() as p:
+            # 재시도 시에도 브라우저는 재실행하지 않고 공유 풀에서 페이지만 새로 빌림
+            async with get_browser_pool().page(**NETFLIX_CONTEXT_OPTIONS) as page:
                 print(f"🎬 Netflix Top 10 크롤링 시작... (시도 {attempt + 1}/{max_retries})")
                 
-                browser = await p.chromium.launch(headless=True)
-                context = await browser.new_context(
-                    user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-                    viewport={'width': 1920, 'height': 1080},
-                    locale='ko-KR',
-                    timezone_id='Asia/Seoul'
-                )
-                
-                page = await context.new_page()
-                
                 # Netflix Top 10 URL (tv 또는 films)
-                url = f"https://top10.netflix.com/south-korea/{media_type}"
+                url = f"https://top10.netflix.com/{country}/{media_type}"
                 print(f"📄 페이지 로딩 중: {url}")
                 
                 await page.goto(url, wait_until='networkidle', timeout=60000)
@@ -101,69 +301,21 @@ async def scrape_netflix(media_type: str = 'tv', max_items: int = 10, max_retrie
                 
                 await page.wait_for_timeout(3000)  # 추가 렌더링 대기
                 
-                # HTML 가져오기
+                # HTML 가져오기 (파싱은 HTTP 경로와 동일한 파서 사용)
                 content = await page.content()
-                soup = BeautifulSoup(content, 'html.parser')
+                products = parse_netflix_html(content, media_type, max_items)
+                print(f"✅ {len(products)}개 타이틀 발견!")
                 
-                # 테이블 행(Row) 선택
-                rows = soup.select("table tbody tr")[:max_items]
-                print(f"✅ {len(rows)}개 타이틀 발견!")
-                
-                if len(rows) == 0:
-                    print(f"⚠️ 데이터를 찾지 못함 (시도 {attempt + 1}/{max_retries})")
-                    await browser.close()
-                    if attempt < max_retries - 1:
-                        await asyncio.sleep(5)
-                        continue
-                    else:
-                        return products
-                
-                for i, row in enumerate(rows, 1):
-                    try:
-                        # 브라우저 분석 기반 셀렉터
-                        rank_el = row.select_one("span.rank")
-                        title_el = row.select_one("td.title button")
-                        weeks_el = row.select_one("td[data-uia='top10-table-row-weeks']")
-                        img_el = row.select_one("td.title img.desktop-only")
-                        
-                        rank_text = rank_el.get_text(strip=True) if rank_el else str(i)
-                        title = title_el.get_text(strip=True) if title_el else f"Unknown Title {i}"
-                        weeks = weeks_el.get_text(strip=True) if weeks_el else "1"
-                        
-                        # 이미지 URL 추출
-                        image_url = img_el.get('src', '') if img_el else 'https://assets.nflxext.com/us/ffe/siteui/common/icons/nficon2016.png'
-                        
-                        # YouTube 트레일러 링크 생성
-                        trailer_query = f"{title} trailer"
-                        trailer_link = f"https://www.youtube.com/results?search_query={trailer_query.replace(' ', '+')}"
-                        
-                        # media_type에 따라 type 설정
-                        item_type = 'TV Show' if media_type == 'tv' else 'Film'
-                        default_tag = 'K-Drama' if media_type == 'tv' else 'Korean Film'
-                        
-                        item = {
-                            'rank': int(rank_text) if rank_text.isdigit() else i,
-                            'titleEn': title,
-                            'titleKo': title,  # 이후 번역 단계에서 업데이트
-                            'imageUrl': image_url,
-                            'weeksInTop10': weeks,
-                            'type': item_type,
-                            'trailerLink': trailer_link,
-                            'vpnLink': 'https://nordvpn.com/ko/',
-                            'tags': [f"{weeks} Weeks in Top 10", default_tag],
-                            'trend': 0
-                        }
-                        
-                        products.append(item)
-                        print(f"  {rank_text}위. {title} ({weeks}주 연속 Top 10)")
-                        
-                    except Exception as e:
-                        print(f"⚠️ {i}위 파싱 오류: {e}")
-                        continue
-                
-                await browser.close()
-                print("✅ Netflix 크롤링 성공!")
-                break
+            if len(products) == 0:
+                print(f"⚠️ 데이터를 찾지 못함 (시도 {attempt + 1}/{max_retries})")
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(5)
+                    continue
+                else:
+                    return products
+            
+            print("✅ Netflix 크롤링 성공!")
+            break
                 
         except Exception as e:
             print(f"❌ 크롤링 오류 (시도 {attempt + 1}/{max_retries}): {e}")
@@ -176,19 +328,164 @@ async def scrape_netflix(media_type: str = 'tv', max_items: int = 10, max_retrie
     
     return products
 
+
+async def scrape_netflix(media_type: str = 'tv', max_items: int = 10, max_retries: int = 3, country: str = DEFAULT_NETFLIX_COUNTRY) -> List[Dict[str, Any]]:
+    """
+    Netflix Top 10 TV Shows/Films 크롤링 (기본: South Korea)
+    
+    HTTP 빠른 경로를 먼저 시도하고, 테이블/JSON을 찾지 못한 경우에만 Playwright로 폴백합니다.
+    
+    Args:
+        media_type: 'tv' 또는 'film'
+        max_items: 크롤링할 최대 아이템 수 (기본 10개)
+        max_retries: 최대 재시도 횟수 (브라우저 경로)
+        country: top10.netflix.com 국가 슬러그 (예: 'south-korea', 'japan')
+        
+    Returns:
+        제품 데이터 리스트
+    """
+    if NETFLIX_HTTP_FAST_PATH:
+        products = await scrape_netflix_http(media_type, max_items, country)
+        if products:
+            return products
+        print("💡 HTTP 응답에 테이블이 없어 Playwright 경로로 폴백합니다.")
+    
+    return await scrape_netflix_browser(media_type, max_items, max_retries, country)
+
+async def _timed_scrape_netflix(media_type: str, max_items: int) -> Tuple[List[Dict[str, Any]], float]:
+    """scrape_netflix 실행 시간을 함께 반환"""
+    started = time.perf_counter()
+    items = await scrape_netflix(media_type=media_type, max_items=max_items)
+    return items, time.perf_counter() - started
+
+
+async def scrape_netflix_concurrently(media_types: Sequence[str] = NETFLIX_MEDIA_TYPES, max_items: int = 10) -> Dict[str, Dict[str, Any]]:
+    """
+    여러 미디어 타입(TV/Films)을 하나의 공유 브라우저에서 동시에 크롤링
+    
+    각 타입은 풀에서 별도의 컨텍스트를 빌리므로 쿠키/세션이 섞이지 않으며,
+    전체 소요 시간은 두 작업의 합이 아니라 더 느린 쪽에 가까워집니다.
+    
+    Args:
+        media_types: 크롤링할 미디어 타입 목록 (결과 병합 순서이기도 함)
+        max_items: 타입별 최대 아이템 수
+        
+    Returns:
+        {media_type: {'items': [...], 'elapsed': 초}} (media_types 순서 유지)
+    """
+    results = await asyncio.gather(
+        *[_timed_scrape_netflix(media_type, max_items) for media_type in media_types],
+        return_exceptions=True
+    )
+    
+    scraped = {}
+    for media_type, result in zip(media_types, results):
+        if isinstance(result, Exception):
+            print(f"❌ {media_type} 크롤링 실패: {result}")
+            scraped[media_type] = {'items': [], 'elapsed': 0.0}
+        else:
+            items, elapsed = result
+            scraped[media_type] = {'items': items, 'elapsed': elapsed}
+    return scraped
+
+def media_category_for_country(country: str) -> str:
+    """국가별 daily_rankings 카테고리 (기존 한국 문서는 'media' 유지)"""
+    if country == DEFAULT_NETFLIX_COUNTRY:
+        return 'media'
+    return f"media-{country}"
+
+
+async def scrape_netflix_countries(countries: Sequence[str], media_types: Sequence[str] = NETFLIX_MEDIA_TYPES,
+                                   max_items: int = 10, concurrency: int = NETFLIX_SWEEP_CONCURRENCY) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    N개 국가 × {tv, films} 페이지를 제한된 워커 풀로 크롤링
+    
+    모든 워커는 하나의 공유 브라우저에서 페이지를 빌리며, 동시에 열리는 페이지 수는
+    concurrency로 제한됩니다. 직렬 실행 대비 전체 소요 시간이 약 1/concurrency로 줄어듭니다.
+    
+    Args:
+        countries: 국가 슬러그 목록
+        media_types: 국가별로 크롤링할 미디어 타입 (병합 순서)
+        max_items: 페이지당 최대 아이템 수
+        concurrency: 동시에 처리할 최대 페이지 수
+        
+    Returns:
+        {country: items} (각 국가의 items는 media_types 순서로 병합)
+    """
+    concurrency = max(1, concurrency)
+    # 풀이 아직 생성되지 않았다면 워커 수에 맞춰 동시 페이지 한도를 설정
+    get_browser_pool(max_pages=concurrency)
+    
+    queue: asyncio.Queue = asyncio.Queue()
+    for country in countries:
+        for media_type in media_types:
+            queue.put_nowait((country, media_type))
+    total_jobs = queue.qsize()
+    
+    page_results: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    done_count = 0
+    
+    async def worker(worker_id: int):
+        nonlocal done_count
+        while True:
+            try:
+                country, media_type = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                page_results[(country, media_type)] = await scrape_netflix(
+                    media_type=media_type, max_items=max_items, max_retries=2, country=country
+                )
+            except Exception as e:
+                print(f"❌ [{country}/{media_type}] 크롤링 실패: {e}")
+                page_results[(country, media_type)] = []
+            finally:
+                done_count += 1
+                print(f"  🧵 워커 {worker_id}: {country}/{media_type} 완료 ({done_count}/{total_jobs})")
+                queue.task_done()
+    
+    started = time.perf_counter()
+    print(f"\n🌏 Netflix 멀티 국가 스윕 시작: {len(countries)}개 국가 × {len(media_types)}개 타입 = {total_jobs}페이지 (동시 {concurrency})")
+    await asyncio.gather(*[worker(i + 1) for i in range(min(concurrency, total_jobs))])
+    print(f"✅ 스윕 완료: {total_jobs}페이지, {time.perf_counter() - started:.1f}초")
+    
+    results = {}
+    for country in countries:
+        merged = []
+        for media_type in media_types:
+            merged.extend(page_results.get((country, media_type), []))
+        results[country] = merged
+    return results
+
 async def translate_media_titles(model, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Gemini AI로 미디어 제목(Netflix)을 한국어로 번역
+    
+    제목 번역 메모리에 있는 타이틀은 로컬에서 채우고, 처음 보는 타이틀만 Gemini에 요청합니다.
     """
     print("\n🌐 Gemini AI로 미디어 제목 한국어 번역 중...")
+    memory = get_title_memory()
+    
+    unknown_items = []
+    for item in items:
+        title_ko = memory.get(item['titleEn'])
+        if title_ko is None:
+            unknown_items.append(item)
+        else:
+            item['titleKo'] = title_ko
+    memory.stats['known'] += len(items) - len(unknown_items)
     
-    # 제목 리스트 생성
-    titles = [f"{item['rank']}. {item['titleEn']}" for item in items]
+    if not unknown_items:
+        print(f"✅ 미디어 제목 번역 완료 (번역 메모리 {len(items)}개, Gemini 요청 없음)")
+        return items
+    
+    # 제목 리스트 생성 (TV/Film 순위가 겹치므로 rank 대신 요청 내 번호 사용)
+    titles = [f"{index}. {item['titleEn']}" for index, item in enumerate(unknown_items, 1)]
     
     prompt = f"""
 Translate the following Netflix TV Show/Film titles into their official Korean titles.
 Some are already Korean dramas, so find their original Korean titles (e.g., 'Squid Game' -> '오징어 게임').
-Exclude rank numbers from the translation.
+Exclude the leading numbers from the translation.
 
 Titles:
 {chr(10).join(titles)}
@@ -196,8 +493,8 @@ Titles:
 Response format (JSON):
 {{
   "translations": [
-    {{"rank": 1, "titleKo": "한국어 제목"}},
-    {{"rank": 2, "titleKo": "한국어 제목"}},
+    {{"id": 1, "titleKo": "한국어 제목"}},
+    {{"id": 2, "titleKo": "한국어 제목"}},
     ...
   ]
 }}
@@ -205,8 +502,7 @@ Response format (JSON):
 JSON only.
 """
     try:
-        response = model.generate_content(prompt)
-        result_text = response.text.strip()
+        result_text = (await cached_generate(model, prompt, validate=parse_json_response)).strip()
         
         # JSON 파싱 (마크다운 코드 블록 제거)
         if result_text.startswith('```'):
@@ -216,33 +512,64 @@ JSON only.
         
         translations = json.loads(result_text)
         
-        # 번역 적용
+        # 번역 적용 + 메모리에 기록
         for trans in translations.get('translations', []):
-            rank = trans.get('rank')
+            index = trans.get('id')
             title_ko = trans.get('titleKo')
-            
-            for item in items:
-                if item['rank'] == rank:
-                    item['titleKo'] = title_ko
-                    break
+            if not isinstance(index, int) or not 1 <= index <= len(unknown_items) or not title_ko:
+                continue
+            item = unknown_items[index - 1]
+            item['titleKo'] = title_ko
+            memory.put(item['titleEn'], title_ko)
+            memory.stats['translated'] += 1
         
-        print(f"✅ 미디어 제목 번역 완료")
+        print(f"✅ 미디어 제목 번역 완료 (번역 메모리 {len(items) - len(unknown_items)}개, Gemini {len(unknown_items)}개)")
         
     except Exception as e:
         print(f"⚠️  미디어 제목 번역 오류: {e}")
         # 실패 시 영어 제목을 그대로 사용
-        for item in items:
+        for item in unknown_items:
             item['titleKo'] = item['titleEn']
             
     return items
 
-async def calculate_media_trends(db, current_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """미디어 랭킹 트렌드 계산"""
+MediaKey = Tuple[str, str]
+
+def media_trend_keys(item: Dict[str, Any]) -> List[MediaKey]:
+    """(type, 정규화된 제목) 키 - 영어/한국어 제목을 모두 별칭으로 사용"""
+    media_type = item.get('type', '')
+    keys = []
+    for title in (item.get('titleEn'), item.get('titleKo')):
+        normalized = normalize_title(title)
+        if normalized and (media_type, normalized) not in keys:
+            keys.append((media_type, normalized))
+    return keys
+
+def build_media_trend_index(items: List[Dict[str, Any]]) -> Dict[MediaKey, int]:
+    """이전 스냅샷의 (type, 제목) → rank 인덱스 (같은 키가 여러 번 나오면 먼저 나온 항목 유지)"""
+    index: Dict[MediaKey, int] = {}
+    for item in items:
+        rank = item.get('rank')
+        if rank is None:
+            continue
+        for key in media_trend_keys(item):
+            index.setdefault(key, rank)
+    return index
+
+def lookup_previous_rank(index: Dict[MediaKey, int], item: Dict[str, Any]) -> Optional[int]:
+    """영어 제목 → 한국어 제목 순서로 같은 type의 이전 순위 조회"""
+    for key in media_trend_keys(item):
+        if key in index:
+            return index[key]
+    return None
+
+async def calculate_media_trends(db, current_items: List[Dict[str, Any]], category: str = 'media') -> List[Dict[str, Any]]:
+    """미디어 랭킹 트렌드 계산 (category: 'media' 또는 국가별 'media-{country}')"""
     from datetime import timedelta
     
     try:
         yesterday = (datetime.now(timezone.utc) - timedelta(days=1)).strftime('%Y-%m-%d')
-        doc_id = f"{yesterday}_media"
+        doc_id = f"{yesterday}_{category}"
         
         print(f"\n📊 Media 트렌드 계산 중... (어제: {yesterday})")
         
@@ -259,22 +586,22 @@ async def calculate_media_trends(db, current_items: List[Dict[str, Any]]) -> Lis
         yesterday_items = doc.to_dict().get('items', [])
         print(f"✅ 어제 Media 데이터 {len(yesterday_items)}개 발견")
         
+        # (type, 제목) 인덱스 - TV/Film 순위가 한 리스트에 섞여 있어도 같은 type끼리만 비교
+        yesterday_index = build_media_trend_index(yesterday_items)
+        
         trend_changes = []
         matched_count = 0
         new_count = 0
+        type_counts: Dict[str, List[int]] = {}
         
         for current in current_items:
             title_en = current.get('titleEn', '')
             title_ko = current.get('titleKo', '')
             current_rank = current['rank']
             
-            # 영어 제목 또는 한국어 제목으로 매칭
-            yesterday_rank = None
-            for old_item in yesterday_items:
-                if (old_item.get('titleEn') == title_en or 
-                    old_item.get('titleKo') == title_ko):
-                    yesterday_rank = old_item.get('rank')
-                    break
+            yesterday_rank = lookup_previous_rank(yesterday_index, current)
+            counts = type_counts.setdefault(current.get('type', ''), [0, 0])
+            counts[0 if yesterday_rank else 1] += 1
             
             if yesterday_rank:
                 trend = yesterday_rank - current_rank
@@ -296,6 +623,8 @@ async def calculate_media_trends(db, current_items: List[Dict[str, Any]]) -> Lis
                 print(f"   ... 외 {len(trend_changes) - 5}개")
         
         print(f"📊 매칭 결과: 기존 {matched_count}개, 신규 {new_count}개")
+        for media_type, (matched, new) in type_counts.items():
+            print(f"   - {media_type or '기타'}: 기존 {matched}개, 신규 {new}개")
                 
         return current_items
     except Exception as e:
@@ -316,6 +645,16 @@ async def main():
     # 커맨드 라인 인자 확인
     run_mode = sys.argv[1] if len(sys.argv) > 1 else "media"  # "media"
     
+    # 이전 실행에서 발행하지 못한 문서만 다시 발행 (스크래핑/Gemini 작업 없음)
+    if run_mode == "--publish-only":
+        print("\n📮 아웃박스 재발행 모드")
+        db = initialize_firebase()
+        try:
+            remaining = await publish_only(db)
+        finally:
+            save_write_manifest()
+        sys.exit(EXIT_UNPUBLISHED if remaining else 0)
+    
     # Beauty는 이제 import_editorial_ranking.py를 통해 수동으로 관리됨
     if run_mode == "beauty":
         print("\n" + "=" * 60)
@@ -324,18 +663,28 @@ async def main():
         print("=" * 60)
         sys.exit(0)
     
+    publisher = None
     try:
         # 1. Firebase 초기화
         print("\n📱 Firebase 초기화 중...")
         db = initialize_firebase()
         print("✅ Firebase 연결 완료")
         
+        # 완성된 문서는 아웃박스에 먼저 기록하고 백그라운드에서 발행 (이전 실행의 미발행 문서 포함)
+        if WRITE_TO_FIRESTORE:
+            publisher = OutboxPublisher(db, PublishOutbox()).start()
+        
+        # 제목 번역 메모리가 비어 있으면 기존 media 랭킹으로 시드
+        get_title_memory().seed_from_rankings(db)
+        
         # 2. Gemini 초기화
         print("\n🤖 Gemini AI 초기화 중...")
         model = initialize_gemini()
         print("✅ Gemini AI 연결 완료")
         
         total_products = 0
+        scraped = {}
+        media_elapsed = 0.0
         
         # 4. Media 카테고리 크롤링
         if run_mode == "media":
@@ -345,24 +694,25 @@ async def main():
             
             all_media_items = []
             
-            # Netflix TV Shows Top 10 크롤링
-            print("\n📺 Netflix TV Shows 크롤링 중...")
+            # Netflix TV Shows / Films Top 10 동시 크롤링 (공유 브라우저, 타입별 컨텍스트)
+            print("\n📺🎬 Netflix TV Shows / Films 동시 크롤링 중...")
             actual_limit = DEV_LIMIT if DEV_MODE else 10
-            tv_items = await scrape_netflix(media_type='tv', max_items=actual_limit)
-            if tv_items:
-                all_media_items.extend(tv_items)
-                print(f"✅ TV Shows {len(tv_items)}개 수집 완료")
-            else:
-                print("⚠️ TV Shows 데이터를 찾지 못했습니다.")
+            media_started = time.perf_counter()
+            scraped = await scrape_netflix_concurrently(NETFLIX_MEDIA_TYPES, max_items=actual_limit)
+            media_elapsed = time.perf_counter() - media_started
             
-            # Netflix Films Top 10 크롤링
-            print("\n🎬 Netflix Films 크롤링 중...")
-            film_items = await scrape_netflix(media_type='films', max_items=actual_limit)
-            if film_items:
-                all_media_items.extend(film_items)
-                print(f"✅ Films {len(film_items)}개 수집 완료")
-            else:
-                print("⚠️ Films 데이터를 찾지 못했습니다.")
+            # 병합 순서 고정: TV Shows → Films
+            for media_type in NETFLIX_MEDIA_TYPES:
+                label = NETFLIX_MEDIA_LABELS[media_type]
+                type_items = scraped[media_type]['items']
+                if type_items:
+                    all_media_items.extend(type_items)
+                    print(f"✅ {label} {len(type_items)}개 수집 완료 ({scraped[media_type]['elapsed']:.1f}초)")
+                else:
+                    print(f"⚠️ {label} 데이터를 찾지 못했습니다.")
+            
+            tv_items = scraped['tv']['items']
+            film_items = scraped['films']['items']
             
             if all_media_items:
                 # 한국어 제목 번역 (먼저 실행)
@@ -370,6 +720,8 @@ async def main():
                 
                 # 트렌드 계산 (번역 후 실행하여 영어/한국어 제목으로 매칭)
                 all_media_items = await calculate_media_trends(db, all_media_items)
+                # 순위 이력 기반 모멘텀 지표 (trend 옆 필드)
+                all_media_items = apply_rank_history('media', all_media_items)
                 
                 # Media 저장 로직
                 today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
@@ -383,9 +735,10 @@ async def main():
                     'updatedAt': firestore.SERVER_TIMESTAMP
                 }
                 
-                if WRITE_TO_FIRESTORE:
-                    doc_ref.set(data)
-                    print(f"✅ {len(all_media_items)}개 타이틀을 {doc_id} 문서에 저장 완료")
+                if publisher:
+                    # 아웃박스에 먼저 기록 후 백그라운드 발행 (발행 실패해도 스크래핑 결과는 보존)
+                    publisher.submit(doc_ref.path, data)
+                    print(f"📮 {len(all_media_items)}개 타이틀을 {doc_id} 발행 대기열에 기록")
                 else:
                     print(f"🧪 [DEV_MODE] Firebase Media 저장 스킵 ({len(all_media_items)}개)")
                 print(f"   - TV Shows: {len(tv_items)}개")
@@ -394,6 +747,54 @@ async def main():
             else:
                 print("⚠️ Netflix에서 데이터를 찾지 못했습니다.")
 
+        # 멀티 국가 Media 스윕 (국가별 daily_rankings 문서 저장)
+        elif run_mode == "media-countries":
+            print("\n" + "=" * 60)
+            print("🌏 MEDIA 멀티 국가 크롤링 (Netflix)")
+            print("=" * 60)
+            
+            countries = sys.argv[2].split(',') if len(sys.argv) > 2 else NETFLIX_COUNTRIES
+            countries = [c.strip() for c in countries if c.strip()]
+            actual_limit = DEV_LIMIT if DEV_MODE else 10
+            
+            media_started = time.perf_counter()
+            country_items = await scrape_netflix_countries(countries, NETFLIX_MEDIA_TYPES, max_items=actual_limit)
+            media_elapsed = time.perf_counter() - media_started
+            
+            today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+            for country, items in country_items.items():
+                if not items:
+                    print(f"⚠️ [{country}] 데이터를 찾지 못했습니다.")
+                    continue
+                
+                category = media_category_for_country(country)
+                print(f"\n🌐 [{country}] {len(items)}개 타이틀 후처리 중...")
+                items = await translate_media_titles(model, items)
+                items = await calculate_media_trends(db, items, category=category)
+                items = apply_rank_history(category, items)
+                
+                doc_id = f"{today}_{category}"
+                data = {
+                    'date': today,
+                    'category': category,
+                    'country': country,
+                    'items': items,
+                    'updatedAt': firestore.SERVER_TIMESTAMP
+                }
+                
+                if publisher:
+                    publisher.submit(db.collection('daily_rankings').document(doc_id).path, data)
+                    print(f"📮 {len(items)}개 타이틀을 {doc_id} 발행 대기열에 기록")
+                else:
+                    print(f"🧪 [DEV_MODE] Firebase 저장 스킵: {doc_id} ({len(items)}개)")
+                total_products += len(items)
+            
+            print(f"\n⏱️ 멀티 국가 크롤링 소요: {media_elapsed:.1f}초 ({len(countries)}개 국가)")
+
+        # 발행 대기열이 빌 때까지 대기 (재시도 후에도 실패한 문서는 아웃박스에 남음)
+        unpublished = await publisher.close() if publisher else 0
+        publisher = None
+        
         print("\n" + "=" * 60)
         print("✅ 모든 크롤링 완료!")
         print("=" * 60)
@@ -402,6 +803,12 @@ async def main():
         print(f"\n📊 크롤링 결과:")
         print(f"  - 총 아이템 수: {total_products}개")
         print(f"  - 실행 모드: {run_mode.upper()}")
+        if scraped:
+            for media_type, result in scraped.items():
+                print(f"  - {NETFLIX_MEDIA_LABELS.get(media_type, media_type)} 크롤링: {len(result['items'])}개, {result['elapsed']:.1f}초")
+            print(f"  - 미디어 크롤링 총 소요: {media_elapsed:.1f}초 (동시 실행)")
+        print(f"  - Gemini 응답 캐시: {get_response_cache().summary()}")
+        print(f"  - 제목 번역 메모리: {get_title_memory().summary()}")
 
         # 데이터 검증: 수집된 데이터가 하나도 없으면 실패로 간주
         if total_products == 0:
@@ -409,15 +816,28 @@ async def main():
             print("💡 크롤링 대상 사이트의 구조가 변경되었거나 접근이 차단되었을 수 있습니다.")
             sys.exit(1)
         
+        if unpublished:
+            print(f"\n❌ Firestore 발행 실패 문서 {unpublished}개 - 결과는 아웃박스에 보존되었습니다.")
+            sys.exit(EXIT_UNPUBLISHED)
+        
     except Exception as e:
         print(f"\n❌ 오류 발생: {e}")
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        if publisher is not None:
+            await publisher.close()
+        save_response_cache()
+        save_write_manifest()
+        save_title_memory()
+        await close_browser_pool()
 
 if __name__ == "__main__":
     # 사용법:
     # python scraper.py media     # Media만 실행
+    # python scraper.py media-countries [japan,united-states,...]   # 멀티 국가 Media 스윕
+    # python scraper.py --publish-only   # 이전 실행의 아웃박스만 재발행
     # 
     # Beauty 데이터는 scripts/import_editorial_ranking.py를 사용하세요
     asyncio.run(main())
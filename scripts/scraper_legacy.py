@@ -7,17 +7,16 @@ K-Rank Beauty Scraper
 import asyncio
 import os
 import sys
-import random
 import time
 import re
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import json
 import math
 
-from playwright.async_api import async_playwright
 from bs4 import BeautifulSoup
 import requests
+import aiohttp
 import firebase_admin
 from firebase_admin import credentials, firestore
 import google.generativeai as genai
@@ -29,11 +28,32 @@ project_root = os.path.dirname(script_dir)
 env_path = os.path.join(project_root, '.env')
 load_dotenv(env_path)
 
+sys.path.append(script_dir)
+from browser_pool import get_browser_pool, close_browser_pool
+from http_client import get_http_session, close_http_session
+from llm_batch import get_llm_engine, parse_json_response
+from response_cache import cached_generate, get_response_cache, save_response_cache
+from gemini_cache_store import get_gemini_cache, close_gemini_cache, LEGACY_CACHE_FILE
+from product_matcher import match_products
+from product_registry import get_product_registry, save_product_registry, normalize_product_name
+from rank_history import apply_rank_history
+from nik_index import calculate_nik_indices
+from write_manifest import write_document, describe_write, save_write_manifest
+
 # 개발 모드 및 제한 설정
 DEV_MODE = os.getenv('DEV_MODE', 'false').lower() == 'true'
 DEV_LIMIT = 5  # 개발 모드일 때 처리할 아이템 수
 WRITE_TO_FIRESTORE = os.getenv('WRITE_TO_FIRESTORE', 'true').lower() == 'true'
 
+# webscraping.ai 이미지 검색 설정
+WEBSCRAPING_AI_URL = 'https://api.webscraping.ai/html'
+AMAZON_IMAGE_CONCURRENCY = int(os.getenv('AMAZON_IMAGE_CONCURRENCY', '8'))
+
+# 화해 리뷰 수집 설정
+HWAHAE_REVIEW_SELECTOR = 'div._review_text_1k2l9_1'
+# 미지정 시 공유 브라우저 풀의 동시 페이지 수(BROWSER_POOL_MAX_PAGES)를 그대로 사용
+HWAHAE_REVIEW_CONCURRENCY = int(os.getenv('HWAHAE_REVIEW_CONCURRENCY', '0')) or None
+
 BRAND_NAME_MAPPING = {
     '아누아': 'Anua',
     '바이오던스': 'Biodance',
@@ -75,24 +95,30 @@ CATEGORY_MAPPING = {
     'all': {'firestore_category': 'beauty'}
 }
 
-CACHE_FILE = os.path.join(script_dir, 'gemini_cache.json')
+# 기존 JSON 캐시 경로 (SQLite 스토어 최초 실행 시 한 번 가져옴)
+CACHE_FILE = LEGACY_CACHE_FILE
 
 def load_cache():
-    if os.path.exists(CACHE_FILE):
-        try:
-            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"⚠️ 캐시 로드 오류: {e}")
+    """전체 캐시를 dict로 반환 (전체 조회 - 가능하면 get_gemini_cache().get_many() 사용)"""
+    try:
+        return get_gemini_cache().all()
+    except Exception as e:
+        print(f"⚠️ 캐시 로드 오류: {e}")
     return {}
 
 def save_cache(cache):
+    """dict의 모든 항목을 upsert (변경분만 있으면 get_gemini_cache().upsert_many() 사용)"""
     try:
-        with open(CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(cache, f, ensure_ascii=False, indent=2)
+        get_gemini_cache().upsert_many(cache)
     except Exception as e:
         print(f"⚠️ 캐시 저장 오류: {e}")
 
+def translation_cache_key(brand: str, product_name: str) -> str:
+    """번역 캐시 키 정규화 (브랜드 및 상품명의 공백 제거 후 소문자화)"""
+    clean_brand = re.sub(r'\s+', '', brand).lower()
+    clean_name = re.sub(r'\s+', '', product_name).lower()
+    return f"{clean_brand}_{clean_name}"
+
 # Firebase 초기화
 def initialize_firebase():
     """Firebase Admin SDK 초기화"""
@@ -118,9 +144,47 @@ def initialize_gemini():
     return genai.GenerativeModel('models/gemini-2.0-flash')
 
 
+def parse_amazon_search_image(html: str) -> str:
+    """Amazon 검색 결과 HTML에서 첫 번째 제품 이미지(고해상도) URL 추출"""
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # 보다 유연한 셀렉터 시도
+    selectors = [
+        'div[data-component-type="s-search-result"] img.s-image',
+        'img.s-image',
+        'img[src*="media-amazon.com/images/I/"]'
+    ]
+    
+    from urllib.parse import urlparse
+    for selector in selectors:
+        img_elems = soup.select(selector)
+        for img in img_elems:
+            src = img.get('src', '')
+            if src:
+                try:
+                    parsed_src = urlparse(src)
+                    # 호스트 이름을 정확히 체크하여 보안 취약점 해결
+                    is_amazon_host = parsed_src.netloc in [
+                        'images-na.ssl-images-amazon.com', 
+                        'm.media-amazon.com', 
+                        'images-amazon.com',
+                        'www.amazon.com'
+                    ]
+                    if is_amazon_host and 'gif' not in src:
+                        # 고해상도 이미지로 변환 (크기 옵션 제거)
+                        high_res_src = re.sub(r'\._AC_.*?_\.', '.', src)
+                        return high_res_src
+                except:
+                    continue
+    return ""
+
+
 async def get_amazon_image(query: str) -> str:
     """
     아마존 검색을 통해 제품 이미지 URL을 가져옵니다. (강화된 버전)
+    
+    공유 aiohttp 세션(keep-alive, 호스트별 연결 제한)으로 요청하므로
+    응답을 기다리는 동안 이벤트 루프의 다른 코루틴이 계속 실행됩니다.
     """
     api_key = os.getenv('WEBSCRAPING_AI_API_KEY')
     if not api_key:
@@ -138,38 +202,11 @@ async def get_amazon_image(query: str) -> str:
         }
         
         print(f"🔍 Amazon 이미지 검색 중: {query}")
-        response = requests.get('https://api.webscraping.ai/html', params=params, timeout=60)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 보다 유연한 셀렉터 시도
-            selectors = [
-                'div[data-component-type="s-search-result"] img.s-image',
-                'img.s-image',
-                'img[src*="media-amazon.com/images/I/"]'
-            ]
-            
-            from urllib.parse import urlparse
-            for selector in selectors:
-                img_elems = soup.select(selector)
-                for img in img_elems:
-                    src = img.get('src', '')
-                    if src:
-                        try:
-                            parsed_src = urlparse(src)
-                            # 호스트 이름을 정확히 체크하여 보안 취약점 해결
-                            is_amazon_host = parsed_src.netloc in [
-                                'images-na.ssl-images-amazon.com', 
-                                'm.media-amazon.com', 
-                                'images-amazon.com',
-                                'www.amazon.com'
-                            ]
-                            if is_amazon_host and 'gif' not in src:
-                                # 고해상도 이미지로 변환 (크기 옵션 제거)
-                                high_res_src = re.sub(r'\._AC_.*?_\.', '.', src)
-                                return high_res_src
-                        except:
-                            continue
+        session = get_http_session()
+        async with session.get(WEBSCRAPING_AI_URL, params=params, timeout=aiohttp.ClientTimeout(total=60)) as response:
+            if response.status == 200:
+                html = await response.text()
+                return parse_amazon_search_image(html)
                     
     except Exception as e:
         print(f"⚠️ Amazon 이미지 검색 오류 ({query}): {e}")
@@ -177,6 +214,31 @@ async def get_amazon_image(query: str) -> str:
     return ""
 
 
+async def get_amazon_images_batch(queries: List[str], concurrency: int = AMAZON_IMAGE_CONCURRENCY) -> Dict[str, str]:
+    """
+    여러 검색어의 Amazon 이미지를 동시에 조회합니다.
+    
+    Args:
+        queries: 검색어 리스트 (중복은 한 번만 요청)
+        concurrency: 동시에 진행할 최대 요청 수
+        
+    Returns:
+        {query: 이미지 URL} ('' 이면 실패)
+    """
+    unique_queries = list(dict.fromkeys(q for q in queries if q))
+    if not unique_queries:
+        return {}
+    
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    
+    async def fetch(query: str) -> str:
+        async with semaphore:
+            return await get_amazon_image(query)
+    
+    results = await asyncio.gather(*[fetch(q) for q in unique_queries])
+    return dict(zip(unique_queries, results))
+
+
 
 
 async def scrape_hwahae_global(url: str, max_items: int = 20) -> List[Dict[str, Any]]:
@@ -186,17 +248,10 @@ async def scrape_hwahae_global(url: str, max_items: int = 20) -> List[Dict[str,
     """
     products = []
     try:
-        async with async_playwright() as p:
+        # 실제 사용자의 브라우저처럼 보이기 위해 User-Agent 강화
+        user_agent = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36'
+        async with get_browser_pool().page(user_agent=user_agent, locale='en-US') as page:
             print(f"🌐 화해 글로벌 접속 중: {url}")
-            # 디버깅을 위해 일시적으로 headless=False 시도 가능 (필요시)
-            browser = await p.chromium.launch(headless=True)
-            # 실제 사용자의 브라우저처럼 보이기 위해 User-Agent 강화
-            user_agent = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36'
-            context = await browser.new_context(
-                user_agent=user_agent,
-                locale='en-US'
-            )
-            page = await context.new_page()
             
             await page.goto(url, wait_until='domcontentloaded', timeout=60000)
             print("⏳ 페이지 로드 완료, 대기 중...")
@@ -277,7 +332,6 @@ async def scrape_hwahae_global(url: str, max_items: int = 20) -> List[Dict[str,
                     print(f"⚠️  제품 {idx} 파싱 오류: {e}")
                     continue
             
-            await browser.close()
             print(f"✅ 총 {len(products)}개 제품 추출 완료")
                     
     except Exception as e:
@@ -289,29 +343,64 @@ async def fetch_hwahae_reviews(url: str, max_reviews: int = 5) -> List[str]:
     """제품 상세 페이지에서 한국어 리뷰를 수집합니다."""
     reviews = []
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(locale='ko-KR')
-            page = await context.new_page()
+        # 상품마다 브라우저를 띄우지 않고 공유 풀에서 페이지만 빌림
+        async with get_browser_pool().page(locale='ko-KR') as page:
+            # 리뷰 탭으로 직접 이동 시도 또는 클릭 (networkidle 대신 DOM 로드 후 리뷰 셀렉터만 대기)
+            await page.goto(url, wait_until='domcontentloaded', timeout=30000)
             
-            # 리뷰 탭으로 직접 이동 시도 또는 클릭
-            await page.goto(url, wait_until='networkidle', timeout=30000)
-            
-            # 리뷰 섹션 로드 대기
+            # 리뷰 섹션 로드 대기 (지연 로딩 트리거용 스크롤)
             await page.evaluate("window.scrollTo(0, 1000)")
-            await asyncio.sleep(1)
+            try:
+                await page.wait_for_selector(HWAHAE_REVIEW_SELECTOR, timeout=10000)
+            except Exception:
+                pass
             
             content = await page.content()
             soup = BeautifulSoup(content, 'html.parser')
             
             # 리뷰 텍스트 셀렉터 (분석 결과 기반)
-            review_elems = soup.select('div._review_text_1k2l9_1')[:max_reviews]
+            review_elems = soup.select(HWAHAE_REVIEW_SELECTOR)[:max_reviews]
             reviews = [r.get_text(strip=True) for r in review_elems]
-            
-            await browser.close()
     except Exception as e:
         print(f"⚠️  리뷰 수집 오류 ({url}): {e}")
     return reviews
+
+async def fetch_hwahae_reviews_batch(products: List[Dict[str, Any]], max_reviews: int = 5, concurrency: Optional[int] = HWAHAE_REVIEW_CONCURRENCY) -> Dict[str, List[str]]:
+    """
+    제품 리스트 전체의 상세 페이지 리뷰를 하나의 공유 브라우저에서 동시에 수집합니다.
+    
+    Beauty 자동 크롤링(scrape_hwahae_global → 리뷰 → summarize_reviews_batch)은 중단되어
+    현재 호출하는 곳이 없습니다. 크롤링을 다시 켤 때 리뷰 단계로 사용합니다.
+    
+    Args:
+        products: 'detailUrl' 필드를 가진 제품 리스트 (중복 URL은 한 번만 요청)
+        max_reviews: 제품당 최대 리뷰 수
+        concurrency: 동시에 열 상세 페이지 수 (None이면 브라우저 풀 한도, 풀 한도를 넘지 않음)
+        
+    Returns:
+        {detailUrl: reviews} 딕셔너리 (summarize_reviews_batch 전에 p['rawReviews']로 연결)
+    """
+    urls = list(dict.fromkeys(p['detailUrl'] for p in products if p.get('detailUrl')))
+    if not urls:
+        return {}
+    
+    # 풀이 아직 없으면 요청한 동시성으로 생성, 이미 있으면 풀의 페이지 한도에 맞춤
+    pool = get_browser_pool(max_pages=concurrency)
+    concurrency = min(concurrency or pool.max_pages, pool.max_pages)
+    print(f"\n💬 화해 리뷰 일괄 수집 중... ({len(urls)}개 상세 페이지, 동시 {concurrency})")
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def fetch_one(url: str) -> List[str]:
+        async with semaphore:
+            return await fetch_hwahae_reviews(url, max_reviews)
+    
+    results = await asyncio.gather(*[fetch_one(url) for url in urls])
+    reviews_by_url = dict(zip(urls, results))
+    
+    collected = sum(1 for reviews in results if reviews)
+    print(f"✅ 리뷰 수집 완료: {collected}/{len(urls)}개 제품 ({time.perf_counter() - started:.1f}초)")
+    return reviews_by_url
 async def calculate_trends(db, category_key: str, current_products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     이전 날짜 랭킹과 비교하여 트렌드 계산
@@ -346,42 +435,28 @@ async def calculate_trends(db, category_key: str, current_products: List[Dict[st
             # 어제 데이터 없으면 트렌드 0
             for product in current_products:
                 product['trend'] = 0
-            return current_products
+            return apply_rank_history(firestore_category, current_products)
         
         yesterday_items = doc.to_dict().get('items', [])
         print(f"✅ 어제 데이터 {len(yesterday_items)}개 발견")
         
-        # 제품명으로 매칭하여 순위 변동 계산
+        # 제품 퍼지 매칭 (브랜드 블로킹 + 토큰 역색인 + 유사도 행렬 + 최적 1:1 할당)
+        matches = match_products(current_products, yesterday_items)
+        
         trend_changes = []
         matched_count = 0
         new_count = 0
         
-        for current_item in current_products:
+        for index, current_item in enumerate(current_products):
             current_rank = current_item['rank']
             product_name = current_item['productName']
-            brand = current_item.get('brand', '')
             
-            # 1차: 제품명으로 정확히 매칭
             yesterday_rank = None
-            for old_item in yesterday_items:
-                if old_item.get('productName') == product_name:
-                    yesterday_rank = old_item.get('rank')
-                    break
-            
-            # 2차: 제품명이 매칭 안되면 브랜드 + 순위 범위로 보조 매칭
-            if yesterday_rank is None and brand:
-                for old_item in yesterday_items:
-                    # 브랜드가 같고 순위 차이가 ±3 이내
-                    if (old_item.get('brand') == brand and 
-                        abs(old_item.get('rank', 999) - current_rank) <= 3):
-                        # 제품명 일부 유사성 체크 (간단한 단어 매칭)
-                        old_name_words = set(old_item.get('productName', '').lower().split())
-                        new_name_words = set(product_name.lower().split())
-                        common_words = old_name_words & new_name_words
-                        if len(common_words) >= 2:  # 2개 이상 단어 일치
-                            yesterday_rank = old_item.get('rank')
-                            print(f"  🔍 보조 매칭: {product_name[:30]}... (rank {current_rank} ≈ {yesterday_rank})")
-                            break
+            if index in matches:
+                old_index, score = matches[index]
+                yesterday_rank = yesterday_items[old_index].get('rank')
+                if score < 1.0:
+                    print(f"  🔍 유사 매칭: {product_name[:30]}... ≈ {yesterday_items[old_index].get('productName', '')[:30]}... (유사도 {score:.2f})")
             
             if yesterday_rank:
                 # 트렌드 = 어제 순위 - 오늘 순위 (양수면 상승)
@@ -406,7 +481,8 @@ async def calculate_trends(db, category_key: str, current_products: List[Dict[st
         
         print(f"📊 매칭 결과: 기존 {matched_count}개, 신규 {new_count}개")
         
-        return current_products
+        # 순위 이력 기반 모멘텀 지표 (trend 옆 필드)
+        return apply_rank_history(firestore_category, current_products)
         
     except Exception as e:
         print(f"⚠️  트렌드 계산 오류: {e}")
@@ -445,28 +521,6 @@ def auto_romanize_korean(text: str) -> str:
         return text
 
 
-def normalize_product_name(name: str) -> str:
-    """
-    제품명에서 불필요한 키워드 제거
-    
-    Args:
-        name: 원본 제품명
-        
-    Returns:
-        정규화된 제품명
-    """
-    # [기획], [단품], (증정) 등 제거
-    name = re.sub(r'\[.*?\]', '', name)
-    # 괄호 안 내용 제거 (일부만)
-    name = re.sub(r'\([^)]*기획[^)]*\)', '', name)
-    name = re.sub(r'\([^)]*증정[^)]*\)', '', name)
-    # +로 시작하는 부분 제거
-    name = re.sub(r'\+.*$', '', name)
-    # 여러 공백을 하나로
-    name = re.sub(r'\s+', ' ', name)
-    
-    return name.strip()
-
 def translate_brand_names(products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     브랜드명을 영어로 변환 (매핑 + 자동 romanization 하이브리드)
@@ -511,31 +565,17 @@ def translate_brand_names(products: List[Dict[str, Any]]) -> List[Dict[str, Any]
     
     return products
 
-def calculate_nik_index(hwahae_rank: int, glowpick_rank: int = None, sns_hype_score: float = None) -> float:
+def calculate_nik_index(hwahae_rank: int, glowpick_rank: int = None, sns_hype_score: float = None,
+                        identity: str = None) -> float:
     """
     NIK Beauty Index 산출 (멀티 소스 가중치 전략)
     Final Score = (Hwahae_Pts * 0.4) + (Glowpick_Pts * 0.4) + (Viral_Pts * 0.2)
     역순 점수제: 1위 = 100점, 2위 = 99점...
-    """
-    # 1. 역순 점수 변환 (최대 100점 기준)
-    hwahae_pts = max(0, 101 - hwahae_rank)
-    
-    # 글로우픽 및 SNS 데이터가 없을 경우 화해 점수를 기반으로 상관관계 예측 (폴백)
-    if glowpick_rank is None:
-        # 화해 순위와 유사하되 약간의 변동성 부여
-        glowpick_rank = max(1, hwahae_rank + random.randint(-2, 2))
-    
-    glowpick_pts = max(0, 101 - glowpick_rank)
-    
-    if sns_hype_score is None:
-        # 1-100 scale로 변환
-        sns_hype_score = max(70, hwahae_pts + random.randint(-5, 5))
-        sns_hype_score = min(100, sns_hype_score)
 
-    # 2. 가중치 적용
-    final_score = (hwahae_pts * 0.4) + (glowpick_pts * 0.4) + (sns_hype_score * 0.2)
-    
-    return round(final_score, 1)
+    단건 호출용 래퍼 - 여러 제품은 nik_index.calculate_nik_indices로 한 번에 계산
+    """
+    return float(calculate_nik_indices([hwahae_rank], [glowpick_rank], [sns_hype_score],
+                                       [identity or str(hwahae_rank)])[0])
 
 # 이전 translate_to_english 함수는 위의 translate_brand_names로 대체됨
 
@@ -552,8 +592,14 @@ async def translate_product_names_batch(model, products: List[Dict[str, Any]]) -
     """
     print("\n🌐 Gemini AI로 제품명 일괄 번역 중...")
     
-    # 캐시 로드
-    cache = load_cache()
+    # 제품 ID 부여 (한글명 기준 정규 지문) 후 캐시 조회 - ID 키 우선, 기존 정규화 키는 폴백
+    registry = get_product_registry()
+    for p in products:
+        p.setdefault('productId', registry.resolve(p['brand'], p.get('productNameKo', p['productName'])))
+    cache_store = get_gemini_cache()
+    cache = cache_store.get_many(
+        key for p in products for key in (p['productId'], translation_cache_key(p['brand'], p['productName']))
+    )
     
     # 번역이 필요한 제품 필터링
     to_translate = []
@@ -563,10 +609,9 @@ async def translate_product_names_batch(model, products: List[Dict[str, Any]]) -
         if 'productNameKo' not in p:
             p['productNameKo'] = p['productName']
             
-        # 캐시 키 정규화 (브랜드 및 상품명의 공백 제거 후 소문자화)
-        clean_brand = re.sub(r'\s+', '', p['brand']).lower()
-        clean_name = re.sub(r'\s+', '', p['productName']).lower()
-        cache_key = f"{clean_brand}_{clean_name}"
+        cache_key = p['productId']
+        if 'translatedName' not in cache.get(cache_key, {}):
+            cache_key = translation_cache_key(p['brand'], p['productName'])
         
         if cache_key in cache and 'translatedName' in cache[cache_key]:
             data = cache[cache_key]
@@ -584,14 +629,13 @@ async def translate_product_names_batch(model, products: List[Dict[str, Any]]) -
         print("✅ 모든 제품이 캐시에 존재합니다.")
         return products
 
-    # Gemini 호출 제한 (Free Tier RPM)
-    if not DEV_MODE:
-        time.sleep(4)
-
-    # 제품명 리스트 생성
-    product_names = [f"{p['rank']}. {p['productName']}" for p in to_translate]
+    # 제품명 한 줄 (토큰 예산 기반 청크 분할에도 사용)
+    def render_product(p):
+        return f"{p['rank']}. {p['productName']}"
     
-    prompt = f"""
+    def build_prompt(chunk):
+        product_names = [render_product(p) for p in chunk]
+        return f"""
 Translate the following Korean beauty product names into English.
 Keep brand names as they are (already in English).
 Focus on translating the product description/name part accurately.
@@ -631,23 +675,33 @@ JSON only. Use professional beauty industry terminology.
 """
     
     try:
-        response = model.generate_content(prompt)
-        result_text = response.text.strip()
-        
-        # JSON 파싱 (마크다운 코드 블록 제거)
-        if result_text.startswith('```'):
-            result_text = result_text.split('```')[1]
-            if result_text.startswith('json'):
-                result_text = result_text[4:]
-        
-        translations = json.loads(result_text)
+        # 토큰 예산 단위 청크를 동시에 요청 (RPM/TPM은 논블로킹 토큰 버킷으로 제한)
+        entries = await get_llm_engine(model).run(
+            to_translate, render_product, build_prompt, 'translations', label='제품명 번역'
+        )
+        translations = {'translations': entries}
         
         # 번역 및 AI 데이터 적용
         translated_count = 0
-        updated_cache = False
+        cache_updates = {}
         
         if translations and len(translations.get('translations', [])) > 0:
-            for entry in translations.get('translations', []):
+            entries = translations.get('translations', [])
+            # AI가 nikIndex를 주지 않은 항목용 로컬 점수를 한 번에 계산 (제품 ID 시드 → 실행마다 같은 값)
+            product_by_rank = {}
+            for i in success_indices:
+                product_by_rank.setdefault(products[i]['rank'], products[i])
+            entry_products = [product_by_rank.get(entry.get('rank')) for entry in entries]
+            scored = [(entry, p) for entry, p in zip(entries, entry_products) if p is not None]
+            local_nik = calculate_nik_indices(
+                [p['rank'] for _, p in scored],
+                [entry.get('glowpickRank') for entry, _ in scored],
+                [entry.get('snsHypeScore') for entry, _ in scored],
+                [p['productId'] for _, p in scored]
+            )
+            local_nik_by_entry = {id(entry): float(score) for (entry, _), score in zip(scored, local_nik)}
+
+            for entry in entries:
                 rank = entry.get('rank')
                 # 해당 rank를 가진 제품 찾기
                 for i, p in enumerate(products):
@@ -656,11 +710,7 @@ JSON only. Use professional beauty industry terminology.
                         # AI가 계산한 값을 우선하되, 없으면 로컬 로직으로 보강
                         nik_index = entry.get('nikIndex')
                         if nik_index is None:
-                            nik_index = calculate_nik_index(
-                                p['rank'], 
-                                entry.get('glowpickRank'), 
-                                entry.get('snsHypeScore')
-                            )
+                            nik_index = local_nik_by_entry[id(entry)]
                         
                         cultural_context = entry.get('culturalContext', "")
                         image_query = entry.get('imageQuery', "")
@@ -678,24 +728,22 @@ JSON only. Use professional beauty industry terminology.
                         if image_query:
                             p['buyUrl'] = f"https://www.amazon.com/s?k={image_query.replace(' ', '+')}&tag={os.getenv('NEXT_PUBLIC_AMAZON_AFFILIATE_ID', 'nextidealab-20')}"
                         
-                        # 캐시 저장 - 정규화된 키 사용
-                        clean_brand = re.sub(r'\s+', '', p['brand']).lower()
-                        clean_name = re.sub(r'\s+', '', p.get('productNameKo', p['productName'])).lower()
-                        cache_key = f"{clean_brand}_{clean_name}"
+                        # 캐시 저장 - 제품 ID 키 사용, 영문명은 같은 ID의 별칭으로 등록
+                        registry.add_alias(p['productId'], p['brand'], p['productName'])
                         
-                        cache[cache_key] = {
+                        cache_updates[p['productId']] = {
                             'translatedName': p['productName'],
                             'nikIndex': p['nikIndex'],
                             'culturalContext': p['culturalContext'],
                             'buyUrl': p.get('buyUrl', ""),
                             'updatedAt': datetime.now().isoformat()
                         }
-                        updated_cache = True
                         translated_count += 1
                         break
         
-        if updated_cache:
-            save_cache(cache)
+        # 변경된 항목만 upsert
+        if cache_updates:
+            cache_store.upsert_many(cache_updates)
             
         print(f"✅ 제품명 번역 완료 ({translated_count}/{len(to_translate)}개)")
         
@@ -745,8 +793,7 @@ async def summarize_reviews_batch(model, products: List[Dict[str, Any]]) -> List
     """
     
     try:
-        response = await model.generate_content_async(prompt)
-        result_text = response.text.strip()
+        result_text = (await cached_generate(model, prompt, validate=parse_json_response)).strip()
         
         if result_text.startswith('```'):
             result_text = result_text.split('```')[1]
@@ -784,14 +831,22 @@ async def generate_tags(model, products: List[Dict[str, Any]], category: str = '
     """
     print("\n🏷️  Gemini AI로 제품 태그 자동 생성 중...")
     
-    # 캐시 로드
-    cache = load_cache()
+    # 캐시 조회 (이번 제품들의 키만 인덱스로 조회)
+    registry = get_product_registry()
+    for p in products:
+        p.setdefault('productId', registry.resolve(p['brand'], p.get('productNameKo', p['productName'])))
+    cache_store = get_gemini_cache()
+    cache = cache_store.get_many(
+        key for p in products for key in (p['productId'], f"{p['brand']}_{p['productName']}")
+    )
     
     # 태그 생성이 필요한 제품 필터링
     to_tag = []
     success_indices = [] # products 리스트에서의 인덱스를 저장
     for i, p in enumerate(products):
-        cache_key = f"{p['brand']}_{p['productName']}"
+        cache_key = p['productId']
+        if not cache.get(cache_key, {}).get('tags'):
+            cache_key = f"{p['brand']}_{p['productName']}"
         if cache_key in cache and 'tags' in cache[cache_key] and cache[cache_key]['tags']:
             p['tags'] = cache[cache_key]['tags']
             print(f"  🏷️ 캐시 사용: {p['productName']} (Tags: {', '.join(p['tags'])})")
@@ -803,14 +858,13 @@ async def generate_tags(model, products: List[Dict[str, Any]], category: str = '
         print("✅ 모든 제품 태그가 캐시에 존재합니다.")
         return products
 
-    # Gemini 호출 제한 (Free Tier RPM)
-    if not DEV_MODE:
-        time.sleep(4)
-
-    # 제품 이름 리스트 생성 (영어 번역된 이름 사용)
-    product_info = [f"{p['rank']}. {p['brand']} - {p.get('productNameEn', p['productName'])}" for p in to_tag]
+    # 제품 이름 한 줄 (영어 번역된 이름 사용, 토큰 예산 기반 청크 분할에도 사용)
+    def render_product(p):
+        return f"{p['rank']}. {p['brand']} - {p.get('productNameEn', p['productName'])}"
     
-    prompt = f"""
+    def build_prompt(chunk):
+        product_info = [render_product(p) for p in chunk]
+        return f"""
 Analyze each beauty product and generate 2-3 unique, relevant tags based on the product's actual characteristics.
 
 IMPORTANT: Each product must have DIFFERENT tags based on its name and brand.
@@ -833,7 +887,7 @@ Products:
 Response format (JSON):
 {{
   "tags": [
-    {{"rank": {to_tag[0]['rank'] if to_tag else 1}, "tags": ["Hydrating Toner", "Hyaluronic Acid", "Moisture"]}},
+    {{"rank": {chunk[0]['rank'] if chunk else 1}, "tags": ["Hydrating Toner", "Hyaluronic Acid", "Moisture"]}},
     ...
   ]
 }}
@@ -842,19 +896,14 @@ JSON only. Make sure each product has DIFFERENT tags that reflect its actual cha
 """
     
     try:
-        response = await model.generate_content_async(prompt)
-        result_text = response.text.strip()
-        
-        # JSON 파싱
-        if result_text.startswith('```'):
-            result_text = result_text.split('```')[1]
-            if result_text.startswith('json'):
-                result_text = result_text[4:]
-        
-        tag_data = json.loads(result_text)
+        # 토큰 예산 단위 청크를 동시에 요청 (RPM/TPM은 논블로킹 토큰 버킷으로 제한)
+        entries = await get_llm_engine(model).run(
+            to_tag, render_product, build_prompt, 'tags', label='태그 생성'
+        )
+        tag_data = {'tags': entries}
         
         # 제품에 태그 적용
-        updated_cache = False
+        cache_updates = {}
         tag_count = 0
         if tag_data and len(tag_data.get('tags', [])) > 0:
             for item in tag_data.get('tags', []):
@@ -870,17 +919,14 @@ JSON only. Make sure each product has DIFFERENT tags that reflect its actual cha
 
                         p['tags'] = tags
                         
-                        # 캐시 업데이트 - 한글명(productNameKo)을 키로 사용
-                        cache_key = f"{p['brand']}_{p.get('productNameKo', p['productName'])}"
-                        if cache_key not in cache:
-                            cache[cache_key] = {}
-                        cache[cache_key]['tags'] = p['tags']
-                        updated_cache = True
+                        # 캐시 업데이트 - 번역 결과와 같은 제품 ID 항목에 기록
+                        cache_updates[p['productId']] = {'tags': p['tags']}
                         tag_count += 1
                         break
         
-        if updated_cache:
-            save_cache(cache)
+        # 변경된 항목만 upsert (기존 번역 필드는 유지)
+        if cache_updates:
+            cache_store.upsert_many(cache_updates)
             
         print(f"✅ 태그 생성 완료 ({tag_count}/{len(to_tag)}개)")
         
@@ -911,19 +957,15 @@ async def scrape_netflix(media_type: str = 'tv', max_items: int = 10, max_retrie
     
     for attempt in range(max_retries):
         try:
-            async with async_playwright() as p:
+            # 재시도 시에도 브라우저는 재실행하지 않고 공유 풀에서 페이지만 새로 빌림
+            async with get_browser_pool().page(
+                user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
+                viewport={'width': 1920, 'height': 1080},
+                locale='ko-KR',
+                timezone_id='Asia/Seoul'
+            ) as page:
                 print(f"🎬 Netflix Top 10 크롤링 시작... (시도 {attempt + 1}/{max_retries})")
                 
-                browser = await p.chromium.launch(headless=True)
-                context = await browser.new_context(
-                    user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-                    viewport={'width': 1920, 'height': 1080},
-                    locale='ko-KR',
-                    timezone_id='Asia/Seoul'
-                )
-                
-                page = await context.new_page()
-                
                 # Netflix Top 10 URL (tv 또는 films)
                 url = f"https://top10.netflix.com/south-korea/{media_type}"
                 print(f"📄 페이지 로딩 중: {url}")
@@ -948,7 +990,6 @@ async def scrape_netflix(media_type: str = 'tv', max_items: int = 10, max_retrie
                 
                 if len(rows) == 0:
                     print(f"⚠️ 데이터를 찾지 못함 (시도 {attempt + 1}/{max_retries})")
-                    await browser.close()
                     if attempt < max_retries - 1:
                         await asyncio.sleep(5)
                         continue
@@ -998,7 +1039,6 @@ async def scrape_netflix(media_type: str = 'tv', max_items: int = 10, max_retrie
                         print(f"⚠️ {i}위 파싱 오류: {e}")
                         continue
                 
-                await browser.close()
                 print("✅ Netflix 크롤링 성공!")
                 break
                 
@@ -1042,8 +1082,7 @@ Response format (JSON):
 JSON only.
 """
     try:
-        response = model.generate_content(prompt)
-        result_text = response.text.strip()
+        result_text = (await cached_generate(model, prompt, validate=parse_json_response)).strip()
         
         # JSON 파싱 (마크다운 코드 블록 제거)
         if result_text.startswith('```'):
@@ -1183,7 +1222,11 @@ def save_to_firebase(db, category_key: str, products: List[Dict[str, Any]]):
         print(json.dumps(preview_data, ensure_ascii=False, indent=2)[:1000] + "...")
         return
 
-    doc_ref.set(data)
+    # 내용 해시가 같으면 쓰기 생략, 일부 필드만 바뀌었으면 해당 필드만 업데이트
+    action = write_document(doc_ref, data)
+    if action == 'skip':
+        print(describe_write(action, doc_id))
+        return
     
     print(f"✅ {len(products)}개 제품을 {doc_id} 문서에 저장 완료")
     print(f"📁 컬렉션: daily_rankings")
@@ -1252,6 +1295,7 @@ async def main():
                 
                 # 트렌드 계산 (번역 후 실행하여 영어/한국어 제목으로 매칭)
                 all_media_items = await calculate_media_trends(db, all_media_items)
+                all_media_items = apply_rank_history('media', all_media_items)
                 
                 # Media 저장 로직
                 today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
@@ -1266,8 +1310,11 @@ async def main():
                 }
                 
                 if WRITE_TO_FIRESTORE:
-                    doc_ref.set(data)
-                    print(f"✅ {len(all_media_items)}개 타이틀을 {doc_id} 문서에 저장 완료")
+                    # 내용 해시가 같으면 쓰기 생략, 일부 필드만 바뀌었으면 해당 필드만 업데이트
+                    if write_document(doc_ref, data) == 'skip':
+                        print(describe_write('skip', doc_id))
+                    else:
+                        print(f"✅ {len(all_media_items)}개 타이틀을 {doc_id} 문서에 저장 완료")
                 else:
                     print(f"🧪 [DEV_MODE] Firebase Media 저장 스킵 ({len(all_media_items)}개)")
                 print(f"   - TV Shows: {len(tv_items)}개")
@@ -1284,6 +1331,7 @@ async def main():
         print(f"\n📊 크롤링 결과:")
         print(f"  - 총 아이템 수: {total_products}개")
         print(f"  - 실행 모드: {run_mode.upper()}")
+        print(f"  - Gemini 응답 캐시: {get_response_cache().summary()}")
 
         # 데이터 검증: 수집된 데이터가 하나도 없으면 실패로 간주
         if total_products == 0:
@@ -1296,6 +1344,13 @@ async def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        save_response_cache()
+        save_write_manifest()
+        save_product_registry()
+        close_gemini_cache()
+        await close_browser_pool()
+        await close_http_session()
 
 if __name__ == "__main__":
     # 사용법:
@@ -0,0 +1,98 @@
+"""
+Firestore 배치 청크 커밋 테스트 (Firestore 대역 사용, 네트워크 불필요)
+
+실행: python scripts/test_firestore_batch.py  또는  pytest scripts/test_firestore_batch.py
+"""
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(script_dir)
+from firestore_batch import FIRESTORE_BATCH_LIMIT, chunk_writes, commit_documents
+
+
+class FakeDocRef:
+    def __init__(self, path):
+        self.path = path
+
+
+class FakeBatch:
+    def __init__(self, db):
+        self.db = db
+        self.ops = []
+
+    def set(self, ref, data):
+        self.ops.append(ref.path)
+
+    def update(self, ref, data):
+        self.ops.append(ref.path)
+
+    def commit(self):
+        if len(self.ops) > FIRESTORE_BATCH_LIMIT:
+            raise ValueError(f"maximum {FIRESTORE_BATCH_LIMIT} writes allowed per batch")
+        if self.db.fail_on is not None and len(self.db.committed) == self.db.fail_on:
+            raise RuntimeError('commit failed')
+        with self.db.lock:
+            self.db.committed.append(list(self.ops))
+
+
+class FakeDB:
+    """커밋된 배치별 문서 경로를 기록 (fail_on번째 커밋에서 실패)"""
+
+    def __init__(self, fail_on=None):
+        self.committed = []
+        self.fail_on = fail_on
+        self.lock = threading.Lock()
+
+    def batch(self):
+        return FakeBatch(self)
+
+
+def make_writes(count):
+    return [(FakeDocRef(f'daily_rankings/{i}'), {'rank': i}) for i in range(count)]
+
+
+def test_chunk_writes():
+    assert [len(c) for c in chunk_writes(make_writes(1201))] == [500, 500, 201]
+    assert [len(c) for c in chunk_writes(make_writes(500))] == [500]
+    assert chunk_writes([]) == []
+
+
+def test_commit_in_batch_limit_chunks():
+    db = FakeDB()
+    assert asyncio.run(commit_documents(db, make_writes(1201), concurrent=False)) == 1201
+    assert [len(ops) for ops in db.committed] == [500, 500, 201]
+    assert [path for ops in db.committed for path in ops] == [f'daily_rankings/{i}' for i in range(1201)]
+
+
+def test_concurrent_commit_writes_every_document():
+    db = FakeDB()
+    asyncio.run(commit_documents(db, make_writes(1201), concurrent=True))
+    assert sorted(len(ops) for ops in db.committed) == [201, 500, 500]
+    assert len({path for ops in db.committed for path in ops}) == 1201
+
+
+def test_sequential_commit_stops_at_first_failure():
+    db = FakeDB(fail_on=1)
+    with pytest.raises(RuntimeError):
+        asyncio.run(commit_documents(db, make_writes(1201), concurrent=False))
+    assert [len(ops) for ops in db.committed] == [500]
+
+
+def test_no_writes():
+    db = FakeDB()
+    assert asyncio.run(commit_documents(db, [])) == 0
+    assert db.committed == []
+
+
+if __name__ == "__main__":
+    test_chunk_writes()
+    test_commit_in_batch_limit_chunks()
+    test_concurrent_commit_writes_every_document()
+    test_sequential_commit_stops_at_first_failure()
+    test_no_writes()
+    print("✅ Firestore 배치 커밋 테스트 통과")
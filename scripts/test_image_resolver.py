@@ -0,0 +1,55 @@
+"""
+이미지 리졸버 캐시 테스트 (네트워크 불필요)
+
+실행: python scripts/test_image_resolver.py  또는  pytest scripts/test_image_resolver.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(script_dir)
+from image_resolver import DAY_SECONDS, ImageResolver, normalize_image_query
+
+
+def make_resolver(lookup):
+    return ImageResolver(lookup, cache_file=os.path.join(tempfile.mkdtemp(), 'image_cache.json'))
+
+
+def test_lookup_errors_are_not_cached():
+    calls = []
+
+    async def failing_lookup(product_name, brand):
+        calls.append(product_name)
+        raise TimeoutError('navigation timeout')
+
+    resolver = make_resolver(failing_lookup)
+    assert asyncio.run(resolver.resolve('Anua', 'Heartleaf 77 Clear Pad')) == ''
+    assert resolver.get_cached(normalize_image_query('Anua', 'Heartleaf 77 Clear Pad')) is None
+    asyncio.run(resolver.resolve('Anua', 'Heartleaf 77 Clear Pad'))
+    assert len(calls) == 2
+
+
+def test_not_found_survives_weekly_rerun():
+    calls = []
+
+    async def empty_lookup(product_name, brand):
+        calls.append(product_name)
+        return ''
+
+    resolver = make_resolver(empty_lookup)
+    asyncio.run(resolver.resolve('Headley', 'Hair Pack'))
+    key = normalize_image_query('Headley', 'Hair Pack')
+    # 다음 주 실행 시점에도 실패 캐시가 유효해야 Amazon 재조회 없음
+    resolver.entries[key]['checkedAt'] = time.time() - 8 * DAY_SECONDS
+    asyncio.run(resolver.resolve('Headley', 'Hair Pack'))
+    assert len(calls) == 1
+    assert resolver.stats['negative_hits'] == 1
+
+
+if __name__ == "__main__":
+    test_lookup_errors_are_not_cached()
+    test_not_found_survives_weekly_rerun()
+    print("✅ 이미지 리졸버 테스트 통과")
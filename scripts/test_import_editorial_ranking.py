@@ -0,0 +1,100 @@
+"""
+에디토리얼 임포터 테스트 (실제 리포트 형식 기반, 네트워크/Firestore 불필요)
+
+실행: python scripts/test_import_editorial_ranking.py  또는  pytest scripts/test_import_editorial_ranking.py
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(script_dir)
+import import_editorial_ranking as importer
+from image_resolver import ImageResolver, SEED_RESULTS_FILE
+from key_matcher import KeyMatcher
+from product_registry import ProductRegistry
+
+
+class FakeUrlValidator:
+    async def validate_many(self, urls, network_error_valid=False):
+        return {url: True for url in urls}
+
+
+def load_report():
+    with open(importer.DATA_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def make_context(lookups):
+    """임시 캐시 파일과 조회 기록용 lookup으로 강화 컨텍스트 생성 (Gemini 캐시는 비움)"""
+    tmp_dir = tempfile.mkdtemp()
+
+    async def lookup(product_name, brand):
+        lookups.append((brand, product_name))
+        return ''
+
+    importer._cache_matcher = ({}, KeyMatcher([]))
+    return importer.EnrichmentContext(
+        image_resolver=ImageResolver(lookup, cache_file=os.path.join(tmp_dir, 'image_cache.json')),
+        url_validator=FakeUrlValidator(),
+        registry=ProductRegistry(cache_file=os.path.join(tmp_dir, 'product_registry.json')),
+    )
+
+
+def test_report_items_have_english_names_only():
+    items = [item for entry in load_report() for item in entry['items']]
+    assert items
+    assert all('name_en' in item and 'name' not in item for item in items)
+
+
+def test_manual_image_seeds_apply_to_english_report():
+    with open(SEED_RESULTS_FILE, 'r', encoding='utf-8') as f:
+        seed = json.load(f)
+    lookups = []
+    context = make_context(lookups)
+    items = [item for entry in load_report() for item in entry['items']]
+    asyncio.run(context.prepare(items))
+
+    seeded = {name_en for name_ko, name_en in importer.load_korean_aliases().items() if seed.get(name_ko)}
+    assert seeded
+    for name_en in seeded:
+        product_id = context.product_id(name_en)
+        assert context.amazon_image(product_id) == seed[context.korean_names[name_en]]
+    # 수동 수집 결과가 있는 제품은 Amazon 조회 없음
+    looked_up = {product_name for _, product_name in lookups}
+    assert looked_up and not looked_up & seeded
+    assert context.image_resolver.stats['seeded'] == len({context.products[context.product_id(n)]['imageKey'] for n in seeded})
+
+
+def test_trend_matches_korean_previous_report():
+    context = make_context([])
+    prev_rank_map = importer.load_previous_rank_map(importer.PREVIOUS_DATA_FILE, context.registry)
+    entry = next(e for e in load_report() if e['category'] == 'all')
+    products = asyncio.run(importer.enrich_editorial_data(None, 'all', entry['items'], prev_rank_map['all'], context))
+    trends = {p['original_raw']: p['trend'] for p in products}
+    # 이전 리포트 5위 '아누아 PDRN 캡슐 세럼' → 현재 1위
+    assert trends['Anua PDRN Hyaluronic Acid Capsule Serum'] == 4
+    # 이전 리포트 1위 '토리든 다이브인 세럼' → 현재 4위
+    assert trends['Torriden Dive-In Low Molecular Hyaluronic Acid Serum'] == -3
+
+
+def test_nik_index_from_editorial_ranks():
+    context = make_context([])
+    prev_rank_map = importer.load_previous_rank_map(importer.PREVIOUS_DATA_FILE, context.registry)
+    entry = next(e for e in load_report() if e['category'] == 'all')
+    products = asyncio.run(importer.enrich_editorial_data(None, 'all', entry['items'], prev_rank_map['all'], context))
+    nik = {p['original_raw']: p['nikIndex'] for p in products}
+    # 현재 1위(100점) * 0.8 + 이전 5위(96점) * 0.2
+    assert nik['Anua PDRN Hyaluronic Acid Capsule Serum'] == 99.2
+    # 이전 리포트에 없는 제품은 현재 순위만으로 재정규화 (6위 → 95점)
+    assert nik['Biodance Bio-Collagen Real Deep Mask'] == 95.0
+
+
+if __name__ == "__main__":
+    test_report_items_have_english_names_only()
+    test_manual_image_seeds_apply_to_english_report()
+    test_trend_matches_korean_previous_report()
+    test_nik_index_from_editorial_ranks()
+    print("✅ 에디토리얼 임포터 테스트 통과")
@@ -0,0 +1,67 @@
+"""
+Aho-Corasick 키 매칭기 테스트 (부분 문자열 전수 탐색과 비교)
+
+실행: python scripts/test_key_matcher.py  또는  pytest scripts/test_key_matcher.py
+"""
+import os
+import random
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(script_dir)
+from key_matcher import KeyMatcher
+
+
+def brute_force_longest(keys, *texts):
+    """기존 방식: 모든 키를 순서대로 `key in text`로 확인 (같은 길이면 먼저 나타난 키)"""
+    found = None
+    for text in texts:
+        if not text:
+            continue
+        for end in range(1, len(text) + 1):
+            for key in keys:
+                if key and text[:end].endswith(key) and (found is None or len(key) > len(found)):
+                    found = key
+    return found
+
+
+def test_longest_key_wins():
+    matcher = KeyMatcher(['토리든', '토리든 다이브인', '다이브인 세럼', '세럼'])
+    assert matcher.longest_match('토리든 다이브인 세럼 50ml') == '토리든 다이브인'
+    assert matcher.longest_match('아누아 세럼') == '세럼'
+    assert matcher.longest_match('라운드랩 선크림') is None
+    assert len(matcher) == 4
+
+
+def test_searches_every_text():
+    matcher = KeyMatcher(['anua_heartleaf', '어성초'])
+    assert matcher.longest_match('Anua Heartleaf Toner', '아누아 어성초 토너') == '어성초'
+    assert matcher.longest_match('', None, 'x anua_heartleaf') == 'anua_heartleaf'
+
+
+def test_overlapping_suffix_keys():
+    # 실패 링크를 따라가야만 찾을 수 있는 접미사 키
+    matcher = KeyMatcher(['abcd', 'bcx', 'cx'])
+    assert matcher.longest_match('abcx') == 'bcx'
+    assert matcher.longest_match('zzcx') == 'cx'
+
+
+def test_matches_brute_force():
+    rng = random.Random(7)
+    alphabet = 'abc가나 '
+    for _ in range(300):
+        keys = [''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 8))]
+        texts = [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 12))) for _ in range(2)]
+        found = KeyMatcher(keys).longest_match(*texts)
+        expected = brute_force_longest(keys, *texts)
+        assert (found is None) == (expected is None), (keys, texts)
+        if found is not None:
+            assert len(found) == len(expected) and any(found in t for t in texts if t), (keys, texts)
+
+
+if __name__ == "__main__":
+    test_longest_key_wins()
+    test_searches_every_text()
+    test_overlapping_suffix_keys()
+    test_matches_brute_force()
+    print("✅ 키 매칭기 테스트 통과")
@@ -0,0 +1,69 @@
+"""
+NIK 지수 일괄 계산 테스트 (기존 단건 calculate_nik_index 공식과 비교)
+
+실행: python scripts/test_nik_index.py  또는  pytest scripts/test_nik_index.py
+"""
+import os
+import sys
+
+import numpy as np
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(script_dir)
+from nik_index import EDITORIAL_SOURCE_WEIGHTS, calculate_nik_indices, nik_index_from_sources
+
+
+def baseline_nik_index(hwahae_rank, glowpick_rank, sns_hype_score):
+    """기존 scraper.calculate_nik_index (추정값 없이 세 소스가 모두 있을 때)"""
+    hwahae_pts = max(0, 101 - hwahae_rank)
+    glowpick_pts = max(0, 101 - glowpick_rank)
+    return round((hwahae_pts * 0.4) + (glowpick_pts * 0.4) + (sns_hype_score * 0.2), 1)
+
+
+def baseline_candidates(hwahae_rank):
+    """기존 공식이 random 노이즈(글로우픽 ±2, SNS ±5)로 낼 수 있는 모든 값"""
+    hwahae_pts = max(0, 101 - hwahae_rank)
+    return {
+        baseline_nik_index(hwahae_rank, max(1, hwahae_rank + g), min(100, max(70, hwahae_pts + s)))
+        for g in range(-2, 3) for s in range(-5, 6)
+    }
+
+
+def test_matches_baseline_with_all_sources():
+    rng = np.random.default_rng(3)
+    hwahae = rng.integers(1, 130, size=200)
+    glowpick = rng.integers(1, 130, size=200)
+    sns = rng.integers(0, 101, size=200).astype(float)
+    result = calculate_nik_indices(hwahae.tolist(), glowpick.tolist(), sns.tolist())
+    expected = [baseline_nik_index(h, g, s) for h, g, s in zip(hwahae, glowpick, sns)]
+    np.testing.assert_allclose(result, expected, atol=1e-9)
+
+
+def test_estimates_stay_within_baseline_noise():
+    hwahae = list(range(1, 121))
+    result = calculate_nik_indices(hwahae, identities=[f"p{r}" for r in hwahae])
+    for rank, value in zip(hwahae, result):
+        assert value in baseline_candidates(rank), (rank, value)
+
+
+def test_estimates_are_deterministic_per_identity():
+    first = calculate_nik_indices([1, 2, 3], [None, 5, None], None, identities=['a', 'b', 'c'])
+    again = calculate_nik_indices([1, 2, 3], [None, 5, None], None, identities=['a', 'b', 'c'])
+    np.testing.assert_array_equal(first, again)
+    # 순서가 바뀌어도 같은 제품이면 같은 점수
+    reordered = calculate_nik_indices([3, 1], [None, None], None, identities=['c', 'a'])
+    assert reordered.tolist() == [first[2], first[0]]
+
+
+def test_nik_index_from_sources_renormalizes():
+    nik = nik_index_from_sources({'editorial': {'a': 1, 'b': 6}, 'previous': {'a': 5}}, EDITORIAL_SOURCE_WEIGHTS)
+    assert round(nik['a'], 1) == 99.2
+    assert round(nik['b'], 1) == 95.0
+
+
+if __name__ == "__main__":
+    test_matches_baseline_with_all_sources()
+    test_estimates_stay_within_baseline_noise()
+    test_estimates_are_deterministic_per_identity()
+    test_nik_index_from_sources_renormalizes()
+    print("✅ NIK 지수 테스트 통과")
@@ -0,0 +1,77 @@
+"""
+제품 퍼지 매칭 테스트 (헝가리안 할당을 순열 전수 탐색과 비교)
+
+실행: python scripts/test_product_matcher.py  또는  pytest scripts/test_product_matcher.py
+"""
+import itertools
+import os
+import sys
+
+import numpy as np
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(script_dir)
+from product_matcher import match_products, optimal_assignment, product_tokens
+
+
+def brute_force_best(scores):
+    """행/열 중 작은 쪽을 큰 쪽의 모든 순열에 대응시켜 얻는 최대 점수 합"""
+    n_rows, n_cols = scores.shape
+    if n_rows <= n_cols:
+        return max(sum(scores[r, c] for r, c in zip(range(n_rows), cols))
+                   for cols in itertools.permutations(range(n_cols), n_rows))
+    return max(sum(scores[r, c] for r, c in zip(rows, range(n_cols)))
+               for rows in itertools.permutations(range(n_rows), n_cols))
+
+
+def test_optimal_assignment_matches_brute_force():
+    rng = np.random.default_rng(42)
+    for shape in [(1, 1), (3, 3), (4, 4), (5, 5), (2, 5), (5, 3), (6, 4)]:
+        for _ in range(20):
+            scores = rng.random(shape)
+            pairs = optimal_assignment(scores)
+            assert len(pairs) == min(shape)
+            assert len({r for r, _ in pairs}) == len(pairs) and len({c for _, c in pairs}) == len(pairs)
+            assert np.isclose(sum(scores[r, c] for r, c in pairs), brute_force_best(scores))
+
+
+def test_optimal_assignment_beats_greedy():
+    # 탐욕 매칭이면 (0,0)=0.9를 먼저 잡아 합 1.0, 최적은 0.8 + 0.8 = 1.6
+    scores = np.array([[0.9, 0.8], [0.8, 0.1]])
+    assert sorted(optimal_assignment(scores)) == [(0, 1), (1, 0)]
+    assert optimal_assignment(np.zeros((0, 3))) == []
+
+
+def test_product_tokens_strip_size_and_brackets():
+    assert product_tokens('Dive-In Serum 50ml [기획] (1+1)') == ['dive', 'in', 'serum']
+    assert product_tokens('77 Clear Pad 70매') == ['77', 'clear', 'pad']
+
+
+def test_match_products():
+    previous = [
+        {'brand': 'Torriden', 'productName': 'Dive-In Low Molecular Hyaluronic Acid Serum 50ml'},
+        {'brand': 'Anua', 'productName': 'Heartleaf 77 Soothing Toner 250ml'},
+        {'brand': 'Anua', 'productName': 'Heartleaf Quercetinol Pore Deep Cleansing Foam'},
+        {'brand': 'Round Lab', 'productName': 'Birch Juice Moisturizing Sunscreen', 'productId': 'p-roundlab'},
+    ]
+    current = [
+        {'brand': 'Round Lab', 'productName': 'Renamed Sunscreen', 'productId': 'p-roundlab'},
+        {'brand': 'ANUA', 'productName': 'Heartleaf 77% Soothing Toner Jumbo (Refill) 500ml'},
+        {'brand': 'Torriden', 'productName': 'Dive-In Low Molecular Hyaluronic Acid Serum 100ml'},
+        {'brand': 'Anua', 'productName': 'PDRN Hyaluronic Acid Capsule 100 Serum'},
+        {'brand': 'Biodance', 'productName': 'Heartleaf 77 Soothing Toner'},
+    ]
+    matches = match_products(current, previous)
+    assert matches[0] == (3, 1.0)          # 같은 productId
+    assert matches[2] == (0, 1.0)          # 용량만 다른 정확 일치
+    assert matches[1][0] == 1 and 0.5 <= matches[1][1] < 1.0
+    assert 3 not in matches                # 같은 브랜드지만 다른 제품
+    assert 4 not in matches                # 다른 브랜드 블록은 비교하지 않음
+
+
+if __name__ == "__main__":
+    test_optimal_assignment_matches_brute_force()
+    test_optimal_assignment_beats_greedy()
+    test_product_tokens_strip_size_and_brackets()
+    test_match_products()
+    print("✅ 제품 매칭 테스트 통과")
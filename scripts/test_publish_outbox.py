@@ -0,0 +1,104 @@
+"""
+발행 아웃박스 테스트 (임시 SQLite 파일과 Firestore 대역 사용, 네트워크 불필요)
+
+실행: python scripts/test_publish_outbox.py  또는  pytest scripts/test_publish_outbox.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(script_dir)
+from firebase_admin import firestore
+
+import write_manifest
+from publish_outbox import OutboxPublisher, PublishOutbox, publish_only
+from write_manifest import WriteManifest
+
+
+class FakeDocRef:
+    def __init__(self, db, path):
+        self.db = db
+        self.path = path
+
+    def set(self, data):
+        if self.db.down:
+            raise ConnectionError('Firestore unavailable')
+        self.db.docs[self.path] = dict(data)
+
+    def update(self, data):
+        self.set({**self.db.docs[self.path], **data})
+
+
+class FakeDB:
+    """down=True이면 모든 쓰기가 실패하는 Firestore 대역"""
+
+    def __init__(self, down=False):
+        self.docs = {}
+        self.down = down
+
+    def document(self, path):
+        return FakeDocRef(self, path)
+
+
+def make_outbox():
+    # 전역 쓰기 매니페스트도 임시 파일로 (실제 scripts/write_manifest.json 오염 방지)
+    tmp_dir = tempfile.mkdtemp()
+    write_manifest._manifest = WriteManifest(cache_file=os.path.join(tmp_dir, 'write_manifest.json'))
+    return PublishOutbox(os.path.join(tmp_dir, 'publish_outbox.sqlite3'))
+
+
+def publish(db, outbox, docs, max_attempts=2):
+    async def run():
+        publisher = OutboxPublisher(db, outbox, max_attempts=max_attempts, backoff=0).start(resume=False)
+        for path, data in docs:
+            publisher.submit(path, data)
+        return await publisher.close()
+    return asyncio.run(run())
+
+
+def test_enqueue_supersedes_older_pending():
+    outbox = make_outbox()
+    first = outbox.enqueue('daily_rankings/a', {'items': [1]})
+    other = outbox.enqueue('daily_rankings/b', {'items': [2]})
+    latest = outbox.enqueue('daily_rankings/a', {'items': [3]})
+    assert outbox.pending() == [other, latest]
+    assert outbox.load(first) is None
+    assert outbox.load(latest)['data'] == {'items': [3]}
+
+
+def test_server_timestamp_round_trip():
+    outbox = make_outbox()
+    entry_id = outbox.enqueue('daily_rankings/a', {'items': [1], 'updatedAt': firestore.SERVER_TIMESTAMP})
+    assert outbox.load(entry_id)['data']['updatedAt'] is firestore.SERVER_TIMESTAMP
+
+
+def test_failed_publish_stays_pending_and_resumes():
+    outbox = make_outbox()
+    db = FakeDB(down=True)
+    remaining = publish(db, outbox, [('daily_rankings/a', {'items': [1]}), ('daily_rankings/b', {'items': [2]})])
+    assert remaining == 2
+    assert [outbox.load(i)['attempts'] for i in outbox.pending()] == [2, 2]
+
+    # 다음 실행: --publish-only로 스크래핑 없이 재발행
+    db.down = False
+    assert asyncio.run(publish_only(db, outbox)) == 0
+    assert {path: doc['items'] for path, doc in db.docs.items()} == {'daily_rankings/a': [1], 'daily_rankings/b': [2]}
+    assert outbox.pending() == []
+
+
+def test_publish_writes_latest_version_only():
+    outbox = make_outbox()
+    db = FakeDB()
+    remaining = publish(db, outbox, [('daily_rankings/a', {'items': [1]}), ('daily_rankings/a', {'items': [2]})])
+    assert remaining == 0
+    assert {path: doc['items'] for path, doc in db.docs.items()} == {'daily_rankings/a': [2]}
+
+
+if __name__ == "__main__":
+    test_enqueue_supersedes_older_pending()
+    test_server_timestamp_round_trip()
+    test_failed_publish_stays_pending_and_resumes()
+    test_publish_writes_latest_version_only()
+    print("✅ 발행 아웃박스 테스트 통과")
@@ -0,0 +1,82 @@
+"""
+순위 이력 지표 테스트 (임시 디렉터리 사용)
+
+실행: python scripts/test_rank_history.py  또는  pytest scripts/test_rank_history.py
+"""
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+
+import numpy as np
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(script_dir)
+from rank_history import RankHistory, history_item_id
+
+
+def day(offset):
+    return (date(2026, 3, 10) + timedelta(days=offset)).isoformat()
+
+
+def make_history(max_days=120):
+    return RankHistory('beauty', directory=tempfile.mkdtemp(), max_days=max_days)
+
+
+def test_metrics():
+    history = make_history()
+    # 'a': 9~8일 전 10위, 7~1일 전 5위, 오늘 1위 / 'b': 오늘 처음 등장
+    a_ranks = {-9: 10, -8: 10, **{-d: 5 for d in range(1, 8)}}
+    for offset, rank in sorted(a_ranks.items()):
+        history.append_snapshot(day(offset), {'a': rank})
+    items = [{'productId': 'a', 'rank': 1}, {'productId': 'b', 'rank': 2}]
+    history.apply(items, day(0))
+    a, b = items
+
+    assert a['momentum7d'] == 4.0
+    assert a['momentum30d'] == round(55 / 9 - 1, 2)
+    assert a['volatility30d'] == round(float(np.std([10, 10] + [5] * 7 + [1])), 2)
+    assert a['bestRank'] == 1.0
+    expected_weeks = len({date.fromisoformat(day(o)).toordinal() // 7 for o in list(a_ranks) + [0]})
+    assert a['weeksOnChart'] == expected_weeks
+
+    assert b['momentum7d'] is None and b['momentum30d'] is None
+    assert b['volatility30d'] == 0.0
+    assert b['bestRank'] == 2.0
+    assert b['weeksOnChart'] == 1
+
+
+def test_same_day_overwrites_and_old_columns_expire():
+    history = make_history(max_days=30)
+    history.append_snapshot(day(-40), {'gone': 3})
+    history.append_snapshot(day(-1), {'a': 4})
+    history.append_snapshot(day(0), {'a': 9})
+    history.append_snapshot(day(0), {'a': 2})
+    assert history.dates == [day(-1), day(0)]
+    # 보관 기간 밖에만 기록이 있는 행은 제거
+    assert history.ids == ['a']
+    assert history.ranks[0].tolist() == [4.0, 2.0]
+
+
+def test_save_and_reload():
+    history = make_history()
+    history.append_snapshot(day(-1), {'a': 3, 'b': 1})
+    history.apply([{'productId': 'a', 'rank': 1}], day(0))
+
+    reloaded = RankHistory('beauty', directory=os.path.dirname(history.path))
+    assert reloaded.ids == history.ids
+    assert reloaded.dates == [day(-1), day(0)]
+    np.testing.assert_array_equal(np.asarray(reloaded.ranks), np.array([[3, 1], [1, np.nan]], dtype=np.float32))
+
+
+def test_history_item_id():
+    assert history_item_id({'productId': 'p1', 'titleEn': 'X'}) == 'p1'
+    assert history_item_id({'type': 'tv', 'titleEn': '  Squid   Game '}) == 'tv|squid game'
+
+
+if __name__ == "__main__":
+    test_metrics()
+    test_same_day_overwrites_and_old_columns_expire()
+    test_save_and_reload()
+    test_history_item_id()
+    print("✅ 순위 이력 테스트 통과")
@@ -0,0 +1,67 @@
+"""
+URL 일괄 검증기 테스트 (fetch_status 대역 사용, 네트워크 불필요)
+
+실행: python scripts/test_url_validator.py  또는  pytest scripts/test_url_validator.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(script_dir)
+from url_validator import UrlValidator
+
+
+class StubValidator(UrlValidator):
+    """URL → 고정 상태 코드 (0 = 네트워크 오류)"""
+
+    def __init__(self, statuses):
+        super().__init__(cache_file=os.path.join(tempfile.mkdtemp(), 'url_check_cache.json'))
+        self.statuses = statuses
+        self.fetched = []
+
+    async def fetch_status(self, url):
+        self.fetched.append(url)
+        return self.statuses[url]
+
+
+STATUSES = {
+    'https://cdn.example.com/ok.jpg': 200,
+    'https://cdn.example.com/missing.jpg': 404,
+    'https://cdn.example.com/timeout.jpg': 0,
+}
+
+
+def test_network_errors_are_invalid_by_default():
+    results = asyncio.run(StubValidator(STATUSES).validate_many(STATUSES))
+    assert results == {
+        'https://cdn.example.com/ok.jpg': True,
+        'https://cdn.example.com/missing.jpg': False,
+        'https://cdn.example.com/timeout.jpg': False,
+    }
+
+
+def test_network_errors_can_count_as_valid():
+    validator = StubValidator(STATUSES)
+    results = asyncio.run(validator.validate_many(STATUSES, network_error_valid=True))
+    assert results['https://cdn.example.com/timeout.jpg'] is True
+    assert results['https://cdn.example.com/missing.jpg'] is False
+    # 캐시된 결과에도 같은 기준 적용
+    again = asyncio.run(validator.validate_many(STATUSES, network_error_valid=True))
+    assert again == results
+    assert len(validator.fetched) == len(STATUSES)
+
+
+def test_trusted_hosts_skip_requests():
+    validator = StubValidator({})
+    results = asyncio.run(validator.validate_many(['https://m.media-amazon.com/images/I/x.jpg', '']))
+    assert results == {'https://m.media-amazon.com/images/I/x.jpg': True}
+    assert validator.fetched == []
+
+
+if __name__ == "__main__":
+    test_network_errors_are_invalid_by_default()
+    test_network_errors_can_count_as_valid()
+    test_trusted_hosts_skip_requests()
+    print("✅ URL 검증기 테스트 통과")
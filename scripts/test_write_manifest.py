@@ -0,0 +1,137 @@
+"""
+쓰기 매니페스트 테스트 (Firestore 대역 사용, 네트워크 불필요)
+
+실행: python scripts/test_write_manifest.py  또는  pytest scripts/test_write_manifest.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(script_dir)
+from google.api_core.exceptions import NotFound
+
+from firestore_batch import commit_documents
+from write_manifest import WriteManifest, content_hash, write_document
+
+
+class FakeStore:
+    """문서 경로 → 데이터 (Firestore 대역) - 쓰기 호출을 (동작, 경로)로 기록"""
+
+    def __init__(self):
+        self.docs = {}
+        self.calls = []
+
+    def apply(self, op, path, data):
+        if op == 'update':
+            if path not in self.docs:
+                raise NotFound(f"No document to update: {path}")
+            self.docs[path].update(data)
+        else:
+            self.docs[path] = dict(data)
+        self.calls.append((op, path))
+
+
+class FakeDocRef:
+    def __init__(self, store, path):
+        self.store = store
+        self.path = path
+
+    def set(self, data):
+        self.store.apply('set', self.path, data)
+
+    def update(self, data):
+        self.store.apply('update', self.path, data)
+
+
+class FakeBatch:
+    """커밋 시 전부 반영되거나 전부 실패하는 WriteBatch 대역"""
+
+    def __init__(self, store):
+        self.store = store
+        self.ops = []
+
+    def set(self, ref, data):
+        self.ops.append(('set', ref.path, data))
+
+    def update(self, ref, data):
+        self.ops.append(('update', ref.path, data))
+
+    def commit(self):
+        missing = [path for op, path, _ in self.ops if op == 'update' and path not in self.store.docs]
+        if missing:
+            raise NotFound(f"No document to update: {missing[0]}")
+        for op, path, data in self.ops:
+            self.store.apply(op, path, data)
+
+
+class FakeDB:
+    def __init__(self, store):
+        self.store = store
+
+    def batch(self):
+        return FakeBatch(self.store)
+
+
+def make_manifest():
+    return WriteManifest(cache_file=os.path.join(tempfile.mkdtemp(), 'write_manifest.json'))
+
+
+def test_plan_skip_update_set():
+    manifest = make_manifest()
+    doc = {'date': '2026-03-06', 'items': [1, 2], 'updatedAt': 'ts1'}
+    assert manifest.plan('daily_rankings/a', doc) == ('set', doc)
+    manifest.record('daily_rankings/a', doc, 'set')
+
+    # updatedAt만 바뀌면 쓰기 생략
+    assert manifest.plan('daily_rankings/a', {'date': '2026-03-06', 'items': [1, 2], 'updatedAt': 'ts2'}) == ('skip', {})
+
+    changed = {'date': '2026-03-06', 'items': [2, 1], 'updatedAt': 'ts3'}
+    action, payload = manifest.plan('daily_rankings/a', changed)
+    assert action == 'update'
+    assert payload == {'items': [2, 1], 'contentHash': content_hash(changed), 'updatedAt': 'ts3'}
+
+    # 이전에 있던 필드가 빠지면 update()로 지울 수 없으므로 전체 set()
+    assert manifest.plan('daily_rankings/a', {'items': [1, 2]})[0] == 'set'
+
+
+def test_content_hash_ignores_key_order_and_timestamps():
+    assert content_hash({'a': 1, 'b': [1, 2], 'updatedAt': 'x'}) == content_hash({'b': [1, 2], 'a': 1, 'updatedAt': 'y'})
+    assert content_hash({'a': 1}) != content_hash({'a': 2})
+
+
+def test_update_of_deleted_document_falls_back_to_set():
+    store = FakeStore()
+    manifest = make_manifest()
+    ref = FakeDocRef(store, 'daily_rankings/a')
+    write_document(ref, {'items': [1], 'rank': 1}, manifest)
+    del store.docs['daily_rankings/a']
+
+    assert write_document(ref, {'items': [2], 'rank': 1}, manifest) == 'set'
+    assert store.docs['daily_rankings/a']['items'] == [2]
+    assert store.docs['daily_rankings/a']['rank'] == 1
+    # 다시 기록된 해시로 다음 실행은 생략
+    assert write_document(ref, {'items': [2], 'rank': 1}, manifest) == 'skip'
+
+
+def test_batch_update_of_deleted_document_falls_back_to_set():
+    store = FakeStore()
+    db = FakeDB(store)
+    manifest = make_manifest()
+    refs = [FakeDocRef(store, f'daily_rankings/{i}') for i in range(3)]
+    asyncio.run(commit_documents(db, [(ref, {'items': [i], 'rank': 1}) for i, ref in enumerate(refs)], manifest=manifest))
+    del store.docs['daily_rankings/1']
+
+    asyncio.run(commit_documents(db, [(ref, {'items': [i + 10], 'rank': 1}) for i, ref in enumerate(refs)], manifest=manifest))
+    assert [store.docs[f'daily_rankings/{i}']['items'] for i in range(3)] == [[10], [11], [12]]
+    assert store.docs['daily_rankings/1']['rank'] == 1
+    assert manifest.stats['written'] == 6
+
+
+if __name__ == "__main__":
+    test_plan_skip_update_set()
+    test_content_hash_ignores_key_order_and_timestamps()
+    test_update_of_deleted_document_falls_back_to_set()
+    test_batch_update_of_deleted_document_falls_back_to_set()
+    print("✅ 쓰기 매니페스트 테스트 통과")
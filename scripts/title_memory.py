@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+K-Rank Title Translation Memory
+Netflix 제목의 titleEn → titleKo 번역 결과를 디스크에 보관합니다.
+Top 10에 여러 주 머무는 타이틀은 한 번만 Gemini로 번역하고 이후에는 로컬에서 채웁니다.
+
+- 최초 실행 시 Firestore daily_rankings의 media 문서(*_media, *_media-{country})로 시드
+- 영어 제목은 대소문자/공백을 정규화한 값을 키로 사용
+"""
+
+import json
+import os
+import re
+import time
+from typing import Any, Dict, Iterable, Optional
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+TITLE_MEMORY_FILE = os.path.join(script_dir, 'title_memory.json')
+
+
+def normalize_title(title: str) -> str:
+    """메모리 키용 제목 정규화: 소문자화, 공백 정리"""
+    return re.sub(r'\s+', ' ', title or '').strip().casefold()
+
+
+class TitleMemory:
+    """
+    영어 제목 → 한국어 제목 번역 메모리
+
+    Args:
+        cache_file: 메모리 JSON 경로 ({normalized titleEn: {'titleEn', 'titleKo', 'updatedAt'}})
+    """
+
+    def __init__(self, cache_file: str = TITLE_MEMORY_FILE):
+        self.cache_file = cache_file
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.stats = {'known': 0, 'translated': 0}
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+                return
+            except Exception as e:
+                print(f"⚠️ 제목 번역 메모리 로드 오류: {e}")
+        self.entries = {}
+
+    def save(self):
+        if not self._dirty:
+            return
+        try:
+            tmp_file = f"{self.cache_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.cache_file)
+            self._dirty = False
+        except Exception as e:
+            print(f"⚠️ 제목 번역 메모리 저장 오류: {e}")
+
+    def get(self, title_en: str) -> Optional[str]:
+        entry = self.entries.get(normalize_title(title_en))
+        return entry.get('titleKo') if entry else None
+
+    def put(self, title_en: str, title_ko: str):
+        key = normalize_title(title_en)
+        if not key or not title_ko:
+            return
+        entry = self.entries.get(key)
+        if entry and entry.get('titleKo') == title_ko:
+            return
+        self.entries[key] = {'titleEn': title_en, 'titleKo': title_ko, 'updatedAt': time.time()}
+        self._dirty = True
+
+    def seed_from_items(self, items: Iterable[Dict[str, Any]]) -> int:
+        """
+        저장된 랭킹 아이템으로 메모리 채우기 (이미 있는 제목은 유지)
+
+        titleKo가 titleEn과 같으면 번역 실패 폴백일 수 있으므로 건너뜁니다.
+        """
+        added = 0
+        for item in items:
+            title_en = item.get('titleEn')
+            title_ko = item.get('titleKo')
+            if not title_en or not title_ko or title_ko == title_en:
+                continue
+            if self.get(title_en) is None:
+                self.put(title_en, title_ko)
+                added += 1
+        return added
+
+    def seed_from_rankings(self, db) -> int:
+        """Firestore daily_rankings의 media 문서들로 메모리 시드 (메모리가 비어 있을 때만)"""
+        if self.entries:
+            return 0
+        print("\n🌱 제목 번역 메모리 시드 중 (daily_rankings media 문서)...")
+        added = 0
+        try:
+            # 'media', 'media-{country}' 카테고리를 접두사 범위 쿼리로 조회
+            docs = (db.collection('daily_rankings')
+                    .where('category', '>=', 'media')
+                    .where('category', '<=', 'media\uf8ff')
+                    .stream())
+            for doc in docs:
+                added += self.seed_from_items((doc.to_dict() or {}).get('items', []))
+        except Exception as e:
+            print(f"⚠️ 제목 번역 메모리 시드 오류: {e}")
+        print(f"✅ 제목 번역 메모리 시드: {added}개")
+        return added
+
+    def summary(self) -> str:
+        return f"기존 {self.stats['known']}, 신규 번역 {self.stats['translated']} (저장 {len(self.entries)}개)"
+
+
+_memory: Optional[TitleMemory] = None
+
+
+def get_title_memory() -> TitleMemory:
+    """프로세스 전역 제목 번역 메모리"""
+    global _memory
+    if _memory is None:
+        _memory = TitleMemory()
+    return _memory
+
+
+def save_title_memory():
+    """전역 제목 번역 메모리 저장 - 각 스크립트의 main() 마지막에 호출"""
+    if _memory is not None:
+        _memory.save()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+K-Rank URL Validator
+이미지 URL 목록을 공유 HTTP 세션으로 일괄 검증하고 결과(상태 코드 + 확인 시각)를 디스크에 캐시합니다.
+
+- HEAD 요청 우선, HEAD를 지원하지 않는 서버는 Range GET(bytes=0-0)으로 폴백
+- 제한된 동시성으로 실행
+- 최근 검증된 URL은 URL_CHECK_TTL_HOURS 동안 재요청하지 않음
+- 네트워크 오류/타임아웃(상태 0)은 일시적일 수 있으므로 URL_CHECK_ERROR_TTL_MINUTES 동안만 캐시
+  (network_error_valid=True이면 확인할 수 없었던 URL을 유효한 것으로 간주 - 확실한 오류 응답만 거부)
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from http_client import get_http_session
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+URL_CHECK_CACHE_FILE = os.path.join(script_dir, 'url_check_cache.json')
+URL_CHECK_TTL_HOURS = float(os.getenv('URL_CHECK_TTL_HOURS', '72'))
+URL_CHECK_ERROR_TTL_MINUTES = float(os.getenv('URL_CHECK_ERROR_TTL_MINUTES', '30'))
+URL_CHECK_CONCURRENCY = int(os.getenv('URL_CHECK_CONCURRENCY', '16'))
+URL_CHECK_TIMEOUT = aiohttp.ClientTimeout(total=5)
+
+# 직접 넣은 고품질 이미지 호스트는 요청 없이 유효한 것으로 간주
+TRUSTED_HOSTS = {"images.unsplash.com", "m.media-amazon.com", "www.amazon.com"}
+
+# HEAD를 거부/미지원하는 서버의 응답 코드 → Range GET으로 재시도
+HEAD_FALLBACK_STATUSES = {403, 405, 501}
+
+
+def is_ok_status(status: int) -> bool:
+    # 206: Range GET 부분 응답
+    return status in (200, 206)
+
+
+class UrlValidator:
+    """
+    디스크 캐시를 가진 일괄 URL 검증기
+
+    Args:
+        cache_file: 캐시 JSON 경로 ({url: {'status': int, 'checkedAt': float}})
+        ttl_hours: 캐시 유효 기간
+        error_ttl_minutes: 네트워크 오류(상태 0) 결과 유효 기간
+        concurrency: 동시 요청 수
+    """
+
+    def __init__(self, cache_file: str = URL_CHECK_CACHE_FILE,
+                 ttl_hours: float = URL_CHECK_TTL_HOURS,
+                 error_ttl_minutes: float = URL_CHECK_ERROR_TTL_MINUTES,
+                 concurrency: int = URL_CHECK_CONCURRENCY):
+        self.cache_file = cache_file
+        self.ttl = ttl_hours * 60 * 60
+        self.error_ttl = error_ttl_minutes * 60
+        self.concurrency = max(1, concurrency)
+        self.entries: Dict[str, Dict] = {}
+        self.stats = {'cached': 0, 'trusted': 0, 'checked': 0}
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+                return
+            except Exception as e:
+                print(f"⚠️ URL 검증 캐시 로드 오류: {e}")
+        self.entries = {}
+
+    def save(self):
+        if not self._dirty:
+            return
+        try:
+            tmp_file = f"{self.cache_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.cache_file)
+            self._dirty = False
+        except Exception as e:
+            print(f"⚠️ URL 검증 캐시 저장 오류: {e}")
+
+    def get_cached(self, url: str) -> Optional[int]:
+        entry = self.entries.get(url)
+        if not entry:
+            return None
+        status = entry.get('status', 0)
+        ttl = self.ttl if status else self.error_ttl
+        if time.time() - entry.get('checkedAt', 0) > ttl:
+            return None
+        return status
+
+    async def fetch_status(self, url: str) -> int:
+        """HEAD → (필요 시) Range GET 순서로 상태 코드 확인, 네트워크 오류는 0"""
+        session = get_http_session()
+        try:
+            async with session.head(url, timeout=URL_CHECK_TIMEOUT, allow_redirects=True) as response:
+                if response.status not in HEAD_FALLBACK_STATUSES:
+                    return response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
+
+        try:
+            headers = {'Range': 'bytes=0-0'}
+            async with session.get(url, timeout=URL_CHECK_TIMEOUT, headers=headers, allow_redirects=True) as response:
+                return response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return 0
+
+    async def validate_many(self, urls: Iterable[str], network_error_valid: bool = False) -> Dict[str, bool]:
+        """
+        URL 목록을 일괄 검증
+
+        Args:
+            urls: 검증할 URL 목록
+            network_error_valid: 네트워크 오류/타임아웃(상태 0)을 유효로 볼지 여부
+
+        Returns:
+            {url: 유효 여부}
+        """
+        def is_valid(status: int) -> bool:
+            return is_ok_status(status) or (network_error_valid and status == 0)
+
+        results: Dict[str, bool] = {}
+        to_check = []
+        for url in dict.fromkeys(u for u in urls if u):
+            try:
+                host = urlparse(url).netloc
+            except ValueError:
+                results[url] = False
+                continue
+            if host in TRUSTED_HOSTS:
+                results[url] = True
+                self.stats['trusted'] += 1
+                continue
+            cached = self.get_cached(url)
+            if cached is not None:
+                results[url] = is_valid(cached)
+                self.stats['cached'] += 1
+            else:
+                to_check.append(url)
+
+        if to_check:
+            started = time.perf_counter()
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def check(url: str):
+                async with semaphore:
+                    status = await self.fetch_status(url)
+                self.entries[url] = {'status': status, 'checkedAt': time.time()}
+                self._dirty = True
+                results[url] = is_valid(status)
+
+            await asyncio.gather(*[check(url) for url in to_check])
+            self.stats['checked'] += len(to_check)
+            valid = sum(1 for url in to_check if results[url])
+            print(f"🔗 URL 검증: {len(to_check)}개 확인 ({valid}개 유효, {time.perf_counter() - started:.1f}초), 캐시·신뢰 호스트 {len(results) - len(to_check)}개")
+
+        return results
+
+    async def validate(self, url: str) -> bool:
+        if not url:
+            return False
+        return (await self.validate_many([url])).get(url, False)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+K-Rank Write Manifest
+Firestore 문서 내용의 정규 해시를 기록해 바뀌지 않은 문서는 다시 쓰지 않습니다.
+
+- 해시: updatedAt/contentHash를 제외한 문서를 키 정렬 JSON으로 직렬화한 SHA-256 (문서에 contentHash로 저장)
+- 매니페스트: {문서 경로: {'hash', 'fields': {필드: 해시}, 'writtenAt'}} (write_manifest.json)
+- 같은 해시 → 쓰기 생략 / 일부 필드만 변경 → 바뀐 필드만 update() / 기록 없음 → 전체 set()
+- 매니페스트에는 있지만 Firestore 문서가 없으면(삭제 등) update()가 NotFound → 전체 set()으로 다시 기록
+- SKIP_UNCHANGED_WRITES=false 이면 항상 전체 set()
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from google.api_core.exceptions import NotFound
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+WRITE_MANIFEST_FILE = os.path.join(script_dir, 'write_manifest.json')
+SKIP_UNCHANGED_WRITES = os.getenv('SKIP_UNCHANGED_WRITES', 'true').lower() == 'true'
+MANIFEST_TTL_SECONDS = 30 * 24 * 60 * 60  # 문서 ID에 날짜가 들어가므로 30일 지난 기록은 정리
+
+HASH_EXCLUDED_FIELDS = ('updatedAt', 'contentHash')
+
+
+def _canonical_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(',', ':'), default=str)
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def field_hashes(data: Dict[str, Any]) -> Dict[str, str]:
+    """최상위 필드별 해시 (updatedAt/contentHash 제외)"""
+    return {key: _sha256(_canonical_json(value)) for key, value in data.items() if key not in HASH_EXCLUDED_FIELDS}
+
+
+def content_hash(data: Dict[str, Any]) -> str:
+    """문서 전체 정규 해시 - 필드 해시들의 해시 (필드 순서와 무관)"""
+    return _sha256(_canonical_json(field_hashes(data)))
+
+
+class WriteManifest:
+    """
+    마지막으로 쓴 문서 해시 기록
+
+    Args:
+        cache_file: 매니페스트 JSON 경로
+    """
+
+    def __init__(self, cache_file: str = WRITE_MANIFEST_FILE):
+        self.cache_file = cache_file
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self.stats = {'skipped': 0, 'updated': 0, 'written': 0}
+        self.load()
+
+    def load(self):
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+                return
+            except Exception as e:
+                print(f"⚠️ 쓰기 매니페스트 로드 오류: {e}")
+        self.entries = {}
+
+    def save(self):
+        if not self._dirty:
+            return
+        try:
+            cutoff = time.time() - MANIFEST_TTL_SECONDS
+            self.entries = {path: entry for path, entry in self.entries.items() if entry.get('writtenAt', 0) >= cutoff}
+            tmp_file = f"{self.cache_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.cache_file)
+            self._dirty = False
+        except Exception as e:
+            print(f"⚠️ 쓰기 매니페스트 저장 오류: {e}")
+
+    def plan(self, path: str, data: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """
+        쓰기 계획 - data에 contentHash를 기록하고 (동작, 쓸 데이터) 반환
+
+        Returns:
+            ('skip', {}) / ('update', 바뀐 필드 + contentHash/updatedAt) / ('set', 전체 문서)
+        """
+        fields = field_hashes(data)
+        data['contentHash'] = _sha256(_canonical_json(fields))
+        previous = self.entries.get(path)
+        if not SKIP_UNCHANGED_WRITES or previous is None:
+            return 'set', data
+        if previous.get('hash') == data['contentHash']:
+            return 'skip', {}
+        previous_fields = previous.get('fields', {})
+        # 이전에 있던 필드가 빠졌으면 update()로는 지울 수 없으므로 전체 set()
+        if set(previous_fields) - set(fields):
+            return 'set', data
+        changes = {key: data[key] for key, digest in fields.items() if previous_fields.get(key) != digest}
+        changes['contentHash'] = data['contentHash']
+        if 'updatedAt' in data:
+            changes['updatedAt'] = data['updatedAt']
+        return 'update', changes
+
+    def record(self, path: str, data: Dict[str, Any], action: str):
+        """쓰기 성공 후 호출 - 해시 기록 및 통계 갱신"""
+        self.stats[{'skip': 'skipped', 'update': 'updated', 'set': 'written'}[action]] += 1
+        if action == 'skip':
+            return
+        self.entries[path] = {'hash': data['contentHash'], 'fields': field_hashes(data), 'writtenAt': time.time()}
+        self._dirty = True
+
+    def summary(self) -> str:
+        return f"전체 쓰기 {self.stats['written']}건, 변경 필드만 {self.stats['updated']}건, 변경 없음 생략 {self.stats['skipped']}건"
+
+
+def write_document(doc_ref, data: Dict[str, Any], manifest: Optional['WriteManifest'] = None) -> str:
+    """
+    문서를 해시 비교 후 저장 (변경 없으면 생략, 일부 변경이면 해당 필드만 update)
+
+    Returns:
+        수행한 동작 ('skip' / 'update' / 'set')
+    """
+    manifest = manifest or get_write_manifest()
+    action, payload = manifest.plan(doc_ref.path, data)
+    if action == 'set':
+        doc_ref.set(payload)
+    elif action == 'update':
+        try:
+            doc_ref.update(payload)
+        except NotFound:
+            # 매니페스트 기록과 달리 문서가 없음 - 전체 set()으로 복구하고 다시 기록
+            doc_ref.set(data)
+            action = 'set'
+    manifest.record(doc_ref.path, data, action)
+    return action
+
+
+def describe_write(action: str, doc_id: str) -> str:
+    """로그용 한 줄 설명"""
+    if action == 'skip':
+        return f"⏭️ 변경 없음, Firestore 쓰기 생략: {doc_id}"
+    if action == 'update':
+        return f"✏️ 변경된 필드만 Firestore 업데이트: {doc_id}"
+    return f"✅ Firestore 저장 완료: {doc_id}"
+
+
+_manifest: Optional[WriteManifest] = None
+
+
+def get_write_manifest() -> WriteManifest:
+    """프로세스 전역 쓰기 매니페스트"""
+    global _manifest
+    if _manifest is None:
+        _manifest = WriteManifest()
+    return _manifest
+
+
+def save_write_manifest():
+    """전역 쓰기 매니페스트 저장 - 각 스크립트의 main() 마지막에 호출"""
+    if _manifest is not None:
+        if any(_manifest.stats.values()):
+            print(f"🧾 쓰기 매니페스트: {_manifest.summary()}")
+        _manifest.save()